@@ -2,17 +2,19 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from config import Config
+from app.analyzer_pool import AnalyzerPool, in_worker_process
 import os
 
 db = SQLAlchemy()
 migrate = Migrate()
+analyzer_pool = AnalyzerPool()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(app.root_path), 'migrations'))
     
     # Ensure upload directory exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -20,6 +22,20 @@ def create_app(config_class=Config):
     from app.routes import bp as main_bp
     app.register_blueprint(main_bp)
     
+    from app.cli import register_cli
+    register_cli(app)
+    
+    from app import metrics
+    metrics.init_app(app)
+    
+    # Load the spaCy pipeline once per process instead of once per request
+    analyzer_pool.init_app(app)
+    
+    # Pool workers build their own app; only the top-level process dispatches
+    if app.config['JOB_RUNNER_AUTOSTART'] and not in_worker_process():
+        from app.jobs import JobRunner
+        JobRunner(app).start()
+    
     return app
 
 from app import models
\ No newline at end of file
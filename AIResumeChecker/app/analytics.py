@@ -0,0 +1,292 @@
+import json
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import AnalysisSkill, ResumeAnalysis, ScoreSummary, Skill, SkillGapSummary
+from app.report_export import filter_analyses
+
+SKILL_CATEGORIES = ('technical', 'soft')
+SCORE_BUCKET = 10
+
+# (name, category) -> Skill.id for skills known to be committed
+_skill_ids: Dict[Tuple[str, str], int] = {}
+
+
+def skill_rows(analysis: ResumeAnalysis) -> List[Tuple[str, str, bool]]:
+    """(skill, category, matched) for every required skill of an analysis."""
+    rows = []
+    for column, matched in (('matched_skills', True), ('missing_skills', False)):
+        skills = json.loads(getattr(analysis, column) or '{}')
+        if not isinstance(skills, dict):
+            continue
+        for category in SKILL_CATEGORIES:
+            for name in skills.get(category) or []:
+                rows.append((name, category, matched))
+    return rows
+
+
+def _known_skill_ids(session, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    """Ids of the skills that already exist, from the process cache or one query."""
+    keys = set(keys)
+    missing = keys - _skill_ids.keys()
+    if missing:
+        with session.no_autoflush:
+            found = (session.query(Skill.id, Skill.name, Skill.category)
+                     .filter(Skill.name.in_({name for name, _ in missing}))
+                     .all())
+        for skill_id, name, category in found:
+            _skill_ids[(name, category)] = skill_id
+    return {key: _skill_ids[key] for key in keys if key in _skill_ids}
+
+
+def ensure_skill_ids(session, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], int]:
+    """Ids for every key, inserting the skills that do not exist yet."""
+    keys = set(keys)
+    ids = _known_skill_ids(session, keys)
+    # Sorted, so concurrent transactions take the unique index locks in the same order
+    for key in sorted(keys - ids.keys()):
+        ids[key] = Skill.get_or_create(*key).id
+    return ids
+
+
+def _skills_changed(analysis: ResumeAnalysis) -> bool:
+    state = inspect(analysis)
+    return (state.attrs.matched_skills.history.has_changes()
+            or state.attrs.missing_skills.history.has_changes())
+
+
+@event.listens_for(Session, 'before_flush')
+def _sync_skill_links(session, flush_context, instances):
+    """Write AnalysisSkill rows for new analyses and ones whose skills changed."""
+    changed = [obj for obj in session.new if isinstance(obj, ResumeAnalysis)]
+    changed += [obj for obj in session.dirty
+                if isinstance(obj, ResumeAnalysis) and _skills_changed(obj)]
+    if not changed:
+        return
+
+    rows = {id(obj): skill_rows(obj) for obj in changed}
+    keys = {(name, category) for obj_rows in rows.values() for name, category, _ in obj_rows}
+    known = _known_skill_ids(session, keys)
+
+    with session.no_autoflush:
+        # Skills first seen here are inserted right away; a concurrent request
+        # inserting the same skill shares its row instead of failing the commit
+        ids = ensure_skill_ids(session, keys)
+        session.info.setdefault('new_skills', {}).update(
+            {key: skill_id for key, skill_id in ids.items() if key not in known})
+        for obj in changed:
+            links = {}
+            for name, category, matched in rows[id(obj)]:
+                links[(name, category)] = AnalysisSkill(skill_id=ids[(name, category)], matched=matched)
+            obj.skill_links = list(links.values())
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_new_skills(session):
+    _skill_ids.update(session.info.pop('new_skills', {}))
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_new_skills(session):
+    session.info.pop('new_skills', None)
+
+
+def backfill_skill_links(batch_size: int = 500) -> int:
+    """Create AnalysisSkill rows for analyses stored before the table existed."""
+    has_links = db.session.query(AnalysisSkill.analysis_id).filter(
+        AnalysisSkill.analysis_id == ResumeAnalysis.id).exists()
+    last_id = 0
+    backfilled = 0
+    while True:
+        batch = (db.session.query(ResumeAnalysis.id, ResumeAnalysis.matched_skills,
+                                  ResumeAnalysis.missing_skills)
+                 .filter(ResumeAnalysis.id > last_id, ~has_links)
+                 .order_by(ResumeAnalysis.id)
+                 .limit(batch_size)
+                 .all())
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        rows = {analysis.id: skill_rows(analysis) for analysis in batch}
+        ids = ensure_skill_ids(db.session, {(name, category) for analysis_rows in rows.values()
+                                            for name, category, _ in analysis_rows})
+        links = {}
+        for analysis_id, analysis_rows in rows.items():
+            for name, category, matched in analysis_rows:
+                skill_id = ids[(name, category)]
+                links[(analysis_id, skill_id)] = {'analysis_id': analysis_id, 'skill_id': skill_id,
+                                                  'matched': matched}
+        if links:
+            db.session.execute(AnalysisSkill.__table__.insert(), list(links.values()))
+        db.session.commit()
+        backfilled += len(batch)
+    return backfilled
+
+
+# --- Aggregates ----------------------------------------------------------
+
+def _score_bucket():
+    """overall_score -> lower bound of its band (90 covers 90-100), portable SQL."""
+    return case(*[(ResumeAnalysis.overall_score < bound, bound - SCORE_BUCKET)
+                  for bound in range(SCORE_BUCKET, 100, SCORE_BUCKET)],
+                else_=100 - SCORE_BUCKET)
+
+
+def _month(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    return date(parsed.year, parsed.month, 1)
+
+
+def _summary_filter(query, model, job_title, date_from, date_to):
+    if job_title:
+        query = query.filter(model.job_title == job_title)
+    start, end = _month(date_from), _month(date_to)
+    if start:
+        query = query.filter(model.period >= start)
+    if end:
+        query = query.filter(model.period <= end)
+    return query
+
+
+def skill_gaps(job_title: Optional[str] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, matched: bool = False, category: Optional[str] = None,
+               limit: int = 20, use_summary: bool = False) -> dict:
+    """Most common missing (or matched) skills across the filtered analyses.
+
+    With ``use_summary`` the counts come from SkillGapSummary, so dates are
+    rounded to whole months and rows newer than the last refresh are left out.
+    """
+    if use_summary:
+        total = _summary_filter(db.session.query(func.sum(ScoreSummary.analyses)),
+                                ScoreSummary, job_title, date_from, date_to).scalar() or 0
+        count = func.sum(SkillGapSummary.analyses)
+        query = _summary_filter(
+            db.session.query(Skill.name, Skill.category, count.label('analyses'))
+            .join(SkillGapSummary, SkillGapSummary.skill_id == Skill.id)
+            .filter(SkillGapSummary.matched == matched),
+            SkillGapSummary, job_title, date_from, date_to)
+    else:
+        total = filter_analyses(db.session.query(func.count(ResumeAnalysis.id)),
+                                job_title, date_from, date_to).scalar() or 0
+        count = func.count(AnalysisSkill.analysis_id)
+        query = filter_analyses(
+            db.session.query(Skill.name, Skill.category, count.label('analyses'))
+            .join(AnalysisSkill, AnalysisSkill.skill_id == Skill.id)
+            .join(ResumeAnalysis, ResumeAnalysis.id == AnalysisSkill.analysis_id)
+            .filter(AnalysisSkill.matched == matched),
+            job_title, date_from, date_to)
+
+    if category:
+        query = query.filter(Skill.category == category)
+    rows = (query.group_by(Skill.id, Skill.name, Skill.category)
+            .order_by(count.desc(), Skill.name)
+            .limit(limit)
+            .all())
+    return {
+        'total_analyses': int(total),
+        'status': 'matched' if matched else 'missing',
+        'skills': [{
+            'skill': name,
+            'category': skill_category,
+            'analyses': int(analyses),
+            'share': round(analyses / total, 4) if total else 0.0
+        } for name, skill_category, analyses in rows]
+    }
+
+
+def score_distribution(job_title: Optional[str] = None, date_from: Optional[str] = None,
+                       date_to: Optional[str] = None, use_summary: bool = False) -> dict:
+    """Histogram of overall scores in 10-point bands, plus count and mean."""
+    if use_summary:
+        query = _summary_filter(
+            db.session.query(ScoreSummary.bucket, func.sum(ScoreSummary.analyses),
+                             func.sum(ScoreSummary.score_sum)),
+            ScoreSummary, job_title, date_from, date_to)
+        rows = query.group_by(ScoreSummary.bucket).all()
+    else:
+        bucket = _score_bucket()
+        query = filter_analyses(
+            db.session.query(bucket, func.count(ResumeAnalysis.id), func.sum(ResumeAnalysis.overall_score)),
+            job_title, date_from, date_to)
+        rows = query.group_by(bucket).all()
+
+    counts = {int(bucket): (int(analyses), float(score_sum or 0)) for bucket, analyses, score_sum in rows}
+    total = sum(analyses for analyses, _ in counts.values())
+    score_sum = sum(value for _, value in counts.values())
+    return {
+        'total_analyses': total,
+        'average_score': round(score_sum / total, 1) if total else None,
+        'buckets': [{
+            'from': lower,
+            'to': lower + SCORE_BUCKET,
+            'analyses': counts.get(lower, (0, 0.0))[0]
+        } for lower in range(0, 100, SCORE_BUCKET)]
+    }
+
+
+def _months(start: date, end: date):
+    current = date(start.year, start.month, 1)
+    while current <= end:
+        following = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+        yield current, following
+        current = following
+
+
+def refresh_summaries(since: Optional[date] = None) -> int:
+    """Rebuild the monthly summary tables from ``since`` (default: everything).
+
+    Each month is recomputed with two grouped queries and replaced in one
+    transaction, so readers never see a half-built month.
+    """
+    first, last = db.session.query(func.min(ResumeAnalysis.created_at),
+                                   func.max(ResumeAnalysis.created_at)).one()
+    if first is None:
+        return 0
+    start = max(first.date(), since) if since else first.date()
+    refreshed_at = datetime.utcnow()
+    months = 0
+    bucket = _score_bucket()
+
+    for period, following in _months(start, last.date()):
+        in_month = (ResumeAnalysis.created_at >= datetime(period.year, period.month, 1),
+                    ResumeAnalysis.created_at < datetime(following.year, following.month, 1))
+        skill_counts = (db.session.query(ResumeAnalysis.job_title, AnalysisSkill.skill_id,
+                                         AnalysisSkill.matched, func.count())
+                        .join(AnalysisSkill, AnalysisSkill.analysis_id == ResumeAnalysis.id)
+                        .filter(*in_month)
+                        .group_by(ResumeAnalysis.job_title, AnalysisSkill.skill_id, AnalysisSkill.matched)
+                        .all())
+        score_counts = (db.session.query(ResumeAnalysis.job_title, bucket, func.count(),
+                                         func.sum(ResumeAnalysis.overall_score))
+                        .filter(*in_month)
+                        .group_by(ResumeAnalysis.job_title, bucket)
+                        .all())
+
+        SkillGapSummary.query.filter_by(period=period).delete(synchronize_session=False)
+        ScoreSummary.query.filter_by(period=period).delete(synchronize_session=False)
+        if skill_counts:
+            db.session.execute(SkillGapSummary.__table__.insert(), [
+                {'period': period, 'job_title': job_title, 'skill_id': skill_id, 'matched': matched,
+                 'analyses': analyses, 'refreshed_at': refreshed_at}
+                for job_title, skill_id, matched, analyses in skill_counts
+            ])
+        if score_counts:
+            db.session.execute(ScoreSummary.__table__.insert(), [
+                {'period': period, 'job_title': job_title, 'bucket': int(score_bucket),
+                 'analyses': analyses, 'score_sum': score_sum, 'refreshed_at': refreshed_at}
+                for job_title, score_bucket, analyses, score_sum in score_counts
+            ])
+        db.session.commit()
+        months += 1
+    return months
+
+
+def summary_refreshed_at() -> Optional[datetime]:
+    return db.session.query(func.max(ScoreSummary.refreshed_at)).scalar()
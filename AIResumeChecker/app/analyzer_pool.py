@@ -0,0 +1,138 @@
+import multiprocessing
+import os
+import threading
+import time
+from typing import Optional
+
+
+def _running_cli_command() -> bool:
+    """True inside a `flask <command>` other than `flask run`."""
+    if os.environ.get('FLASK_RUN_FROM_CLI') != 'true':
+        return False
+    import click
+
+    context = click.get_current_context(silent=True)
+    return context is None or context.info_name != 'run'
+
+
+def in_worker_process() -> bool:
+    """True in a multiprocessing child, also while spawn re-imports the entry point."""
+    # parent_process() is only set once the main module has been imported,
+    # but the child's name is set before
+    return (multiprocessing.parent_process() is not None
+            or multiprocessing.current_process().name != 'MainProcess')
+
+
+class AnalyzerPool:
+    """Process-wide holder for a warm, shared NLPAnalyzer.
+
+    The spaCy pipeline is loaded once per process and then handed to every
+    request. Inference on a loaded pipeline is read-only, so a single instance
+    can serve concurrent request threads; the lock only guards loading.
+    """
+
+    def __init__(self, app=None):
+        self._analyzer = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._error = None
+        self.load_seconds = None
+        self.warmup_text = ''
+        self.mode = 'lazy'
+        self._app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Register the pool on the app and optionally start warming up."""
+        app.extensions['analyzer_pool'] = self
+        self._app = app
+        self.warmup_text = app.config.get('NLP_WARMUP_TEXT', '')
+
+        self.mode = app.config.get('NLP_PRELOAD', 'background')
+        if _running_cli_command():
+            # `flask tfidf ...`, `flask jobs status` etc. rarely need the model
+            self.mode = app.config.get('NLP_PRELOAD_CLI', 'lazy')
+        if in_worker_process():
+            # Spawned pool workers re-import the entry point and build their
+            # own app; they load the model only if their tasks need it
+            self.mode = 'lazy'
+        if self.mode == 'sync':
+            self.warmup()
+        elif self.mode == 'background':
+            thread = threading.Thread(target=self.warmup, name='analyzer-warmup', daemon=True)
+            thread.start()
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the analyzer is warm; a lazy pool only after its first load."""
+        return self._ready.is_set() or (self.mode == 'lazy' and self._analyzer is not None)
+
+    @property
+    def loaded(self):
+        """The analyzer if it is already loaded, else None; never loads it."""
+        return self._analyzer
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+    def warmup(self):
+        """Load the analyzer, run a throwaway analysis through it and build the search index."""
+        try:
+            analyzer = self.get()
+            if self.warmup_text:
+                analyzer.analyze_resume_job_fit(self.warmup_text, self.warmup_text)
+            self._warm_search_index()
+            self._ready.set()
+        except Exception as e:
+            self._error = str(e)
+            print(f"Analyzer warmup failed: {e}")
+
+    def _warm_search_index(self):
+        """Index the stored resumes now rather than inside the first search."""
+        if self._app is None:
+            return
+        from sqlalchemy import inspect
+        from app import db
+        from app.search_index import get_candidate_index
+
+        try:
+            with self._app.app_context():
+                # A database that has not been created or migrated yet has nothing to index
+                if inspect(db.engine).has_table('resume_analysis'):
+                    get_candidate_index()
+        except Exception as e:
+            print(f"Search index warmup failed: {e}")
+
+    def get(self):
+        """Return the shared analyzer, loading it on first use."""
+        analyzer = self._analyzer
+        if analyzer is not None:
+            return analyzer
+
+        with self._lock:
+            if self._analyzer is None:
+                from app.nlp_analyzer import NLPAnalyzer
+
+                started = time.perf_counter()
+                self._analyzer = NLPAnalyzer()
+                self.load_seconds = time.perf_counter() - started
+                self._error = None
+            return self._analyzer
+
+    def reset(self):
+        """Drop the loaded analyzer; the next get() or warmup() loads a fresh one."""
+        with self._lock:
+            self._analyzer = None
+            self._ready.clear()
+            self.load_seconds = None
+
+    def status(self) -> dict:
+        return {
+            'ready': self.is_ready,
+            'mode': self.mode,
+            'pid': os.getpid(),
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds else None,
+            'error': self._error
+        }
@@ -0,0 +1,244 @@
+import multiprocessing
+import os
+import time
+import zipfile
+from collections import OrderedDict
+from multiprocessing import TimeoutError as PoolTimeoutError
+from typing import BinaryIO, Iterator, Optional, Tuple, Union
+
+from app import db
+from app.dedup import dedup_stats
+from app.models import ResumeAnalysis
+from app.near_dup import find_reusable
+from app.resume_parser import ResumeParser
+
+ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+# A file no worker has started within this many timeouts of being submitted
+# is treated as timed out (wedged pool, workers dying in their initializer)
+PICKUP_TIMEOUTS = 3
+
+# Worker side: shared array where a worker records when it starts on a file, by slot
+_started = None
+
+
+def _init_extractor(memory_limit_mb: Optional[int], started):
+    """Pool initializer: cap the worker's address space so one PDF cannot eat the host."""
+    global _started
+    _started = started
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:
+        print(f"Could not apply extractor memory limit: {e}")
+
+
+def _extract(filename: str, data: bytes, slot: int) -> Tuple[Optional[str], Optional[str]]:
+    """Runs in a pool worker: return (text, error) for one archive entry."""
+    _started[slot] = time.monotonic()
+    try:
+        text, metadata = ResumeParser.parse_resume(data, filename)
+        if not text:
+            return None, metadata.get('error', 'Could not extract text from file')
+        return text, None
+    except MemoryError:
+        return None, 'Memory limit exceeded while extracting text'
+
+
+def iter_archive_entries(archive: Union[str, BinaryIO], max_file_bytes: int,
+                         max_entries: int) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """Yield (name, data, error) for each resume in the archive, one at a time."""
+    with zipfile.ZipFile(archive) as zf:
+        count = 0
+        for info in zf.infolist():
+            name = info.filename
+            basename = os.path.basename(name)
+            if info.is_dir() or name.startswith('__MACOSX/') or basename.startswith('.'):
+                continue
+            if '.' not in basename or basename.rsplit('.', 1)[1].lower() not in ALLOWED_EXTENSIONS:
+                yield name, None, 'Unsupported file format'
+                continue
+
+            count += 1
+            if count > max_entries:
+                yield name, None, f'Archive has more than {max_entries} resumes'
+                continue
+            if info.file_size > max_file_bytes:
+                yield name, None, 'File too large'
+                continue
+
+            # Read at most one byte past the cap so a lying header cannot
+            # inflate a huge entry into memory
+            with zf.open(info) as member:
+                data = member.read(max_file_bytes + 1)
+            if len(data) > max_file_bytes:
+                yield name, None, 'File too large'
+                continue
+            yield name, data, None
+
+
+class ExtractionPool:
+    """Text extraction in worker processes with a per-file timeout.
+
+    At most ``window`` files are in flight, so only that many archive
+    entries are held in memory. A file that overruns its timeout, counted
+    from when a worker starts on it rather than while it waits in the
+    queue, fails on its own; the pool is rebuilt and the other in-flight
+    files are resubmitted. A file still not started PICKUP_TIMEOUTS
+    timeouts after it was submitted is handled the same way.
+    """
+
+    def __init__(self, workers: int, timeout: float, memory_limit_mb: Optional[int],
+                 start_method: str = 'spawn'):
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.context = multiprocessing.get_context(start_method)
+        self.window = workers * 2
+        # Start time of the file in each slot (0: still queued); in-flight
+        # files are numbered consecutively, so sequence % window never collides
+        self._started = self.context.Array('d', self.window, lock=False)
+        self._pool = None
+        self._inflight = OrderedDict()
+        self._sequence = 0
+
+    def __enter__(self):
+        self._pool = self._new_pool()
+        return self
+
+    def __exit__(self, *exc):
+        self._pool.terminate()
+        self._pool.join()
+
+    def _new_pool(self):
+        return self.context.Pool(self.workers, initializer=_init_extractor,
+                                 initargs=(self.memory_limit_mb, self._started))
+
+    def _submit(self, name: str, data: bytes):
+        self._sequence += 1
+        slot = self._sequence % self.window
+        self._started[slot] = 0
+        result = self._pool.apply_async(_extract, (name, data, slot))
+        self._inflight[self._sequence] = (name, data, result, slot, time.monotonic())
+
+    def submit(self, name: str, data: bytes) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """Queue a file; yields (name, text, error) for files finished meanwhile."""
+        self._submit(name, data)
+        while len(self._inflight) >= self.window:
+            yield self._wait_oldest()
+
+    def drain(self) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        while self._inflight:
+            yield self._wait_oldest()
+
+    def _wait_oldest(self) -> Tuple[str, Optional[str], Optional[str]]:
+        key, (name, data, result, slot, submitted) = next(iter(self._inflight.items()))
+        pickup_deadline = submitted + self.timeout * PICKUP_TIMEOUTS
+        try:
+            while not self._started[slot] and not result.ready():
+                if time.monotonic() > pickup_deadline:
+                    raise PoolTimeoutError
+                result.wait(0.05)
+            text, error = result.get(timeout=max(self._started[slot] + self.timeout - time.monotonic(), 0))
+            del self._inflight[key]
+            return name, text, error
+        except PoolTimeoutError:
+            del self._inflight[key]
+            self._restart()
+            return name, None, f'Timed out after {self.timeout}s'
+        except Exception as e:
+            del self._inflight[key]
+            return name, None, str(e) or e.__class__.__name__
+
+    def _restart(self):
+        # A hung extraction cannot be cancelled on its own; rebuild the pool
+        # and resubmit the innocent in-flight files
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = self._new_pool()
+        pending = [(name, data) for name, data, *_ in self._inflight.values()]
+        self._inflight.clear()
+        for name, data in pending:
+            self._submit(name, data)
+
+
+def ingest_zip(archive: Union[str, BinaryIO], job_title: str, job_description: str,
+               config, analyzer) -> dict:
+    """Extract, analyze and store every resume in a ZIP archive.
+
+    Returns a report with one entry per file plus totals. Analyses are
+    committed every BULK_COMMIT_BATCH files.
+    """
+    job = analyzer.prepare_job(job_description)
+    files = []
+    pending = []
+
+    def record(name, text, error):
+        if error:
+            files.append({'filename': name, 'status': 'failed', 'error': error})
+            return
+        existing = ResumeAnalysis.find_duplicate(text, job_description, job_title)
+        near = existing is None
+        if near:
+            existing = find_reusable(text, job_description, job_title)
+        if existing is not None:
+            dedup_stats.record_hit(near=near)
+            files.append({'filename': name, 'status': 'ok', 'duplicate': True, 'near_duplicate': near,
+                          'analysis_id': existing.id, 'overall_score': existing.overall_score})
+            return
+        try:
+            started = time.perf_counter()
+            results = analyzer.analyze_resume_job_fit(text, job_description)
+            dedup_stats.record_miss(time.perf_counter() - started)
+        except Exception as e:
+            files.append({'filename': name, 'status': 'failed', 'error': str(e)})
+            return
+        analysis = ResumeAnalysis.from_results(
+            os.path.basename(name), job_title, job_description, text, results
+        )
+        db.session.add(analysis)
+        entry = {'filename': name, 'status': 'ok', 'overall_score': results['overall_score']}
+        files.append(entry)
+        pending.append((entry, analysis))
+        if len(pending) >= config['BULK_COMMIT_BATCH']:
+            flush()
+
+    def flush():
+        if not pending:
+            return
+        try:
+            db.session.flush()
+            for entry, analysis in pending:
+                entry['analysis_id'] = analysis.id
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            for entry, _ in pending:
+                entry.pop('analysis_id', None)
+                entry.update({'status': 'failed', 'error': f'Database error: {e}'})
+        pending.clear()
+
+    with ExtractionPool(config['BULK_WORKERS'], config['BULK_FILE_TIMEOUT'],
+                        config['BULK_MEMORY_LIMIT_MB'], config['BULK_START_METHOD']) as pool:
+        for name, data, error in iter_archive_entries(
+                archive, config['BULK_MAX_FILE_BYTES'], config['BULK_MAX_ENTRIES']):
+            if error:
+                record(name, None, error)
+                continue
+            for finished in pool.submit(name, data):
+                record(*finished)
+        for finished in pool.drain():
+            record(*finished)
+    flush()
+
+    succeeded = sum(1 for entry in files if entry['status'] == 'ok')
+    return {
+        'job_title': job_title,
+        'job_skills': analyzer.extract_skills(job),
+        'total': len(files),
+        'succeeded': succeeded,
+        'failed': len(files) - succeeded,
+        'files': files
+    }
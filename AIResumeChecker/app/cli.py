@@ -0,0 +1,326 @@
+import click
+
+from app import db
+from app.models import JobDescription, ResumeAnalysis
+
+
+def _iter_new_documents(model, batch_size: int):
+    """Yield term vectors for rows stored after the model's last fitted row.
+
+    Each resume is a document; each distinct job description is counted once
+    no matter how many analyses reference it.
+    """
+    from app.nlp_analyzer import content_hash, text_term_vector
+
+    rows = (db.session.query(ResumeAnalysis.id, ResumeAnalysis.resume_text, JobDescription.text)
+            .join(JobDescription, JobDescription.id == ResumeAnalysis.job_description_id)
+            .filter(ResumeAnalysis.id > model.last_row_id)
+            .order_by(ResumeAnalysis.id)
+            .yield_per(batch_size))
+    for row_id, resume_text, job_description in rows:
+        yield text_term_vector(resume_text)
+        job_hash = content_hash(job_description)[:16]
+        if job_hash not in model.job_hashes:
+            model.job_hashes.add(job_hash)
+            yield text_term_vector(job_description)
+        model.last_row_id = row_id
+
+
+def register_cli(app):
+    @app.cli.group()
+    def tfidf():
+        """Fit or update the corpus TF-IDF model."""
+
+    @tfidf.command('fit')
+    @click.option('--batch-size', default=500, show_default=True, help='Rows fetched per query.')
+    def tfidf_fit(batch_size):
+        """Fit the model from scratch on every stored analysis."""
+        from app.tfidf_model import CorpusTfidfModel
+
+        model = CorpusTfidfModel()
+        added = model.partial_fit(_iter_new_documents(model, batch_size))
+        model.save(app.config['TFIDF_MODEL_DIR'])
+        click.echo(f"Fitted {added} documents, {len(model.terms)} terms -> {app.config['TFIDF_MODEL_DIR']}")
+
+    @tfidf.command('update')
+    @click.option('--batch-size', default=500, show_default=True, help='Rows fetched per query.')
+    def tfidf_update(batch_size):
+        """Add analyses stored since the last fit or update."""
+        from app.tfidf_model import CorpusTfidfModel
+
+        model_dir = app.config['TFIDF_MODEL_DIR']
+        if not CorpusTfidfModel.exists(model_dir):
+            raise click.ClickException(f"No model in {model_dir}; run `flask tfidf fit` first")
+
+        model = CorpusTfidfModel.load(model_dir, mmap=False)
+        added = model.partial_fit(_iter_new_documents(model, batch_size))
+        model.save(model_dir)
+        click.echo(f"Added {added} documents, {len(model.terms)} terms total")
+
+    @app.cli.group()
+    def jobs():
+        """Run and inspect asynchronous analysis jobs."""
+
+    @jobs.command('worker')
+    @click.option('--workers', type=int, default=None, help='Analysis processes (default JOB_WORKERS).')
+    def jobs_worker(workers):
+        """Dispatch queued jobs to a process pool until interrupted."""
+        from app.jobs import JobRunner
+
+        runner = JobRunner(app, workers=workers)
+        click.echo(f"Dispatching jobs with {runner.workers} workers (Ctrl+C to stop)")
+        try:
+            runner.run()
+        except KeyboardInterrupt:
+            click.echo("Stopping; in-flight jobs are returned to the queue")
+
+    @jobs.command('status')
+    def jobs_status():
+        """Show job counts by status."""
+        from app.models import AnalysisJob
+
+        counts = (db.session.query(AnalysisJob.status, db.func.count(AnalysisJob.id))
+                  .group_by(AnalysisJob.status)
+                  .all())
+        for status, count in counts:
+            click.echo(f"{status:>8}: {count}")
+
+    @app.cli.group()
+    def ingest():
+        """Bulk-import resumes."""
+
+    @ingest.command('zip')
+    @click.argument('archive', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--job-title', required=True)
+    @click.option('--job-description-file', type=click.File('r'), required=True,
+                  help='Text file holding the job description.')
+    def ingest_zip_command(archive, job_title, job_description_file):
+        """Analyze every PDF/DOCX in ARCHIVE and store the results."""
+        from app import analyzer_pool
+        from app.bulk_ingest import ingest_zip
+
+        report = ingest_zip(archive, job_title, job_description_file.read().strip(),
+                            app.config, analyzer_pool.get())
+        for entry in report['files']:
+            if entry['status'] == 'ok':
+                note = ''
+                if entry.get('near_duplicate'):
+                    note = ' (near-duplicate already analyzed)'
+                elif entry.get('duplicate'):
+                    note = ' (already analyzed)'
+                click.echo(f"ok      {entry['filename']} -> #{entry['analysis_id']} ({entry['overall_score']}%){note}")
+            else:
+                click.echo(f"failed  {entry['filename']}: {entry['error']}")
+        click.echo(f"{report['succeeded']}/{report['total']} resumes ingested")
+
+    @app.cli.group()
+    def dedup():
+        """Content-hash deduplication of analyses."""
+
+    @dedup.command('backfill')
+    @click.option('--batch-size', default=500, show_default=True)
+    def dedup_backfill(batch_size):
+        """Compute resume/JD hashes for analyses stored before hashing existed."""
+        from app.nlp_analyzer import content_hash
+
+        updated = 0
+        while True:
+            rows = (db.session.query(ResumeAnalysis.id, ResumeAnalysis.resume_text, JobDescription.content_hash)
+                    .outerjoin(JobDescription, JobDescription.id == ResumeAnalysis.job_description_id)
+                    .filter(ResumeAnalysis.resume_hash.is_(None))
+                    .limit(batch_size)
+                    .all())
+            if not rows:
+                break
+            db.session.bulk_update_mappings(ResumeAnalysis, [
+                {'id': row_id, 'resume_hash': content_hash(resume_text), 'job_hash': job_hash}
+                for row_id, resume_text, job_hash in rows
+            ])
+            db.session.commit()
+            updated += len(rows)
+        click.echo(f"Hashed {updated} analyses")
+
+    @dedup.command('minhash')
+    @click.option('--batch-size', default=500, show_default=True)
+    @click.option('--rebuild', is_flag=True, help='Re-sign every analysis, not just unsigned ones.')
+    def dedup_minhash(batch_size, rebuild):
+        """Compute MinHash signatures and LSH bands for near-duplicate detection."""
+        from app.near_dup import backfill_signatures
+
+        click.echo(f"Signed {backfill_signatures(batch_size, rebuild)} analyses")
+
+    @app.cli.group()
+    def storage():
+        """Compressed columns and the shared job-description table."""
+
+    @storage.command('migrate')
+    @click.option('--batch-size', default=500, show_default=True)
+    def storage_migrate(batch_size):
+        """Compress stored text and JSON values.
+
+        Run it once after `flask db upgrade` on a database whose values
+        predate compression. It is safe to re-run after an interruption.
+        """
+        from app.storage import migrate_storage, storage_report
+
+        before = storage_report()
+        stats = migrate_storage(batch_size)
+        click.echo(f"Processed {stats['rows']} rows: {stats['compressed_values']} values compressed")
+        after = storage_report()
+        click.echo(f"Stored bytes: {before['stored_bytes']:,} -> {after['stored_bytes']:,} "
+                   f"({before['stored_bytes'] - after['stored_bytes']:,} saved)")
+        if db.engine.dialect.name == 'sqlite':
+            click.echo("Run VACUUM to return the freed pages to the filesystem")
+
+    @storage.command('report')
+    def storage_report_command():
+        """Show stored vs uncompressed bytes per column."""
+        from app.storage import storage_report
+
+        report = storage_report()
+        click.echo(f"{report['analyses']} analyses, {report['job_descriptions']} distinct job descriptions")
+        click.echo(f"{'column':<28}{'logical':>14}{'stored':>14}{'ratio':>8}")
+        for name, sizes in report['columns'].items():
+            ratio = sizes['stored_bytes'] / sizes['logical_bytes'] if sizes['logical_bytes'] else 0
+            click.echo(f"{name:<28}{sizes['logical_bytes']:>14,}{sizes['stored_bytes']:>14,}{ratio:>8.2f}")
+        click.echo(f"{'total':<28}{report['logical_bytes']:>14,}{report['stored_bytes']:>14,}"
+                   f"{report['ratio'] or 0:>8.2f}")
+        click.echo(f"Saved {report['saved_bytes']:,} bytes")
+        if 'database_file_bytes' in report:
+            click.echo(f"Database file: {report['database_file_bytes']:,} bytes")
+
+    @app.cli.group()
+    def reports():
+        """Render PDF reports."""
+
+    @reports.command('export')
+    @click.argument('output', type=click.File('wb'))
+    @click.option('--job-title', default=None)
+    @click.option('--from', 'date_from', default=None, help='Earliest analysis date (ISO).')
+    @click.option('--to', 'date_to', default=None, help='Latest analysis date (ISO, inclusive).')
+    @click.option('--min-score', type=float, default=None, help='Minimum overall score.')
+    @click.option('--format', 'export_format', type=click.Choice(['zip', 'pdf']), default='zip',
+                  show_default=True)
+    @click.option('--workers', type=int, default=None, help='Render processes (default EXPORT_WORKERS).')
+    def reports_export(output, job_title, date_from, date_to, min_score, export_format, workers):
+        """Write the reports matching the filter to OUTPUT as a ZIP or merged PDF."""
+        from app.report_export import export_query, export_reports
+
+        try:
+            query = export_query(job_title, date_from, date_to, min_score)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        total = query.count()
+        if total == 0:
+            raise click.ClickException('No analyses match the filter')
+        export_reports(query, output, export_format, workers or app.config['EXPORT_WORKERS'],
+                       app.config['EXPORT_START_METHOD'])
+        click.echo(f"Exported {total} reports to {output.name}")
+
+    @app.cli.group()
+    def analyses():
+        """Bulk data access to stored analyses."""
+
+    @analyses.command('export')
+    @click.argument('output', type=click.File('wb'))
+    @click.option('--format', 'export_format', type=click.Choice(['ndjson', 'csv']), default='ndjson',
+                  show_default=True)
+    @click.option('--columns', default=None, help='Comma-separated columns (default: scores and skills).')
+    @click.option('--job-title', default=None)
+    @click.option('--from', 'date_from', default=None, help='Earliest analysis date (ISO).')
+    @click.option('--to', 'date_to', default=None, help='Latest analysis date (ISO, inclusive).')
+    @click.option('--since-id', type=int, default=None, help='Only analyses with a larger id.')
+    @click.option('--gzip', 'compress', is_flag=True, help='Gzip the output (implied by a .gz OUTPUT).')
+    @click.option('--batch-size', type=int, default=None, help='Rows per fetch (default ANALYSIS_EXPORT_BATCH_SIZE).')
+    def analyses_export(output, export_format, columns, job_title, date_from, date_to, since_id, compress,
+                        batch_size):
+        """Stream the matching analyses to OUTPUT ('-' for stdout) as NDJSON or CSV."""
+        from app.data_export import parse_columns, stream_analyses
+
+        compress = compress or output.name.endswith('.gz')
+        try:
+            chunks = stream_analyses(export_format, parse_columns(columns), compress,
+                                     batch_size=batch_size or app.config['ANALYSIS_EXPORT_BATCH_SIZE'],
+                                     job_title=job_title, date_from=date_from, date_to=date_to,
+                                     since_id=since_id)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        written = 0
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+        if output.name != '<stdout>':
+            click.echo(f"Wrote {written:,} bytes to {output.name}")
+
+    @app.cli.group()
+    def analytics():
+        """Relational skill rows and summary tables behind /api/analytics."""
+
+    @analytics.command('backfill')
+    @click.option('--batch-size', default=500, show_default=True)
+    def analytics_backfill(batch_size):
+        """Create skill rows for analyses stored before skills were normalized."""
+        from app.analytics import backfill_skill_links
+
+        click.echo(f"Backfilled skills for {backfill_skill_links(batch_size)} analyses")
+
+    @analytics.command('refresh')
+    @click.option('--since', default=None, help='First month to rebuild (YYYY-MM); default all.')
+    def analytics_refresh(since):
+        """Rebuild the monthly skill-gap and score summary tables."""
+        from datetime import datetime
+        from app.analytics import refresh_summaries
+
+        try:
+            start = datetime.strptime(since, '%Y-%m').date() if since else None
+        except ValueError:
+            raise click.BadParameter('expected YYYY-MM', param_hint='--since')
+        click.echo(f"Refreshed {refresh_summaries(start)} months")
+
+    @app.cli.group()
+    def taxonomy():
+        """Skill taxonomy versions and rescoring of stored analyses."""
+
+    @taxonomy.command('status')
+    def taxonomy_status_command():
+        """Show the current version and how many analyses are scored with older ones."""
+        from app.taxonomy import taxonomy_status
+
+        status = taxonomy_status()
+        skills = ', '.join(f"{count} {category}" for category, count in status['skills'].items())
+        click.echo(f"Current version #{status['taxonomy_version_id']} ({status['content_hash'][:12]}): {skills}")
+        for entry in status['stale_by_version']:
+            version = f"#{entry['taxonomy_version_id']}" if entry['taxonomy_version_id'] else 'unversioned'
+            changed = entry['changed_skills']
+            detail = 'unknown version' if changed is None else f"{len(changed)} changed skills"
+            click.echo(f"{version:>12}: {entry['analyses']} analyses, {detail}")
+        if not status['stale_by_version']:
+            click.echo("All analyses are up to date")
+        run = status['last_run']
+        if run is not None:
+            click.echo(f"Last rescore run #{run['run_id']}: {run['status']}, {run['checked']} checked, "
+                       f"{run['rescored']} rescored")
+
+    @taxonomy.command('rescore')
+    @click.option('--workers', type=int, default=None, help='Processes (default RESCORE_WORKERS).')
+    @click.option('--batch-size', type=int, default=None, help='Rows per checkpoint (default RESCORE_BATCH_SIZE).')
+    @click.option('--baseline-version', type=int, default=None,
+                  help='Version unversioned analyses were scored with (default the oldest).')
+    def taxonomy_rescore(workers, batch_size, baseline_version):
+        """Rescore the analyses whose skills the taxonomy changes could affect.
+
+        Resumes an interrupted run for the current version from its checkpoint.
+        """
+        from app.taxonomy import rescore_analyses
+
+        def report(run):
+            click.echo(f"  up to #{run.last_id}/{run.max_id}: {run.checked} checked, {run.rescored} rescored")
+
+        run = rescore_analyses(workers=workers or app.config['RESCORE_WORKERS'],
+                               batch_size=batch_size or app.config['RESCORE_BATCH_SIZE'],
+                               start_method=app.config['RESCORE_START_METHOD'],
+                               baseline_version_id=baseline_version, progress=report)
+        click.echo(f"Run #{run.id} done: {run.checked} analyses checked, {run.rescored} rescored "
+                   f"to taxonomy version #{run.taxonomy_version_id}")
+        if run.rescored:
+            click.echo("Run `flask analytics refresh` to update the summary tables")
@@ -0,0 +1,76 @@
+import zlib
+from typing import Optional
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from config import Config
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is always available
+    zstandard = None
+
+# Stored values start with a NUL byte and a codec tag. Text never starts
+# with NUL, so anything else is plain UTF-8 (short values, or rows
+# written before compression and not yet rewritten by `flask storage migrate`).
+_ZLIB = b'\x00z'
+_ZSTD = b'\x00Z'
+
+_zstd_compressor = None
+_zstd_decompressor = None
+
+
+def _codec() -> str:
+    return 'zstd' if Config.TEXT_COMPRESSION == 'zstd' and zstandard is not None else 'zlib'
+
+
+def compress_text(value: str) -> bytes:
+    global _zstd_compressor
+    data = value.encode('utf-8')
+    if len(data) < Config.TEXT_COMPRESSION_MIN_BYTES:
+        return data
+    if _codec() == 'zstd':
+        if _zstd_compressor is None:
+            _zstd_compressor = zstandard.ZstdCompressor(level=Config.TEXT_COMPRESSION_LEVEL)
+        packed = _ZSTD + _zstd_compressor.compress(data)
+    else:
+        packed = _ZLIB + zlib.compress(data, Config.TEXT_COMPRESSION_LEVEL)
+    # Incompressible text is kept as is
+    return packed if len(packed) < len(data) else data
+
+
+def decompress_text(value: bytes) -> str:
+    global _zstd_decompressor
+    value = bytes(value)
+    if value[:2] == _ZLIB:
+        return zlib.decompress(value[2:]).decode('utf-8')
+    if value[:2] == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError('Value is zstd-compressed but the zstandard package is not installed')
+        if _zstd_decompressor is None:
+            _zstd_decompressor = zstandard.ZstdDecompressor()
+        return _zstd_decompressor.decompress(value[2:]).decode('utf-8')
+    return value.decode('utf-8')
+
+
+class CompressedText(TypeDecorator):
+    """Text stored compressed in a binary column.
+
+    Python code sees plain ``str``. Values are compressed on write (zstd when
+    configured and installed, zlib otherwise) and decompressed when the row
+    is loaded. Legacy rows that still hold uncompressed text, as SQLite
+    returns them, are passed through unchanged.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None or isinstance(value, str):
+            return value
+        return decompress_text(value)
@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from app import db
+from app.models import JobDescription, ResumeAnalysis
+from app.report_export import filter_analyses
+
+DATA_FORMATS = ('ndjson', 'csv')
+
+# Export name -> column; job_description comes from the shared table
+EXPORT_COLUMNS = {
+    'id': ResumeAnalysis.id,
+    'created_at': ResumeAnalysis.created_at,
+    'filename': ResumeAnalysis.filename,
+    'job_title': ResumeAnalysis.job_title,
+    'overall_score': ResumeAnalysis.overall_score,
+    'technical_score': ResumeAnalysis.technical_skills_score,
+    'soft_skills_score': ResumeAnalysis.soft_skills_score,
+    'keyword_match_score': ResumeAnalysis.keyword_match_score,
+    'matched_skills': ResumeAnalysis.matched_skills,
+    'missing_skills': ResumeAnalysis.missing_skills,
+    'recommendations': ResumeAnalysis.recommendations,
+    'extracted_entities': ResumeAnalysis.extracted_entities,
+    'resume_hash': ResumeAnalysis.resume_hash,
+    'job_hash': ResumeAnalysis.job_hash,
+    'near_duplicate_of': ResumeAnalysis.near_duplicate_of_id,
+    'resume_text': ResumeAnalysis.resume_text,
+    'job_description': JobDescription.text,
+}
+JSON_COLUMNS = {'matched_skills', 'missing_skills', 'recommendations', 'extracted_entities'}
+DEFAULT_COLUMNS = ('id', 'created_at', 'filename', 'job_title', 'overall_score', 'technical_score',
+                   'soft_skills_score', 'keyword_match_score', 'matched_skills', 'missing_skills')
+
+
+def parse_columns(value: Optional[str]) -> List[str]:
+    """Comma-separated export column names, or the defaults when empty."""
+    if not value:
+        return list(DEFAULT_COLUMNS)
+    columns = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown columns {', '.join(unknown)}; choose from {', '.join(EXPORT_COLUMNS)}")
+    return list(dict.fromkeys(columns))
+
+
+def export_rows(columns: List[str], job_title: Optional[str] = None, date_from: Optional[str] = None,
+                date_to: Optional[str] = None, since_id: Optional[int] = None,
+                batch_size: int = 1000) -> Iterator[tuple]:
+    """Plain row tuples in id order, fetched ``batch_size`` at a time.
+
+    Only the selected columns are read and no ORM objects are built; with
+    yield_per the driver uses a server-side cursor where it has one, so
+    memory does not grow with the table.
+    """
+    query = db.session.query(*[EXPORT_COLUMNS[name] for name in columns])
+    if 'job_description' in columns:
+        query = query.outerjoin(JobDescription, JobDescription.id == ResumeAnalysis.job_description_id)
+    query = filter_analyses(query, job_title, date_from, date_to)
+    if since_id is not None:
+        query = query.filter(ResumeAnalysis.id > since_id)
+    return iter(query.order_by(ResumeAnalysis.id).yield_per(batch_size))
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_ndjson(rows: Iterable[tuple], columns: List[str]) -> Iterator[str]:
+    decoded = [name in JSON_COLUMNS for name in columns]
+    for row in rows:
+        record = {}
+        for name, is_json, value in zip(columns, decoded, row):
+            if is_json:
+                record[name] = json.loads(value) if value else None
+            else:
+                record[name] = _json_value(value)
+        yield json.dumps(record) + '\n'
+
+
+def iter_csv(rows: Iterable[tuple], columns: List[str], rows_per_chunk: int = 500) -> Iterator[str]:
+    """CSV with a header row; JSON columns are kept as their JSON text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 1
+    for row in rows:
+        writer.writerow([value.isoformat() if isinstance(value, datetime) else value for value in row])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def encode_chunks(parts: Iterable[str], compress: bool = False, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """UTF-8 encode text parts into chunks of about ``chunk_size``, gzip-compressed on the fly if asked."""
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending = []
+    size = 0
+    for part in parts:
+        data = part.encode('utf-8')
+        pending.append(gzip.compress(data) if gzip else data)
+        size += len(pending[-1])
+        if size >= chunk_size:
+            yield b''.join(pending)
+            pending = []
+            size = 0
+    if gzip:
+        pending.append(gzip.flush())
+    if pending:
+        yield b''.join(pending)
+
+
+def stream_analyses(export_format: str, columns: List[str], compress: bool = False,
+                    batch_size: int = 1000, **filters) -> Iterator[bytes]:
+    """The filtered analyses as NDJSON or CSV bytes, optionally gzipped.
+
+    ``filters`` are passed to ``export_rows`` (job_title, date_from, date_to,
+    since_id).
+    """
+    if export_format not in DATA_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(DATA_FORMATS)}")
+    rows = export_rows(columns, batch_size=batch_size, **filters)
+    parts = iter_ndjson(rows, columns) if export_format == 'ndjson' else iter_csv(rows, columns)
+    return encode_chunks(parts, compress)
@@ -0,0 +1,49 @@
+import threading
+
+
+class DedupStats:
+    """Counts how often identical resume/JD pairs were served from storage.
+
+    Hits include near-duplicate resumes reused under NEAR_DUP_REUSE, which
+    are also counted separately.
+
+    Misses record how long the full analysis took, so the compute saved by
+    hits can be estimated as hits x average miss time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.analysis_seconds = 0.0
+
+    def record_hit(self, near: bool = False):
+        with self._lock:
+            self.hits += 1
+            if near:
+                self.near_hits += 1
+
+    def record_miss(self, seconds: float, forced: bool = False):
+        with self._lock:
+            self.misses += 1
+            self.analysis_seconds += seconds
+            if forced:
+                self.refreshes += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        average = self.analysis_seconds / self.misses if self.misses else 0.0
+        return {
+            'hits': self.hits,
+            'near_duplicate_hits': self.near_hits,
+            'misses': self.misses,
+            'forced_refreshes': self.refreshes,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'avg_analysis_seconds': round(average, 4),
+            'estimated_seconds_saved': round(self.hits * average, 2)
+        }
+
+
+dedup_stats = DedupStats()
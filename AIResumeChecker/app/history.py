@@ -0,0 +1,129 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only
+
+from app.models import ResumeAnalysis
+
+# sort name -> (column, descending); every sort ends with id as a tiebreaker
+SORTS = {
+    'newest': (ResumeAnalysis.created_at, True),
+    'oldest': (ResumeAnalysis.created_at, False),
+    'score_desc': (ResumeAnalysis.overall_score, True),
+    'score_asc': (ResumeAnalysis.overall_score, False),
+}
+
+# Only what the history table shows; the resume/JD text and JSON blobs stay in the database
+LIST_COLUMNS = (
+    ResumeAnalysis.id,
+    ResumeAnalysis.filename,
+    ResumeAnalysis.job_title,
+    ResumeAnalysis.overall_score,
+    ResumeAnalysis.technical_skills_score,
+    ResumeAnalysis.created_at,
+)
+
+
+def encode_cursor(sort: str, row: ResumeAnalysis) -> str:
+    column, _ = SORTS[sort]
+    value = getattr(row, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, row.id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(sort: str, token: str) -> tuple:
+    """Return the (sort value, id) a cursor points at; ValueError if it is invalid."""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        cursor_sort, value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if cursor_sort != sort:
+            raise ValueError('Cursor belongs to a different sort order')
+        column, _ = SORTS[sort]
+        value = datetime.fromisoformat(value) if column is ResumeAnalysis.created_at else float(value)
+        return value, int(row_id)
+    except ValueError:
+        raise
+    except Exception:
+        raise ValueError('Malformed cursor')
+
+
+class HistoryPage:
+    """One page of analysis history, paginated by keyset on (sort column, id).
+
+    Pages are fetched with ``WHERE (col, id) < (last_col, last_id) ORDER BY
+    col, id LIMIT n``, so every page costs an index range scan no matter how
+    deep it is, unlike OFFSET. ``before`` walks back towards the first page
+    by scanning in the opposite direction.
+    """
+
+    def __init__(self, sort: str = 'newest', job_title: Optional[str] = None,
+                 min_score: Optional[float] = None, max_score: Optional[float] = None,
+                 after: Optional[str] = None, before: Optional[str] = None, per_page: int = 20):
+        if sort not in SORTS:
+            raise ValueError(f'Unknown sort: {sort}')
+        self.sort = sort
+        self.job_title = job_title
+        self.min_score = min_score
+        self.max_score = max_score
+        self.per_page = per_page
+        self.items = []
+        self.next_cursor = None
+        self.prev_cursor = None
+        self._fetch(after, before)
+
+    def _fetch(self, after: Optional[str], before: Optional[str]):
+        column, descending = SORTS[self.sort]
+        query = ResumeAnalysis.query.options(load_only(*LIST_COLUMNS))
+        if self.job_title:
+            query = query.filter(ResumeAnalysis.job_title == self.job_title)
+        if self.min_score is not None:
+            query = query.filter(ResumeAnalysis.overall_score >= self.min_score)
+        if self.max_score is not None:
+            query = query.filter(ResumeAnalysis.overall_score <= self.max_score)
+
+        backwards = before is not None
+        key = tuple_(column, ResumeAnalysis.id)
+        if backwards:
+            value, row_id = decode_cursor(self.sort, before)
+            query = query.filter(key > (value, row_id) if descending else key < (value, row_id))
+            descending = not descending
+        elif after is not None:
+            value, row_id = decode_cursor(self.sort, after)
+            query = query.filter(key < (value, row_id) if descending else key > (value, row_id))
+
+        if descending:
+            query = query.order_by(column.desc(), ResumeAnalysis.id.desc())
+        else:
+            query = query.order_by(column.asc(), ResumeAnalysis.id.asc())
+
+        rows = query.limit(self.per_page + 1).all()
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, after is not None
+
+        self.items = rows
+        if rows and has_next:
+            self.next_cursor = encode_cursor(self.sort, rows[-1])
+        if rows and has_prev:
+            self.prev_cursor = encode_cursor(self.sort, rows[0])
+
+    def filter_args(self) -> dict:
+        """Current filters as query-string arguments, for building page links."""
+        args = {'sort': self.sort, 'per_page': self.per_page}
+        if self.job_title:
+            args['job_title'] = self.job_title
+        if self.min_score is not None:
+            args['min_score'] = self.min_score
+        if self.max_score is not None:
+            args['max_score'] = self.max_score
+        return args
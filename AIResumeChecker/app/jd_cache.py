@@ -0,0 +1,113 @@
+import json
+import os
+import tempfile
+import time
+from typing import Optional
+
+from app.cache import LRUCache
+
+
+class JDArtifactCache:
+    """Two-tier cache of preprocessed job-description artifacts.
+
+    Entries are keyed by a content hash of the JD text and of the skill
+    taxonomy it was processed with (see NLPAnalyzer.prepare_job), so editing
+    the taxonomy never serves stale skills. The first tier is an
+    in-process LRU bounded by entry count and TTL; the optional second tier
+    stores one JSON file per entry under ``disk_dir`` so warm artifacts
+    survive worker restarts and are shared by workers on the same host.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = 3600,
+                 disk_dir: Optional[str] = None, disk_max_entries: int = 100000):
+        self.memory = LRUCache(max_size=max_size, ttl=ttl)
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.disk_max_entries = disk_max_entries
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_errors = 0
+        self._disk_writes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        artifacts = self.memory.get(key)
+        if artifacts is not None or not self.disk_dir:
+            return artifacts
+
+        artifacts = self._read_disk(key)
+        if artifacts is None:
+            self.disk_misses += 1
+            return None
+
+        self.disk_hits += 1
+        self.memory.set(key, artifacts)
+        return artifacts
+
+    def set(self, key: str, artifacts: dict):
+        self.memory.set(key, artifacts)
+        if self.disk_dir:
+            self._write_disk(key, artifacts)
+
+    def _read_disk(self, key: str) -> Optional[dict]:
+        path = self._disk_path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.disk_errors += 1
+            print(f"Error reading JD cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, artifacts: dict):
+        try:
+            # Write to a temp file and rename so readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(artifacts, f)
+            os.replace(tmp_path, self._disk_path(key))
+            self._disk_writes += 1
+            # Listing the directory is not free, so only check the bound now and then
+            if self._disk_writes % 100 == 0:
+                self._prune_disk()
+        except (OSError, TypeError, ValueError) as e:
+            self.disk_errors += 1
+            print(f"Error writing JD cache entry {key}: {e}")
+
+    def _prune_disk(self):
+        entries = [name for name in os.listdir(self.disk_dir) if name.endswith('.json')]
+        overflow = len(entries) - self.disk_max_entries
+        if overflow <= 0:
+            return
+        paths = sorted((os.path.join(self.disk_dir, name) for name in entries), key=os.path.getmtime)
+        for path in paths[:overflow]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk_dir:
+            for name in os.listdir(self.disk_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.disk_dir, name))
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats['disk'] = {
+            'enabled': bool(self.disk_dir),
+            'hits': self.disk_hits,
+            'misses': self.disk_misses,
+            'errors': self.disk_errors
+        }
+        return stats
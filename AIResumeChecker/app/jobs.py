@@ -0,0 +1,253 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app import db
+from app.models import AnalysisJob, ResumeAnalysis
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at JOB_QUEUE_MAX and new work is shed."""
+
+
+def enqueue_job(config, filename: str, job_title: str, job_description: str,
+                file_data: Optional[bytes] = None, resume_text: Optional[str] = None,
+                force_refresh: bool = False) -> AnalysisJob:
+    """Persist a new queued job, refusing it when the queue is full."""
+    depth = AnalysisJob.query.filter_by(status=AnalysisJob.QUEUED).count()
+    if depth >= config['JOB_QUEUE_MAX']:
+        raise QueueFullError(f'Analysis queue is full ({depth} jobs waiting)')
+
+    job = AnalysisJob(
+        id=uuid.uuid4().hex,
+        status=AnalysisJob.QUEUED,
+        filename=filename,
+        job_title=job_title,
+        job_description=job_description,
+        file_data=file_data,
+        resume_text=resume_text,
+        force_refresh=force_refresh,
+        max_attempts=config['JOB_MAX_ATTEMPTS']
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+# --- Worker process side -------------------------------------------------
+
+_worker_app = None
+
+
+def _init_worker():
+    """Pool initializer: each worker builds its own app, DB engine and analyzer."""
+    global _worker_app
+    from app import create_app
+
+    _worker_app = create_app()
+
+
+def run_job(job_id: str) -> int:
+    """Execute one job inside a pool worker and return the new analysis id."""
+    from app import analyzer_pool
+    from app.dedup import dedup_stats
+    from app.near_dup import find_reusable
+    from app.resume_parser import ResumeParser
+
+    with _worker_app.app_context():
+        job = db.session.get(AnalysisJob, job_id)
+        if job is None:
+            raise LookupError(f'Job {job_id} no longer exists')
+
+        resume_text = job.resume_text
+        if resume_text is None:
+            resume_text, metadata = ResumeParser.parse_resume(job.file_data, job.filename)
+            if not resume_text:
+                raise ValueError(metadata.get('error', 'Could not extract text from file'))
+
+        if not job.force_refresh:
+            existing = ResumeAnalysis.find_duplicate(resume_text, job.job_description, job.job_title)
+            if existing is not None:
+                dedup_stats.record_hit()
+                return existing.id
+            existing = find_reusable(resume_text, job.job_description, job.job_title)
+            if existing is not None:
+                dedup_stats.record_hit(near=True)
+                return existing.id
+        
+        started = time.perf_counter()
+        results = analyzer_pool.get().analyze_resume_job_fit(resume_text, job.job_description)
+        dedup_stats.record_miss(time.perf_counter() - started, forced=job.force_refresh)
+        analysis = ResumeAnalysis.from_results(
+            job.filename, job.job_title, job.job_description, resume_text, results
+        )
+        db.session.add(analysis)
+        db.session.commit()
+        return analysis.id
+
+
+# --- Dispatcher side -----------------------------------------------------
+
+class JobRunner:
+    """Feeds queued jobs from the database to a pool of analysis processes.
+
+    A single dispatcher thread claims jobs (atomically, so several runners
+    can share one queue), enforces the per-job timeout and applies retries.
+    A job that overruns its timeout takes the pool down with it: the pool is
+    terminated and rebuilt, and any other in-flight jobs are requeued without
+    losing an attempt.
+    """
+
+    def __init__(self, app, workers: Optional[int] = None):
+        self.app = app
+        self.workers = workers or app.config['JOB_WORKERS']
+        self.timeout = app.config['JOB_TIMEOUT']
+        self.poll_interval = app.config['JOB_POLL_INTERVAL']
+        self.context = multiprocessing.get_context(app.config['JOB_START_METHOD'])
+        self._pool = None
+        self._inflight = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _new_pool(self):
+        return self.context.Pool(
+            processes=self.workers,
+            initializer=_init_worker,
+            maxtasksperchild=self.app.config['JOB_MAX_TASKS_PER_WORKER']
+        )
+
+    def start(self):
+        """Run the dispatcher in a daemon thread."""
+        self._thread = threading.Thread(target=self.run, name='job-dispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def run(self):
+        """Dispatch until stop() is called."""
+        with self.app.app_context():
+            self._pool = self._new_pool()
+            next_requeue = 0.0
+            try:
+                while not self._stop.is_set():
+                    try:
+                        # Also catches jobs orphaned by a runner that died
+                        # after this one started
+                        if time.monotonic() >= next_requeue:
+                            next_requeue = time.monotonic() + self.timeout
+                            self.requeue_stale()
+                        self._collect()
+                        free = self.workers - len(self._inflight)
+                        for job_id in self._claim(free):
+                            self._inflight[job_id] = (
+                                self._pool.apply_async(run_job, (job_id,)),
+                                time.monotonic() + self.timeout
+                            )
+                    except Exception as e:
+                        # Keep dispatching through transient DB errors (locked
+                        # SQLite file, tables not created yet, ...)
+                        db.session.rollback()
+                        print(f"Job dispatcher error: {e}")
+                    self._stop.wait(self.poll_interval)
+            finally:
+                self._pool.terminate()
+                self._pool.join()
+                for job_id in list(self._inflight):
+                    self._release(job_id)
+
+    def requeue_stale(self):
+        """Requeue jobs left running by a runner that died mid-job.
+
+        Called every ``timeout`` seconds by the dispatcher. A live runner
+        times its own jobs out after ``timeout``, so a job still running
+        after twice that, and not in flight here, has lost its runner.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.timeout * 2)
+        stale = AnalysisJob.query.filter(
+            AnalysisJob.status == AnalysisJob.RUNNING,
+            AnalysisJob.started_at < cutoff,
+            AnalysisJob.id.notin_(list(self._inflight))
+        ).all()
+        for job in stale:
+            self._fail_or_retry(job, 'Worker lost while running job')
+        db.session.commit()
+
+    def _claim(self, limit: int) -> list:
+        if limit <= 0:
+            return []
+        candidates = (db.session.query(AnalysisJob.id)
+                      .filter(AnalysisJob.status == AnalysisJob.QUEUED)
+                      .order_by(AnalysisJob.created_at)
+                      .limit(limit)
+                      .all())
+        claimed = []
+        for (job_id,) in candidates:
+            updated = (AnalysisJob.query
+                       .filter(AnalysisJob.id == job_id, AnalysisJob.status == AnalysisJob.QUEUED)
+                       .update({
+                           'status': AnalysisJob.RUNNING,
+                           'attempts': AnalysisJob.attempts + 1,
+                           'started_at': datetime.utcnow(),
+                           'error': None
+                       }, synchronize_session=False))
+            if updated:
+                claimed.append(job_id)
+        db.session.commit()
+        return claimed
+
+    def _collect(self):
+        now = time.monotonic()
+        timed_out = False
+        for job_id, (result, deadline) in list(self._inflight.items()):
+            if result.ready():
+                del self._inflight[job_id]
+                job = db.session.get(AnalysisJob, job_id)
+                try:
+                    job.analysis_id = result.get()
+                    job.status = AnalysisJob.DONE
+                    job.finished_at = datetime.utcnow()
+                    job.file_data = None
+                except Exception as e:
+                    self._fail_or_retry(job, str(e) or e.__class__.__name__)
+                db.session.commit()
+            elif now > deadline:
+                del self._inflight[job_id]
+                job = db.session.get(AnalysisJob, job_id)
+                self._fail_or_retry(job, f'Timed out after {self.timeout}s')
+                db.session.commit()
+                timed_out = True
+
+        if timed_out:
+            # The hung worker cannot be interrupted on its own; recycle the pool
+            self._pool.terminate()
+            self._pool.join()
+            for job_id in list(self._inflight):
+                self._release(job_id)
+            self._pool = self._new_pool()
+
+    def _release(self, job_id: str):
+        """Put an interrupted job back in the queue without charging an attempt."""
+        self._inflight.pop(job_id, None)
+        job = db.session.get(AnalysisJob, job_id)
+        if job is not None and job.status == AnalysisJob.RUNNING:
+            job.status = AnalysisJob.QUEUED
+            job.attempts = max(job.attempts - 1, 0)
+            job.started_at = None
+        db.session.commit()
+
+    def _fail_or_retry(self, job: AnalysisJob, error: str):
+        db.session.refresh(job)
+        job.error = error
+        if job.attempts < job.max_attempts:
+            job.status = AnalysisJob.QUEUED
+            job.started_at = None
+        else:
+            job.status = AnalysisJob.FAILED
+            job.finished_at = datetime.utcnow()
+            job.file_data = None
@@ -0,0 +1,275 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from flask import g, has_request_context, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = tuple(1024 * 4 ** power for power in range(8))  # 1 KiB .. 16 MiB
+CHARS_BUCKETS = (500, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+
+
+class Histogram:
+    """Fixed-bucket histogram with labels.
+
+    An observation is one bisect and three additions under a lock; cumulative
+    bucket counts are only computed when /metrics is scraped.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # per-bucket counts (+Inf last), sum, count
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            snapshot = [(key, list(series[0]), series[1], series[2]) for key, series in self._series.items()]
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}'
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {_format_value(total)}'
+            yield f'{self.name}_count{labels} {count}'
+
+
+class MetricsRegistry:
+    """Holds metrics plus collectors that report values computed at scrape time.
+
+    A collector returns (name, type, help, [(labels dict, value), ...]) tuples.
+    Values live in process memory, so each worker process reports its own.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, func: Callable[[], Iterable[tuple]]):
+        self._collectors.append(func)
+        return func
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.samples())
+        for func in self._collectors:
+            try:
+                families = list(func())
+            except Exception as e:
+                print(f"Metrics collector {func.__name__} failed: {e}")
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    label_text = _format_labels(list(labels), list(labels.values()))
+                    lines.append(f'{name}{label_text} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_SECONDS = registry.histogram(
+    'resume_checker_request_duration_seconds', 'HTTP request latency.',
+    ['endpoint', 'method', 'status'])
+STAGE_SECONDS = registry.histogram(
+    'resume_checker_request_stage_duration_seconds', 'Time spent in each stage of a request.',
+    ['endpoint', 'stage'])
+ANALYZER_STAGE_SECONDS = registry.histogram(
+    'resume_checker_analyzer_stage_duration_seconds',
+    'Time per stage of NLPAnalyzer.analyze_resume_job_fit, from every caller.', ['stage'])
+DOCUMENT_BYTES = registry.histogram(
+    'resume_checker_document_bytes', 'Size of uploaded or rendered documents.', ['kind'],
+    buckets=BYTES_BUCKETS)
+DOCUMENT_CHARS = registry.histogram(
+    'resume_checker_document_chars', 'Length of analyzed texts in characters.', ['kind'],
+    buckets=CHARS_BUCKETS)
+ERRORS = registry.counter(
+    'resume_checker_errors_total', 'Errors handled by the instrumented endpoints.', ['endpoint', 'type'])
+
+
+def _endpoint() -> str:
+    return (request.endpoint or 'unmatched') if has_request_context() else 'none'
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as a stage of the current request.
+
+    Durations accumulate in ``g.stage_timings`` (milliseconds) and are turned
+    into histogram observations once the request finishes. Outside a request
+    the block simply runs.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context():
+            elapsed = (time.perf_counter() - started) * 1000
+            timings = g.setdefault('stage_timings', {})
+            timings[name] = round(timings.get(name, 0.0) + elapsed, 3)
+
+
+def request_timings(prefix: str = '') -> Optional[dict]:
+    """A dict for ``analyze_resume_job_fit(timings=...)`` whose stages land in this request's breakdown."""
+    if not has_request_context():
+        return None
+    timings = {}
+    g.setdefault('nested_timings', []).append((prefix, timings))
+    return timings
+
+
+def observe_analyzer_stage(name: str, milliseconds: float):
+    ANALYZER_STAGE_SECONDS.observe(milliseconds / 1000, stage=name)
+
+
+def observe_document(kind: str, size_bytes: Optional[int] = None, chars: Optional[int] = None):
+    if size_bytes is not None:
+        DOCUMENT_BYTES.observe(size_bytes, kind=kind)
+    if chars is not None:
+        DOCUMENT_CHARS.observe(chars, kind=kind)
+
+
+def record_error(error: BaseException):
+    ERRORS.inc(endpoint=_endpoint(), type=error.__class__.__name__)
+
+
+def _cache_families() -> Iterable[tuple]:
+    from app import analyzer_pool
+    from app.dedup import dedup_stats
+    from app.report_cache import report_cache
+
+    caches = {'report': report_cache.stats()}
+    # Never load the model just to be scraped
+    analyzer = analyzer_pool.loaded
+    if analyzer is not None:
+        caches['jd'] = analyzer.jd_cache.stats()
+    dedup = dedup_stats.stats()
+
+    for field, kind in (('hits', 'counter'), ('misses', 'counter'), ('evictions', 'counter'), ('size', 'gauge')):
+        yield (f'resume_checker_cache_{field}' + ('_total' if kind == 'counter' else ''), kind,
+               f'Cache {field} per in-process cache.',
+               [({'cache': name}, stats.get(field, 0)) for name, stats in caches.items()])
+    yield ('resume_checker_cache_bytes', 'gauge', 'Bytes held by size-bounded caches.',
+           [({'cache': name}, stats['bytes']) for name, stats in caches.items() if stats.get('max_bytes')])
+    yield ('resume_checker_dedup_lookups_total', 'counter', 'Stored-analysis reuse lookups.',
+           [({'result': 'hit'}, dedup['hits']), ({'result': 'miss'}, dedup['misses'])])
+
+
+registry.collector(_cache_families)
+
+
+def init_app(app):
+    """Time every request and log a stage breakdown for slow ones."""
+    slow_ms = app.config.get('SLOW_REQUEST_MS')
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+        g.stage_timings = {}
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        endpoint = _endpoint()
+        REQUEST_SECONDS.observe(elapsed, endpoint=endpoint, method=request.method,
+                                status=response.status_code)
+
+        timings = g.get('stage_timings', {})
+        for prefix, nested in g.get('nested_timings', []):
+            for name, value in nested.items():
+                timings[prefix + name] = value
+        for name, value in timings.items():
+            STAGE_SECONDS.observe(value / 1000, endpoint=endpoint, stage=name)
+
+        if slow_ms is not None and elapsed * 1000 >= slow_ms:
+            print("Slow request: " + json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'endpoint': endpoint,
+                'status': response.status_code,
+                'duration_ms': round(elapsed * 1000, 1),
+                'stages_ms': timings
+            }))
+        return response
@@ -1,13 +1,17 @@
 from app import db
+from app.compression import CompressedText
 from datetime import datetime
+import hashlib
 import json
 
 class ResumeAnalysis(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(255), nullable=False)
     job_title = db.Column(db.String(255), nullable=False)
-    job_description = db.Column(db.Text, nullable=False)
-    resume_text = db.Column(db.Text, nullable=False)
+    # Shared with every other analysis against the same text; see job_description
+    job_description_id = db.Column(db.Integer, db.ForeignKey('job_description.id'), index=True)
+    # Large and rarely needed, so only loaded (and decompressed) on access
+    resume_text = db.deferred(db.Column(CompressedText, nullable=False))
     
     # Analysis results
     overall_score = db.Column(db.Float, nullable=False)
@@ -16,13 +20,110 @@ class ResumeAnalysis(db.Model):
     keyword_match_score = db.Column(db.Float, nullable=False)
     
     # JSON fields for detailed results
-    matched_skills = db.Column(db.Text)  # JSON string
-    missing_skills = db.Column(db.Text)  # JSON string
-    recommendations = db.Column(db.Text)  # JSON string
-    extracted_entities = db.Column(db.Text)  # JSON string
+    matched_skills = db.Column(CompressedText)  # JSON string
+    missing_skills = db.Column(CompressedText)  # JSON string
+    recommendations = db.Column(CompressedText)  # JSON string
+    extracted_entities = db.Column(CompressedText)  # JSON string
+    
+    # Content hashes of the resume and JD text, for reusing identical analyses
+    resume_hash = db.Column(db.String(64))
+    job_hash = db.Column(db.String(64))
+    
+    # MinHash of the resume's shingles and the closest earlier near-duplicate
+    # at ingest time, maintained by app.near_dup
+    resume_minhash = db.Column(db.LargeBinary)
+    near_duplicate_of_id = db.Column(db.Integer, db.ForeignKey('resume_analysis.id', ondelete='SET NULL'))
+    near_duplicate_score = db.Column(db.Float)
+    
+    # Skill taxonomy the scores were computed with; see app.taxonomy
+    taxonomy_version_id = db.Column(db.Integer, db.ForeignKey('taxonomy_version.id'), index=True)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    job = db.relationship('JobDescription', lazy='select')
+    near_duplicate_of = db.relationship('ResumeAnalysis', remote_side=[id], lazy='select')
+    bands = db.relationship('ResumeBand', lazy='select', cascade='all, delete-orphan')
+    
+    # Relational copy of matched/missing skills, kept in sync by app.analytics
+    skill_links = db.relationship('AnalysisSkill', backref='analysis', lazy='select',
+                                  cascade='all, delete-orphan')
+    
+    __table_args__ = (
+        db.Index('ix_resume_analysis_content', 'resume_hash', 'job_hash'),
+        # Keyset pagination of /history for each sort order and job-title filter
+        db.Index('ix_resume_analysis_created', 'created_at', 'id'),
+        db.Index('ix_resume_analysis_score', 'overall_score', 'id'),
+        db.Index('ix_resume_analysis_title_created', 'job_title', 'created_at', 'id'),
+        db.Index('ix_resume_analysis_title_score', 'job_title', 'overall_score', 'id'),
+    )
+    
+    @property
+    def job_description(self):
+        return self.job.text if self.job is not None else None
+    
+    @job_description.setter
+    def job_description(self, text):
+        self.job = JobDescription.get_or_create(text)
+        self.job_hash = self.job.content_hash
+    
+    @classmethod
+    def find_duplicate(cls, resume_text, job_description, job_title=None):
+        """Most recent stored analysis of the same resume against the same JD."""
+        from app.nlp_analyzer import content_hash
+        
+        query = cls.query.filter_by(resume_hash=content_hash(resume_text),
+                                    job_hash=content_hash(job_description))
+        if job_title is not None:
+            query = query.filter_by(job_title=job_title)
+        return query.order_by(cls.created_at.desc()).first()
+    
+    @classmethod
+    def from_results(cls, filename, job_title, job_description, resume_text, results):
+        """Build an unsaved analysis row from analyze_resume_job_fit output."""
+        from app.nlp_analyzer import content_hash
+        
+        analysis = cls(
+            filename=filename,
+            job_title=job_title,
+            job_description=job_description,
+            resume_text=resume_text,
+            overall_score=results['overall_score'],
+            technical_skills_score=results['technical_score'],
+            soft_skills_score=results['soft_skills_score'],
+            keyword_match_score=results['keyword_match_score'],
+            resume_hash=content_hash(resume_text),
+            job_hash=content_hash(job_description)
+        )
+        
+        analysis.set_matched_skills(results['matched_skills'])
+        analysis.set_missing_skills(results['missing_skills'])
+        analysis.set_recommendations(results['recommendations'])
+        analysis.set_extracted_entities(results['resume_entities'])
+        return analysis
+    
+    def to_results(self):
+        """The stored scores in the shape analyze_resume_job_fit returns them."""
+        return {
+            'overall_score': self.overall_score,
+            'technical_score': self.technical_skills_score,
+            'soft_skills_score': self.soft_skills_score,
+            'keyword_match_score': self.keyword_match_score,
+            'matched_skills': self.get_matched_skills(),
+            'missing_skills': self.get_missing_skills(),
+            'recommendations': self.get_recommendations(),
+            'resume_entities': self.get_extracted_entities()
+        }
+    
+    def content_version(self):
+        """Short hash of everything a rendered report shows, for report caching."""
+        payload = json.dumps([
+            self.filename, self.job_title, self.overall_score, self.technical_skills_score,
+            self.soft_skills_score, self.keyword_match_score, self.matched_skills,
+            self.missing_skills, self.recommendations,
+            self.created_at.isoformat() if self.created_at else None
+        ])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+    
     def set_matched_skills(self, skills_list):
         self.matched_skills = json.dumps(skills_list)
     
@@ -45,4 +146,207 @@ class ResumeAnalysis(db.Model):
         self.extracted_entities = json.dumps(entities_dict)
     
     def get_extracted_entities(self):
-        return json.loads(self.extracted_entities) if self.extracted_entities else {}
\ No newline at end of file
+        return json.loads(self.extracted_entities) if self.extracted_entities else {}
+
+
+class JobDescription(db.Model):
+    """A job description stored once, whatever the number of analyses against it."""
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)  # content_hash(text)
+    text = db.Column(CompressedText, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @classmethod
+    def get_or_create(cls, text):
+        """The stored row for this text, inserting it if needed."""
+        from app.nlp_analyzer import content_hash
+        
+        return _get_or_insert(cls, {'content_hash': content_hash(text)}, text=text)
+
+
+class TaxonomyVersion(db.Model):
+    """A snapshot of the skill taxonomy (skills per category and aliases)."""
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)
+    skills = db.Column(db.Text, nullable=False)  # JSON, see app.taxonomy.taxonomy_snapshot
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    @staticmethod
+    def snapshot_hash(snapshot):
+        return hashlib.sha256(json.dumps(snapshot, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def get_or_create(cls, snapshot):
+        """The stored row for this snapshot, inserting it if needed."""
+        return _get_or_insert(cls, {'content_hash': cls.snapshot_hash(snapshot)},
+                              skills=json.dumps(snapshot, sort_keys=True))
+    
+    def get_skills(self):
+        return json.loads(self.skills)
+
+
+def _get_or_insert(cls, key, **values):
+    """Row of ``cls`` with these values of its unique ``key`` columns, inserting it if needed.
+    
+    The insert ignores conflicts on the key, so concurrent requests with
+    the same new content end up sharing one row.
+    """
+    with db.session.no_autoflush:
+        row = cls.query.filter_by(**key).first()
+        if row is None:
+            dialect = db.session.get_bind().dialect.name
+            if dialect == 'postgresql':
+                from sqlalchemy.dialects.postgresql import insert
+            elif dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                insert = None
+            if insert is not None:
+                db.session.execute(insert(cls).values(**key, **values)
+                                   .on_conflict_do_nothing(index_elements=list(key)))
+            else:
+                db.session.execute(db.insert(cls).values(**key, **values))
+            row = cls.query.filter_by(**key).one()
+    return row
+
+
+class RescoreRun(db.Model):
+    """Progress of a `flask taxonomy rescore` run, committed with every batch.
+    
+    An interrupted run is resumed from last_id by the next run against the
+    same taxonomy version.
+    """
+    RUNNING = 'running'
+    DONE = 'done'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    taxonomy_version_id = db.Column(db.Integer, db.ForeignKey('taxonomy_version.id'), nullable=False)
+    status = db.Column(db.String(16), nullable=False, default=RUNNING)
+    # Analyses up to max_id (the newest when the run started) are covered
+    max_id = db.Column(db.Integer, nullable=False)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    checked = db.Column(db.Integer, nullable=False, default=0)
+    rescored = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'run_id': self.id,
+            'taxonomy_version_id': self.taxonomy_version_id,
+            'status': self.status,
+            'max_id': self.max_id,
+            'last_id': self.last_id,
+            'checked': self.checked,
+            'rescored': self.rescored,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class Skill(db.Model):
+    """A skill from the taxonomy, referenced by AnalysisSkill rows."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(16), nullable=False)  # 'technical' or 'soft'
+    
+    __table_args__ = (
+        db.UniqueConstraint('name', 'category', name='uq_skill_name_category'),
+    )
+    
+    @classmethod
+    def get_or_create(cls, name, category):
+        """The stored row for this skill, inserting it if needed."""
+        return _get_or_insert(cls, {'name': name, 'category': category})
+
+
+class AnalysisSkill(db.Model):
+    """One required skill of an analysis' job, matched or missing in the resume."""
+    analysis_id = db.Column(db.Integer, db.ForeignKey('resume_analysis.id', ondelete='CASCADE'),
+                            primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    matched = db.Column(db.Boolean, nullable=False)
+    
+    skill = db.relationship('Skill')
+    
+    __table_args__ = (
+        db.Index('ix_analysis_skill_gap', 'skill_id', 'matched', 'analysis_id'),
+    )
+
+
+class ResumeBand(db.Model):
+    """One LSH band bucket of an analysis' resume MinHash; see app.near_dup."""
+    bucket = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('resume_analysis.id', ondelete='CASCADE'),
+                            primary_key=True)
+    
+    __table_args__ = (
+        db.Index('ix_resume_band_analysis', 'analysis_id'),
+    )
+
+
+class SkillGapSummary(db.Model):
+    """Monthly skill counts per job title, rebuilt by `flask analytics refresh`."""
+    period = db.Column(db.Date, primary_key=True)  # first day of the month
+    job_title = db.Column(db.String(255), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    matched = db.Column(db.Boolean, primary_key=True)
+    analyses = db.Column(db.Integer, nullable=False)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ScoreSummary(db.Model):
+    """Monthly overall-score histogram per job title, rebuilt with SkillGapSummary."""
+    period = db.Column(db.Date, primary_key=True)
+    job_title = db.Column(db.String(255), primary_key=True)
+    bucket = db.Column(db.Integer, primary_key=True)  # lower bound of a 10-point band
+    analyses = db.Column(db.Integer, nullable=False)
+    score_sum = db.Column(db.Float, nullable=False)
+    refreshed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class AnalysisJob(db.Model):
+    """A queued /jobs analysis; the table doubles as a durable work queue."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    
+    id = db.Column(db.String(32), primary_key=True)
+    status = db.Column(db.String(16), nullable=False, default=QUEUED)
+    filename = db.Column(db.String(255), nullable=False)
+    job_title = db.Column(db.String(255), nullable=False)
+    job_description = db.Column(db.Text, nullable=False)
+    
+    # Exactly one of these carries the resume
+    file_data = db.Column(db.LargeBinary)
+    resume_text = db.Column(db.Text)
+    force_refresh = db.Column(db.Boolean, nullable=False, default=False)
+    
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    error = db.Column(db.Text)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('resume_analysis.id'))
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('ix_analysis_job_status_created', 'status', 'created_at'),
+    )
+    
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'job_title': self.job_title,
+            'attempts': self.attempts,
+            'error': self.error,
+            'analysis_id': self.analysis_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -0,0 +1,226 @@
+"""Near-duplicate resumes via MinHash signatures and LSH banding.
+
+Each stored resume gets a MinHash signature over its word shingles
+(ResumeAnalysis.resume_minhash) plus one ResumeBand row per LSH band. Two
+resumes share a band bucket with high probability only when their shingle
+sets overlap heavily, so a lookup is one indexed ``bucket IN (...)`` query
+followed by signature comparisons against the few rows it returns, however
+many resumes are stored.
+"""
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import ResumeAnalysis, ResumeBand
+from config import Config
+
+# Stored signatures depend on these; changing any of them means re-running
+# `flask dedup minhash --rebuild`. 32 bands of 4 rows put the LSH threshold
+# (the similarity with a 50% chance of sharing a bucket) near 0.42, low
+# enough that pairs above NEAR_DUP_THRESHOLD are almost never missed.
+SHINGLE_WORDS = 5
+PERMUTATIONS = 128
+BANDS = 32
+ROWS_PER_BAND = PERMUTATIONS // BANDS
+SEED = 20240611
+SHINGLE_CHUNK = 4096  # shingles hashed per numpy block, bounds memory on long texts
+
+_WORD_RE = re.compile(r'\w+')
+_permutations = None
+
+
+def _hash_parameters():
+    """Multiply-shift hash parameters (a odd, b) for every permutation."""
+    global _permutations
+    if _permutations is None:
+        import numpy as np
+
+        rng = np.random.default_rng(SEED)
+        a = rng.integers(1, 2 ** 63, size=PERMUTATIONS, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        b = rng.integers(0, 2 ** 63, size=PERMUTATIONS, dtype=np.uint64)
+        _permutations = (a[:, None], b[:, None])
+    return _permutations
+
+
+def shingles(text: str) -> set:
+    """Overlapping SHINGLE_WORDS-word windows of the lowercased text."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(text: str) -> bytes:
+    """PERMUTATIONS 32-bit minimum hashes of the text's shingles, as bytes."""
+    import numpy as np
+
+    hashed = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+         for shingle in shingles(text)),
+        dtype=np.uint64)
+    signature = np.full(PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+    a, b = _hash_parameters()
+    with np.errstate(over='ignore'):
+        for start in range(0, len(hashed), SHINGLE_CHUNK):
+            block = hashed[start:start + SHINGLE_CHUNK][None, :]
+            # (a * x + b) mod 2^64, top 32 bits: one universal hash per permutation
+            values = ((a * block + b) >> np.uint64(32)).astype(np.uint32)
+            np.minimum(signature, values.min(axis=1), out=signature)
+    return signature.tobytes()
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    import numpy as np
+
+    return float(np.mean(np.frombuffer(first, dtype=np.uint32) == np.frombuffer(second, dtype=np.uint32)))
+
+
+def band_buckets(signature: bytes) -> List[int]:
+    """One signed 64-bit bucket key per band; the band number is part of the key."""
+    size = ROWS_PER_BAND * 4
+    return [int.from_bytes(hashlib.blake2b(bytes([band]) + signature[band * size:(band + 1) * size],
+                                           digest_size=8).digest(), 'little', signed=True)
+            for band in range(BANDS)]
+
+
+def find_near_duplicates(signature: bytes, threshold: Optional[float] = None, limit: int = 5,
+                         job_hash: Optional[str] = None, exclude_id: Optional[int] = None,
+                         session=None) -> List[Tuple[float, int]]:
+    """(similarity, analysis_id) of stored resumes at least ``threshold`` similar, best first.
+
+    Only rows sharing an LSH bucket are compared, and at most
+    NEAR_DUP_MAX_CANDIDATES of them (those sharing the most buckets).
+    ``job_hash`` restricts the search to analyses against that job.
+    """
+    session = session or db.session
+    threshold = Config.NEAR_DUP_THRESHOLD if threshold is None else threshold
+    shared = func.count(ResumeBand.bucket)
+    query = (session.query(ResumeBand.analysis_id)
+             .filter(ResumeBand.bucket.in_(band_buckets(signature))))
+    if job_hash is not None:
+        query = (query.join(ResumeAnalysis, ResumeAnalysis.id == ResumeBand.analysis_id)
+                 .filter(ResumeAnalysis.job_hash == job_hash))
+    if exclude_id is not None:
+        query = query.filter(ResumeBand.analysis_id != exclude_id)
+    candidate_ids = [row.analysis_id for row in query.group_by(ResumeBand.analysis_id)
+                     .order_by(shared.desc())
+                     .limit(Config.NEAR_DUP_MAX_CANDIDATES)]
+    if not candidate_ids:
+        return []
+
+    signatures = (session.query(ResumeAnalysis.id, ResumeAnalysis.resume_minhash)
+                  .filter(ResumeAnalysis.id.in_(candidate_ids)))
+    matches = [(similarity(signature, stored), analysis_id)
+               for analysis_id, stored in signatures if stored is not None]
+    # Most similar first; the newest analysis wins ties
+    matches.sort(key=lambda match: (match[0], match[1]), reverse=True)
+    return [match for match in matches if match[0] >= threshold][:limit]
+
+
+def find_reusable(resume_text: str, job_description: str, job_title: Optional[str] = None):
+    """Stored analysis of a near-identical resume against the same job, if reuse is on."""
+    from app.nlp_analyzer import content_hash
+
+    if not Config.NEAR_DUP_REUSE:
+        return None
+    matches = find_near_duplicates(minhash(resume_text), Config.NEAR_DUP_REUSE_THRESHOLD,
+                                   limit=10, job_hash=content_hash(job_description))
+    for score, analysis_id in matches:
+        analysis = db.session.get(ResumeAnalysis, analysis_id)
+        if analysis is not None and (job_title is None or analysis.job_title == job_title):
+            return analysis
+    return None
+
+
+def _best_pending_match(signature: bytes, buckets: List[int], pending: dict) -> Optional[Tuple[float, object]]:
+    """Most similar earlier analysis of the same flush sharing a bucket, at or above the threshold."""
+    candidates = {}
+    for bucket in buckets:
+        for position, other in pending.get(bucket, ()):
+            candidates[position] = other
+    best = None
+    for position, other in candidates.items():
+        score = similarity(signature, other.resume_minhash)
+        # The later (newer) analysis wins ties
+        if score >= Config.NEAR_DUP_THRESHOLD and (best is None or (score, position) > best[:2]):
+            best = (score, position, other)
+    return (best[0], best[2]) if best else None
+
+
+@event.listens_for(Session, 'before_flush')
+def _index_new_resumes(session, flush_context, instances):
+    """Sign, flag and band new analyses (and ones whose resume text changed).
+
+    Analyses in the same flush (a bulk ingest commits many at once) are not
+    in the database yet, so they are also compared with each other through
+    their in-memory band buckets.
+    """
+    changed = [obj for obj in session.new if isinstance(obj, ResumeAnalysis)]
+    changed += [obj for obj in session.dirty if isinstance(obj, ResumeAnalysis)
+                and inspect(obj).attrs.resume_text.history.has_changes()]
+    if not changed:
+        return
+
+    pending = {}
+    with session.no_autoflush:
+        for position, obj in enumerate(changed):
+            if obj.resume_minhash is None or obj in session.dirty:
+                obj.resume_minhash = minhash(obj.resume_text or '')
+            buckets = list(set(band_buckets(obj.resume_minhash)))
+            if obj.near_duplicate_of_id is None and obj.near_duplicate_of is None:
+                matches = find_near_duplicates(obj.resume_minhash, limit=1, exclude_id=obj.id,
+                                               session=session)
+                best = _best_pending_match(obj.resume_minhash, buckets, pending)
+                # Flush-mates are newer than every stored row, so they win ties
+                if best is not None and (not matches or best[0] >= matches[0][0]):
+                    obj.near_duplicate_of = best[1]
+                    obj.near_duplicate_score = round(best[0], 4)
+                elif matches:
+                    score, analysis_id = matches[0]
+                    obj.near_duplicate_of_id = analysis_id
+                    obj.near_duplicate_score = round(score, 4)
+            obj.bands = [ResumeBand(bucket=bucket) for bucket in buckets]
+            for bucket in buckets:
+                pending.setdefault(bucket, []).append((position, obj))
+
+
+def backfill_signatures(batch_size: int = 500, rebuild: bool = False) -> int:
+    """Compute signatures and band rows for analyses stored without them.
+
+    With ``rebuild`` every row is re-signed, e.g. after changing the
+    shingling or banding constants. Existing near-duplicate flags are kept.
+    """
+    if rebuild:
+        ResumeBand.query.delete(synchronize_session=False)
+        db.session.commit()
+    last_id = 0
+    signed = 0
+    while True:
+        query = (db.session.query(ResumeAnalysis.id, ResumeAnalysis.resume_text)
+                 .filter(ResumeAnalysis.id > last_id))
+        if not rebuild:
+            query = query.filter(ResumeAnalysis.resume_minhash.is_(None))
+        batch = query.order_by(ResumeAnalysis.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        signatures = {analysis_id: minhash(resume_text or '') for analysis_id, resume_text in batch}
+        db.session.bulk_update_mappings(ResumeAnalysis, [
+            {'id': analysis_id, 'resume_minhash': signature} for analysis_id, signature in signatures.items()
+        ])
+        if not rebuild:
+            ResumeBand.query.filter(ResumeBand.analysis_id.in_(signatures)).delete(synchronize_session=False)
+        db.session.execute(ResumeBand.__table__.insert(), [
+            {'bucket': bucket, 'analysis_id': analysis_id}
+            for analysis_id, signature in signatures.items()
+            for bucket in set(band_buckets(signature))
+        ])
+        db.session.commit()
+        signed += len(batch)
+    return signed
@@ -1,12 +1,153 @@
-import spacy
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import hashlib
 import re
 from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 from config import Config
+from app.jd_cache import JDArtifactCache
+from app.skill_matcher import SkillMatcher
+from app.metrics import observe_analyzer_stage
+from app.timing import StageTimer
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\.\,\-\+\#]')
+_SECTION_BREAK_RE = re.compile(r'\n\s*\n')
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?;:])\s+|\n')
+
+# Weights of the overall score: technical skills, soft skills, text similarity
+TECHNICAL_WEIGHT = 0.4
+SOFT_SKILLS_WEIGHT = 0.3
+SIMILARITY_WEIGHT = 0.3
+
+# spaCy, scikit-learn and numpy/scipy are imported on first use, so importing
+# this module (e.g. for content_hash) stays cheap
+_tfidf_analyzer = None
+
+
+def _tfidf_tokenize(text: str) -> list:
+    """Same tokenization, lowercasing and stop words as the TF-IDF vectorizer."""
+    global _tfidf_analyzer
+    if _tfidf_analyzer is None:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        _tfidf_analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+    return _tfidf_analyzer(text)
+
+
+def _expand_terms(term_vector: dict) -> list:
+    """Turn a term -> count mapping back into a token list for the vectorizer."""
+    return [term for term, count in term_vector.items() for _ in range(count)]
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace, drop special characters and lowercase."""
+    text = _WHITESPACE_RE.sub(' ', text.strip())
+    text = _SPECIAL_CHARS_RE.sub(' ', text)
+    return text.lower()
+
+
+def text_term_vector(text: str) -> dict:
+    """Term counts of a raw text as the TF-IDF vectorizer tokenizes it."""
+    return dict(Counter(_tfidf_tokenize(normalize_text(text))))
+
+
+def _chunk_pieces(text: str, max_chars: int) -> Iterator[str]:
+    """Whitespace-normalized sections of the text, split further into
+    sentences (then at spaces) where a section exceeds max_chars."""
+    for section in _SECTION_BREAK_RE.split(text):
+        normalized = _WHITESPACE_RE.sub(' ', section).strip()
+        if len(normalized) <= max_chars:
+            if normalized:
+                yield normalized
+            continue
+        for sentence in _SENTENCE_BREAK_RE.split(section):
+            sentence = _WHITESPACE_RE.sub(' ', sentence).strip()
+            while len(sentence) > max_chars:
+                cut = sentence.rfind(' ', 0, max_chars + 1)
+                cut = cut if cut > 0 else max_chars
+                yield sentence[:cut]
+                sentence = sentence[cut:].lstrip()
+            if sentence:
+                yield sentence
+
+
+def iter_chunks(text: str, max_chars: int) -> Iterator[str]:
+    """The text as chunks of at most max_chars, packed from whole sections or sentences."""
+    pending = []
+    size = 0
+    for piece in _chunk_pieces(text, max_chars):
+        if pending and size + len(piece) > max_chars:
+            yield ' '.join(pending)
+            pending = []
+            size = 0
+        pending.append(piece)
+        size += len(piece) + 1
+    if pending:
+        yield ' '.join(pending)
+
+
+# spaCy entity labels kept by extract_entities, by result key
+ENTITY_KEYS = ('organizations', 'education', 'locations', 'technologies')
+_ENTITY_LABELS = {'ORG': 'organizations', 'GPE': 'locations', 'LOC': 'locations',
+                  'PRODUCT': 'technologies', 'EVENT': 'technologies'}
+
+
+def _add_entities(doc, entities: dict):
+    """Add the doc's entities to per-key sets."""
+    for ent in doc.ents:
+        key = _ENTITY_LABELS.get(ent.label_)
+        if key is not None:
+            entities[key].add(ent.text)
+
+
+def _keyword_lemmas(doc) -> Iterator[str]:
+    """Lemmas of the doc's meaningful tokens (content words, no stop words)."""
+    for token in doc:
+        if (not token.is_stop and 
+            not token.is_punct and 
+            not token.is_space and 
+            len(token.text) > 2 and
+            token.pos_ in ['NOUN', 'ADJ', 'PROPN']):
+            yield token.lemma_.lower()
+
+
+def content_hash(text: str) -> str:
+    """Stable key for a text that ignores leading, trailing and repeated whitespace."""
+    normalized = _WHITESPACE_RE.sub(' ', text.strip())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ProcessedText:
+    """A text prepared once for analysis: its normalized form and spaCy Doc.
+    
+    Extracted artifacts are memoized on the instance, so a text can also be
+    rebuilt from cached artifacts without a Doc at all.
+    """
+
+    ARTIFACTS = ('normalized', 'skills', 'entities', 'keyword_counts', 'term_vector')
+
+    def __init__(self, text: str, normalized: str, doc=None):
+        self.text = text
+        self.normalized = normalized
+        self.doc = doc
+        self.skills = None
+        self.entities = None
+        self.keyword_counts = None
+        self.term_vector = None
+
+    def to_artifacts(self) -> dict:
+        return {name: getattr(self, name) for name in self.ARTIFACTS}
+
+    @classmethod
+    def from_artifacts(cls, text: str, artifacts: dict) -> 'ProcessedText':
+        processed = cls(text, artifacts['normalized'])
+        for name in cls.ARTIFACTS[1:]:
+            setattr(processed, name, artifacts.get(name))
+        return processed
+
 
 class NLPAnalyzer:
     def __init__(self):
+        import spacy
+        
         try:
             self.nlp = spacy.load(Config.SPACY_MODEL)
         except OSError:
@@ -15,90 +156,161 @@ class NLPAnalyzer:
             subprocess.run(['python', '-m', 'spacy', 'download', Config.SPACY_MODEL])
             self.nlp = spacy.load(Config.SPACY_MODEL)
         
+        # Components whose output we never read only cost time per Doc
+        disabled = [pipe for pipe in Config.SPACY_DISABLED_PIPES if pipe in self.nlp.pipe_names]
+        if disabled:
+            self.nlp.select_pipes(disable=disabled)
+        
         self.technical_skills = [skill.lower() for skill in Config.TECHNICAL_SKILLS]
         self.soft_skills = [skill.lower() for skill in Config.SOFT_SKILLS]
+        self.skill_matcher = SkillMatcher(
+            {'technical': self.technical_skills, 'soft': self.soft_skills},
+            aliases=Config.SKILL_ALIASES
+        )
+        from app.skill_grid import SkillIndex
+        self.skill_index = SkillIndex(self.skill_matcher.skills)
+        # Longer texts are parsed in chunks; see prepare_chunked
+        self.chunk_chars = min(Config.NLP_CHUNK_CHARS, self.nlp.max_length)
+        # Cached JD artifacts include extracted skills, so they are only
+        # valid for the taxonomy they were extracted with
+        from app.models import TaxonomyVersion
+        from app.taxonomy import taxonomy_snapshot
+        self.taxonomy_key = TaxonomyVersion.snapshot_hash(taxonomy_snapshot())
+        self.jd_cache = JDArtifactCache(
+            max_size=Config.JD_CACHE_SIZE,
+            ttl=Config.JD_CACHE_TTL,
+            disk_dir=Config.JD_CACHE_DIR
+        )
+        self.tfidf_model = None
+        self.load_tfidf_model()
+    
+    def load_tfidf_model(self) -> bool:
+        """(Re)load the corpus-fitted TF-IDF model if one has been saved."""
+        from app.tfidf_model import CorpusTfidfModel
+        
+        if not CorpusTfidfModel.exists(Config.TFIDF_MODEL_DIR):
+            return False
+        try:
+            self.tfidf_model = CorpusTfidfModel.load(Config.TFIDF_MODEL_DIR)
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading TF-IDF model: {e}")
+            return False
     
     def preprocess_text(self, text: str) -> str:
         """Clean and preprocess text."""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove special characters but keep important punctuation
-        text = re.sub(r'[^\w\s\.\,\-\+\#]', ' ', text)
-        return text.lower()
+        return normalize_text(text)
     
-    def extract_skills(self, text: str) -> dict:
-        """Extract technical and soft skills from text."""
-        processed_text = self.preprocess_text(text)
-        
-        technical_found = []
-        soft_found = []
+    def prepare(self, text: str) -> ProcessedText:
+        """Normalize text and run the spaCy pipeline over it exactly once."""
+        if len(text) > self.chunk_chars:
+            return self.prepare_chunked(text)
+        # NER and tagging work better on the original casing, so the Doc is
+        # built from the whitespace-normalized text rather than the lowercased one
+        doc = self.nlp(_WHITESPACE_RE.sub(' ', text.strip()))
+        return ProcessedText(text, self.preprocess_text(text), doc)
+    
+    def prepare_chunked(self, text: str) -> ProcessedText:
+        """Prepare a long text without ever holding one Doc for all of it.
         
-        # Check for technical skills
-        for skill in self.technical_skills:
-            if skill in processed_text or skill.replace(' ', '') in processed_text.replace(' ', ''):
-                technical_found.append(skill)
+        Section- or sentence-aligned chunks of at most ``chunk_chars`` stream
+        through nlp.pipe; entities and keyword counts are merged from each Doc
+        as it arrives and the Doc is dropped, so memory follows the chunk size
+        rather than the text length (which may also exceed nlp.max_length).
+        """
+        processed = ProcessedText(text, self.preprocess_text(text))
+        entities = {key: set() for key in ENTITY_KEYS}
+        keyword_counts = Counter()
+        for doc in self.nlp.pipe(iter_chunks(text, self.chunk_chars), batch_size=Config.NLP_CHUNK_BATCH):
+            _add_entities(doc, entities)
+            keyword_counts.update(_keyword_lemmas(doc))
+        processed.entities = {key: list(values) for key, values in entities.items()}
+        processed.keyword_counts = dict(keyword_counts)
+        return processed
+    
+    def prepare_job(self, job_description: str) -> ProcessedText:
+        """Prepare a job description, reusing cached artifacts for repeated JDs."""
+        key = f"{content_hash(job_description)}-{self.taxonomy_key[:16]}"
+        artifacts = self.jd_cache.get(key)
+        if artifacts is not None:
+            return ProcessedText.from_artifacts(job_description, artifacts)
         
-        # Check for soft skills
-        for skill in self.soft_skills:
-            if skill in processed_text:
-                soft_found.append(skill)
+        job = self.prepare(job_description)
+        self.extract_skills(job)
+        self.extract_entities(job)
+        self.extract_keywords(job)
+        self.term_vector(job)
+        self.jd_cache.set(key, job.to_artifacts())
+        return job
+    
+    def _as_processed(self, text: Union[str, ProcessedText]) -> ProcessedText:
+        return text if isinstance(text, ProcessedText) else self.prepare(text)
+    
+    def extract_skills(self, text: Union[str, ProcessedText]) -> dict:
+        """Extract technical and soft skills from text."""
+        if isinstance(text, ProcessedText):
+            if text.skills is None:
+                found = self.skill_matcher.find(text.text)
+                text.skills = {category: sorted(skills) for category, skills in found.items()}
+            return {category: list(skills) for category, skills in text.skills.items()}
+        found = self.skill_matcher.find(text)
         
         return {
-            'technical': list(set(technical_found)),
-            'soft': list(set(soft_found))
+            'technical': list(found['technical']),
+            'soft': list(found['soft'])
         }
     
-    def extract_entities(self, text: str) -> dict:
+    def extract_entities(self, text: Union[str, ProcessedText]) -> dict:
         """Extract named entities from text."""
-        doc = self.nlp(text)
-        entities = {
-            'organizations': [],
-            'education': [],
-            'locations': [],
-            'technologies': []
-        }
-        
-        for ent in doc.ents:
-            if ent.label_ == "ORG":
-                entities['organizations'].append(ent.text)
-            elif ent.label_ in ["GPE", "LOC"]:
-                entities['locations'].append(ent.text)
-            elif ent.label_ in ["PRODUCT", "EVENT"]:
-                entities['technologies'].append(ent.text)
+        processed = self._as_processed(text)
+        if processed.entities is not None:
+            return {key: list(values) for key, values in processed.entities.items()}
         
-        # Remove duplicates
-        for key in entities:
-            entities[key] = list(set(entities[key]))
+        entities = {key: set() for key in ENTITY_KEYS}
+        _add_entities(processed.doc, entities)
+        entities = {key: list(values) for key, values in entities.items()}
         
-        return entities
+        processed.entities = entities
+        return {key: list(values) for key, values in entities.items()}
     
-    def extract_keywords(self, text: str, top_n: int = 20) -> list:
+    def extract_keywords(self, text: Union[str, ProcessedText], top_n: int = 20) -> list:
         """Extract important keywords using TF-IDF."""
-        processed_text = self.preprocess_text(text)
-        doc = self.nlp(processed_text)
-        
-        # Filter meaningful tokens
-        meaningful_tokens = []
-        for token in doc:
-            if (not token.is_stop and 
-                not token.is_punct and 
-                not token.is_space and 
-                len(token.text) > 2 and
-                token.pos_ in ['NOUN', 'ADJ', 'PROPN']):
-                meaningful_tokens.append(token.lemma_)
+        processed = self._as_processed(text)
+        if processed.keyword_counts is None:
+            processed.keyword_counts = dict(Counter(_keyword_lemmas(processed.doc)))
         
         # Count frequency
-        word_freq = Counter(meaningful_tokens)
+        word_freq = Counter(processed.keyword_counts)
         return [word for word, count in word_freq.most_common(top_n)]
     
-    def calculate_similarity(self, resume_text: str, job_description: str) -> float:
-        """Calculate similarity between resume and job description."""
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+    def term_vector(self, text: Union[str, ProcessedText]) -> dict:
+        """Term counts of the normalized text as the TF-IDF vectorizer tokenizes it."""
+        if isinstance(text, ProcessedText):
+            if text.term_vector is None:
+                text.term_vector = dict(Counter(_tfidf_tokenize(text.normalized)))
+            return text.term_vector
+        return text_term_vector(text)
+    
+    def calculate_similarity(self, resume_text: Union[str, ProcessedText],
+                             job_description: Union[str, ProcessedText]) -> float:
+        """Calculate similarity between resume and job description.
+        
+        Uses the corpus-fitted IDF model when one is available; otherwise falls
+        back to fitting a vectorizer on just this pair.
+        """
+        if self.tfidf_model is not None:
+            return self.tfidf_model.similarity(self.term_vector(resume_text),
+                                               self.term_vector(job_description))
+        
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        vectorizer = TfidfVectorizer(analyzer=_expand_terms, max_features=1000)
         
         try:
             tfidf_matrix = vectorizer.fit_transform([
-                self.preprocess_text(resume_text),
-                self.preprocess_text(job_description)
+                self.term_vector(resume_text),
+                self.term_vector(job_description)
             ])
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
             return float(similarity)
@@ -106,12 +318,47 @@ class NLPAnalyzer:
             print(f"Error calculating similarity: {e}")
             return 0.0
     
-    def analyze_resume_job_fit(self, resume_text: str, job_description: str) -> dict:
-        """Comprehensive analysis of resume-job fit."""
+    def analyze_resume_job_fit(self, resume_text: str, job_description: str,
+                               timings: Optional[dict] = None) -> dict:
+        """Comprehensive analysis of resume-job fit.
+        
+        Pass a dict as ``timings`` to receive per-stage durations in milliseconds.
+        """
+        timer = StageTimer(timings, observer=observe_analyzer_stage)
+        
+        # Normalize and parse each text once; every stage below reuses it
+        with timer.stage('prepare'):
+            resume = self.prepare(resume_text)
+            job = self.prepare_job(job_description)
+        
         # Extract skills from both texts
-        resume_skills = self.extract_skills(resume_text)
-        job_skills = self.extract_skills(job_description)
+        with timer.stage('skills'):
+            resume_skills = self.extract_skills(resume)
+            job_skills = self.extract_skills(job)
+        
+        # Overall similarity
+        with timer.stage('similarity'):
+            similarity_score = self.calculate_similarity(resume, job) * 100
+        
+        results = self.score_fit(resume_skills, job_skills, similarity_score)
+        
+        with timer.stage('entities'):
+            results['resume_entities'] = self.extract_entities(resume)
+            results['job_entities'] = self.extract_entities(job)
         
+        with timer.stage('keywords'):
+            results['resume_keywords'] = self.extract_keywords(resume)
+            results['job_keywords'] = self.extract_keywords(job)
+        
+        return results
+    
+    @classmethod
+    def score_fit(cls, resume_skills: dict, job_skills: dict, similarity_score: float) -> dict:
+        """Turn extracted skills and a 0-100 similarity into scores and recommendations.
+        
+        Needs no loaded pipeline, so stored analyses can be rescored with
+        ``NLPAnalyzer.score_fit`` directly (see app.taxonomy).
+        """
         # Calculate skill matches
         tech_matched = set(resume_skills['technical']) & set(job_skills['technical'])
         soft_matched = set(resume_skills['soft']) & set(job_skills['soft'])
@@ -123,14 +370,12 @@ class NLPAnalyzer:
         tech_score = len(tech_matched) / max(len(job_skills['technical']), 1) * 100
         soft_score = len(soft_matched) / max(len(job_skills['soft']), 1) * 100
         
-        # Overall similarity
-        similarity_score = self.calculate_similarity(resume_text, job_description) * 100
-        
         # Weighted overall score
-        overall_score = (tech_score * 0.4 + soft_score * 0.3 + similarity_score * 0.3)
+        overall_score = (tech_score * TECHNICAL_WEIGHT + soft_score * SOFT_SKILLS_WEIGHT
+                         + similarity_score * SIMILARITY_WEIGHT)
         
         # Generate recommendations
-        recommendations = self.generate_recommendations(
+        recommendations = cls.generate_recommendations(
             tech_missing, soft_missing, overall_score
         )
         
@@ -147,12 +392,162 @@ class NLPAnalyzer:
                 'technical': list(tech_missing),
                 'soft': list(soft_missing)
             },
-            'recommendations': recommendations,
-            'resume_entities': self.extract_entities(resume_text),
-            'job_entities': self.extract_entities(job_description)
+            'recommendations': recommendations
         }
     
-    def generate_recommendations(self, tech_missing: set, soft_missing: set, overall_score: float) -> list:
+    def prepare_many(self, texts: Iterable[str], batch_size: int = 32,
+                     n_process: int = 1) -> Iterator[ProcessedText]:
+        """Prepare many texts, streaming them through nlp.pipe in batches.
+        
+        Texts longer than ``chunk_chars`` are prepared with prepare_chunked
+        instead, in order.
+        """
+        texts = list(texts)
+        docs = self.nlp.pipe(
+            (_WHITESPACE_RE.sub(' ', text.strip()) for text in texts if len(text) <= self.chunk_chars),
+            batch_size=batch_size,
+            n_process=n_process
+        )
+        for text in texts:
+            if len(text) > self.chunk_chars:
+                yield self.prepare_chunked(text)
+            else:
+                yield ProcessedText(text, self.preprocess_text(text), next(docs))
+    
+    def batch_similarity(self, resumes: List[ProcessedText], job: ProcessedText,
+                         vectorizer=None) -> List[float]:
+        """Cosine similarity of every resume to one job in a single sparse operation.
+        
+        Without a corpus model the vectorizer is fitted on the job plus the whole
+        batch, so IDF weights reflect the candidate pool rather than one pair.
+        An already fitted ``vectorizer`` (see iter_batch_results) is only applied.
+        """
+        if not resumes:
+            return []
+        if self.tfidf_model is not None:
+            rows = self.tfidf_model.transform([self.term_vector(job)] +
+                                              [self.term_vector(resume) for resume in resumes])
+            return [float(value) for value in (rows[1:] @ rows[0].T).toarray().ravel()]
+        
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+        
+        try:
+            vectors = [self.term_vector(job)] + [self.term_vector(resume) for resume in resumes]
+            if vectorizer is None:
+                vectorizer = TfidfVectorizer(analyzer=_expand_terms, max_features=1000)
+                tfidf_matrix = vectorizer.fit_transform(vectors)
+            else:
+                tfidf_matrix = vectorizer.transform(vectors)
+            similarities = cosine_similarity(tfidf_matrix[1:], tfidf_matrix[0:1]).ravel()
+            return [float(value) for value in similarities]
+        except Exception as e:
+            print(f"Error calculating batch similarity: {e}")
+            return [0.0] * len(resumes)
+    
+    def iter_batch_results(self, resume_texts: List[str], job_description: Union[str, ProcessedText],
+                           batch_size: int = 32, n_process: int = 1,
+                           chunk_size: Optional[int] = None) -> Iterator[Tuple[int, dict]]:
+        """Score many resumes against one job, yielding (index, result) pairs.
+        
+        The job description is prepared once. Resumes are parsed with nlp.pipe
+        and scored ``chunk_size`` at a time (all at once by default), so callers
+        can stream results for early chunks while later ones are still parsing.
+        Scores do not depend on the chunking: without a corpus model the IDF
+        weights are fitted once on the job plus every resume before the first
+        chunk (tokenizing needs no spaCy parse).
+        """
+        job = self._as_processed(job_description)
+        job_skills = self.extract_skills(job)
+        chunk_size = chunk_size or max(len(resume_texts), 1)
+        
+        vectors = None
+        vectorizer = None
+        if self.tfidf_model is None and chunk_size < len(resume_texts):
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            
+            vectors = [text_term_vector(text) for text in resume_texts]
+            try:
+                vectorizer = TfidfVectorizer(analyzer=_expand_terms, max_features=1000)
+                vectorizer.fit([self.term_vector(job)] + vectors)
+            except ValueError as e:
+                print(f"Error fitting batch vectorizer: {e}")
+                vectorizer = None
+        
+        chunk = []
+        start = 0
+        for index, resume in enumerate(self.prepare_many(resume_texts, batch_size, n_process)):
+            if vectors is not None:
+                resume.term_vector = vectors[index]
+            chunk.append(resume)
+            if len(chunk) == chunk_size:
+                yield from self._score_chunk(chunk, start, job, job_skills, vectorizer)
+                start += len(chunk)
+                chunk = []
+        if chunk:
+            yield from self._score_chunk(chunk, start, job, job_skills, vectorizer)
+    
+    def _score_chunk(self, resumes: List[ProcessedText], start: int, job: ProcessedText,
+                     job_skills: dict, vectorizer=None) -> Iterator[Tuple[int, dict]]:
+        similarities = self.batch_similarity(resumes, job, vectorizer)
+        for offset, (resume, similarity) in enumerate(zip(resumes, similarities)):
+            result = self.score_fit(self.extract_skills(resume), job_skills, similarity * 100)
+            result['resume_entities'] = self.extract_entities(resume)
+            result['resume_keywords'] = self.extract_keywords(resume)
+            yield start + offset, result
+    
+    def analyze_batch(self, resume_texts: List[str], job_description: Union[str, ProcessedText],
+                      batch_size: int = 32, n_process: int = 1) -> List[Tuple[int, dict]]:
+        """Score many resumes against one job and return them best first."""
+        results = list(self.iter_batch_results(resume_texts, job_description, batch_size, n_process))
+        results.sort(key=lambda item: item[1]['overall_score'], reverse=True)
+        return results
+    
+    def similarity_grid(self, resumes: List[ProcessedText], jobs: List[ProcessedText]):
+        """(len(resumes), len(jobs)) cosine similarities from one sparse product.
+        
+        With a corpus model every cell equals ``calculate_similarity`` for the
+        pair; without one the vectorizer is fitted on all the texts at once,
+        as ``batch_similarity`` does.
+        """
+        import numpy as np
+        
+        if not resumes or not jobs:
+            return np.zeros((len(resumes), len(jobs)))
+        vectors = [self.term_vector(text) for text in resumes + jobs]
+        if self.tfidf_model is not None:
+            rows = self.tfidf_model.transform(vectors)
+        else:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            
+            try:
+                rows = TfidfVectorizer(analyzer=_expand_terms, max_features=1000).fit_transform(vectors)
+            except ValueError as e:
+                print(f"Error calculating similarity grid: {e}")
+                return np.zeros((len(resumes), len(jobs)))
+        # Rows are L2-normalized, so the dot product is the cosine
+        return (rows[:len(resumes)] @ rows[len(resumes):].T).toarray()
+    
+    def score_grid(self, resume_texts: List[str], job_descriptions: List[str],
+                   batch_size: int = 32, n_process: int = 1):
+        """Score every resume against every job description in one pass.
+        
+        Texts are parsed once each (job descriptions through the JD cache),
+        then skill scores for the whole grid come from bitset matrix products
+        instead of per-pair set operations. Returns a ``ScoreGrid``.
+        """
+        from app.skill_grid import score_grid
+        
+        resumes = list(self.prepare_many(resume_texts, batch_size, n_process))
+        jobs = [self.prepare_job(job_description) for job_description in job_descriptions]
+        similarity = self.similarity_grid(resumes, jobs) * 100
+        return score_grid(self.skill_index,
+                          [self.extract_skills(resume) for resume in resumes],
+                          [self.extract_skills(job) for job in jobs],
+                          similarity)
+    
+    @staticmethod
+    def generate_recommendations(tech_missing: set, soft_missing: set, overall_score: float) -> list:
         """Generate improvement recommendations."""
         recommendations = []
         
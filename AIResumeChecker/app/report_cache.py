@@ -0,0 +1,19 @@
+from app.cache import LRUCache
+from config import Config
+
+# Rendered reports keyed by (analysis id, content version). Kept apart from
+# report_generator so reading the cache does not import reportlab.
+report_cache = LRUCache(max_size=Config.REPORT_CACHE_SIZE, max_bytes=Config.REPORT_CACHE_MAX_BYTES,
+                        sizeof=len)
+
+
+def get_report_pdf(analysis) -> bytes:
+    """PDF bytes for a stored analysis, rendered once per content version."""
+    key = (analysis.id, analysis.content_version())
+    pdf = report_cache.get(key)
+    if pdf is None:
+        from app.report_generator import ReportGenerator
+
+        pdf = ReportGenerator().render_analysis(analysis)
+        report_cache.set(key, pdf)
+    return pdf
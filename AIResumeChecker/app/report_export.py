@@ -0,0 +1,302 @@
+import csv
+import io
+import multiprocessing
+import zipfile
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Tuple
+
+from app.models import ResumeAnalysis
+
+EXPORT_FORMATS = ('zip', 'pdf')
+
+
+def filter_analyses(query, job_title: Optional[str] = None, date_from: Optional[str] = None,
+                    date_to: Optional[str] = None):
+    """Restrict a query over ResumeAnalysis to a job title and creation date range.
+
+    Dates are ISO strings; a bare ``date_to`` date is inclusive of the whole
+    day. Raises ValueError for a malformed date.
+    """
+    if job_title:
+        query = query.filter(ResumeAnalysis.job_title == job_title)
+    if date_from:
+        query = query.filter(ResumeAnalysis.created_at >= datetime.fromisoformat(date_from))
+    if date_to:
+        end = datetime.fromisoformat(date_to)
+        if len(date_to) <= 10:
+            end += timedelta(days=1)
+        query = query.filter(ResumeAnalysis.created_at < end)
+    return query
+
+
+def export_query(job_title: Optional[str] = None, date_from: Optional[str] = None,
+                 date_to: Optional[str] = None, min_score: Optional[float] = None):
+    """Analyses matching the export filter, oldest first."""
+    query = filter_analyses(ResumeAnalysis.query, job_title, date_from, date_to)
+    if min_score is not None:
+        query = query.filter(ResumeAnalysis.overall_score >= min_score)
+    return query.order_by(ResumeAnalysis.created_at, ResumeAnalysis.id)
+
+
+def _summary_rows(query) -> list:
+    return (query.with_entities(ResumeAnalysis.id, ResumeAnalysis.filename, ResumeAnalysis.job_title,
+                                ResumeAnalysis.overall_score, ResumeAnalysis.created_at)
+            .all())
+
+
+def _render_report(analysis_data: dict, filename: str, job_title: str,
+                   created_at: Optional[datetime]) -> bytes:
+    """Runs in a pool worker: render one report to PDF bytes."""
+    from app.report_generator import ReportGenerator
+
+    buffer = io.BytesIO()
+    ReportGenerator().generate_report(analysis_data, filename, job_title, buffer, created_at)
+    return buffer.getvalue()
+
+
+def iter_reports(query, workers: int, start_method: str = 'spawn',
+                 batch_size: int = 100) -> Iterator[Tuple[ResumeAnalysis, bytes]]:
+    """Yield (analysis, pdf) for every row of the query, in query order.
+
+    Reports already in the report cache are reused; the rest are rendered in
+    a process pool. At most ``workers * 2`` renders are in flight, so memory
+    stays flat however many analyses match.
+    """
+    from app.report_cache import report_cache
+
+    # resume_text is deferred and the job description lazy, so neither is loaded
+    rows = query.yield_per(batch_size)
+    window = workers * 2
+    pending = deque()
+    pool = multiprocessing.get_context(start_method).Pool(workers)
+    try:
+        for analysis in rows:
+            pdf = report_cache.get((analysis.id, analysis.content_version()))
+            if pdf is None:
+                pdf = pool.apply_async(_render_report, (
+                    analysis.to_results(), analysis.filename, analysis.job_title, analysis.created_at
+                ))
+            pending.append((analysis, pdf))
+            while len(pending) >= window:
+                yield _finish(*pending.popleft())
+        while pending:
+            yield _finish(*pending.popleft())
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _finish(analysis: ResumeAnalysis, pdf) -> Tuple[ResumeAnalysis, bytes]:
+    return analysis, pdf if isinstance(pdf, bytes) else pdf.get()
+
+
+def report_filename(analysis: ResumeAnalysis) -> str:
+    stem = analysis.filename.rsplit('.', 1)[0].replace('/', '_')
+    return f"{analysis.id:06d}_{stem}.pdf"
+
+
+class _StreamBuffer:
+    """Write-only sink for ZipFile; the caller drains it after every entry.
+
+    It has no seek/tell, so ZipFile writes data descriptors instead of going
+    back to patch headers, which is what lets the archive be streamed.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_zip(query, workers: int, start_method: str = 'spawn') -> Iterator[bytes]:
+    """Stream a ZIP of the reports plus a summary.csv, one entry at a time."""
+    buffer = _StreamBuffer()
+    summary = io.StringIO()
+    writer = csv.writer(summary)
+    writer.writerow(['analysis_id', 'filename', 'job_title', 'overall_score', 'created_at', 'report'])
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for analysis, pdf in iter_reports(query, workers, start_method):
+            name = report_filename(analysis)
+            zf.writestr(name, pdf)
+            writer.writerow([analysis.id, analysis.filename, analysis.job_title, analysis.overall_score,
+                             analysis.created_at.isoformat() if analysis.created_at else '', name])
+            yield buffer.drain()
+        zf.writestr('summary.csv', summary.getvalue())
+    yield buffer.drain()
+
+
+class _MergedPdfWriter:
+    """Concatenates PDFs into one, writing each one's objects as soon as it is added.
+
+    PdfWriter keeps every appended page in memory until write(); here a
+    document's pages, and the fonts, images and content streams they
+    reference, are renumbered and written out right away, so only the
+    document being copied is held. The page tree, bookmarks (one per
+    document), catalog and cross-reference table follow at the end, in
+    ``close``; they only need the new object numbers and offsets.
+    """
+
+    _CATALOG, _PAGES, _OUTLINES = 1, 2, 3
+
+    def __init__(self, output):
+        self._output = output
+        self._position = 0
+        self._offsets = {}
+        self._next_id = 4
+        self._pages = []
+        self._bookmarks = []  # (title, first page object number)
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _write(self, data: bytes):
+        self._output.write(data)
+        self._position += len(data)
+
+    def _allocate(self) -> int:
+        self._next_id += 1
+        return self._next_id - 1
+
+    def _write_object(self, object_id: int, obj):
+        self._offsets[object_id] = self._position
+        body = io.BytesIO()
+        obj.write_to_stream(body, None)
+        self._write(f'{object_id} 0 obj\n'.encode() + body.getvalue() + b'\nendobj\n')
+
+    def _renumber(self, obj, numbers: dict, pending: deque):
+        """A copy of obj whose references point at this file's objects; queues the new targets."""
+        from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            if key not in numbers:
+                numbers[key] = self._allocate()
+                pending.append((numbers[key], obj))
+            return IndirectObject(numbers[key], 0, None)
+        if isinstance(obj, DictionaryObject):
+            stream = isinstance(obj, StreamObject)
+            copy = StreamObject() if stream else DictionaryObject()
+            for name, value in obj.items():
+                # A stream's /Length is written from its data
+                if not (stream and name == '/Length'):
+                    copy[name] = self._renumber(value, numbers, pending)
+            if stream:
+                copy._data = obj._data
+            return copy
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._renumber(value, numbers, pending) for value in obj)
+        return obj
+
+    def add(self, pdf: bytes, title: str):
+        """Append every page of a PDF, with a bookmark to its first page."""
+        from PyPDF2 import PdfReader
+        from PyPDF2.generic import DictionaryObject, IndirectObject, NameObject, NullObject
+
+        reader = PdfReader(io.BytesIO(pdf))
+        # Pages are read with inherited attributes (resources, media box) filled in
+        pages = list(reader.pages)
+        if not pages:
+            return
+        keys = [(page.indirect_reference.idnum, page.indirect_reference.generation) for page in pages]
+        numbers = {key: self._allocate() for key in keys}
+        pending = deque()
+        self._bookmarks.append((title, numbers[keys[0]]))
+        for page, key in zip(pages, keys):
+            object_id = numbers[key]
+            # /Parent is replaced by this file's page tree rather than copied with the old one
+            copy = DictionaryObject()
+            for name, value in page.items():
+                if name != '/Parent':
+                    copy[name] = self._renumber(value, numbers, pending)
+            copy[NameObject('/Parent')] = IndirectObject(self._PAGES, 0, None)
+            self._write_object(object_id, copy)
+            self._pages.append(object_id)
+            while pending:
+                target_id, reference = pending.popleft()
+                target = reference.get_object()
+                self._write_object(target_id, NullObject() if target is None
+                                   else self._renumber(target, numbers, pending))
+
+    def close(self):
+        """Write the page tree, bookmarks, catalog, cross-reference table and trailer."""
+        from PyPDF2.generic import (ArrayObject, DictionaryObject, IndirectObject, NameObject, NumberObject,
+                                    create_string_object)
+
+        def ref(object_id):
+            return IndirectObject(object_id, 0, None)
+
+        self._write_object(self._PAGES, DictionaryObject({
+            NameObject('/Type'): NameObject('/Pages'),
+            NameObject('/Kids'): ArrayObject(ref(object_id) for object_id in self._pages),
+            NameObject('/Count'): NumberObject(len(self._pages))
+        }))
+        items = [self._allocate() for _ in self._bookmarks]
+        for i, (item_id, (title, page_id)) in enumerate(zip(items, self._bookmarks)):
+            item = DictionaryObject({
+                NameObject('/Title'): create_string_object(title),
+                NameObject('/Parent'): ref(self._OUTLINES),
+                NameObject('/Dest'): ArrayObject([ref(page_id), NameObject('/Fit')])
+            })
+            if i > 0:
+                item[NameObject('/Prev')] = ref(items[i - 1])
+            if i + 1 < len(items):
+                item[NameObject('/Next')] = ref(items[i + 1])
+            self._write_object(item_id, item)
+        outlines = DictionaryObject({NameObject('/Type'): NameObject('/Outlines'),
+                                     NameObject('/Count'): NumberObject(len(items))})
+        if items:
+            outlines[NameObject('/First')] = ref(items[0])
+            outlines[NameObject('/Last')] = ref(items[-1])
+        self._write_object(self._OUTLINES, outlines)
+        self._write_object(self._CATALOG, DictionaryObject({
+            NameObject('/Type'): NameObject('/Catalog'),
+            NameObject('/Pages'): ref(self._PAGES),
+            NameObject('/Outlines'): ref(self._OUTLINES),
+            NameObject('/PageMode'): NameObject('/UseOutlines')
+        }))
+
+        xref = self._position
+        entries = [b'xref\n', f'0 {self._next_id}\n'.encode(), b'0000000000 65535 f \n']
+        entries.extend(f'{self._offsets[object_id]:010d} 00000 n \n'.encode()
+                       for object_id in range(1, self._next_id))
+        self._write(b''.join(entries))
+        self._write(f'trailer\n<< /Size {self._next_id} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode())
+
+
+def stream_merged_pdf(query, workers: int, start_method: str = 'spawn',
+                    title: str = 'Resume Analysis Reports') -> Iterator[bytes]:
+    """A summary page followed by every report, bookmarked, as one PDF in chunks.
+
+    A chunk is yielded as soon as each report has been rendered and copied,
+    so memory holds one report at a time and the first bytes go out before
+    the last report is rendered.
+    """
+    from app.report_generator import ReportGenerator
+
+    buffer = _StreamBuffer()
+    merged = _MergedPdfWriter(buffer)
+    summary = io.BytesIO()
+    ReportGenerator().generate_summary(_summary_rows(query), title, summary)
+    merged.add(summary.getvalue(), 'Summary')
+    yield buffer.drain()
+    for analysis, pdf in iter_reports(query, workers, start_method):
+        merged.add(pdf, f"#{analysis.id} {analysis.filename}")
+        yield buffer.drain()
+    merged.close()
+    yield buffer.drain()
+
+
+def export_reports(query, output, export_format: str, workers: int, start_method: str = 'spawn'):
+    """Write an export to a binary file object (used by the CLI)."""
+    chunks = stream_merged_pdf if export_format == 'pdf' else stream_zip
+    for chunk in chunks(query, workers, start_method):
+        output.write(chunk)
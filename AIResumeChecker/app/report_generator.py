@@ -4,37 +4,64 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from datetime import datetime
+from io import BytesIO
+from xml.sax.saxutils import escape
+from typing import BinaryIO, Optional, Union
 import os
 
+def _build_styles():
+    """Build the report stylesheet with the custom paragraph styles."""
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.HexColor('#2563EB')
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        textColor=colors.HexColor('#1F2937')
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='ScoreText',
+        parent=styles['Normal'],
+        fontSize=14,
+        spaceAfter=6
+    ))
+    return styles
+
+# Styles are read-only while rendering, so every report shares one copy
+STYLES = _build_styles()
+
+SCORE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3B82F6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3B82F6')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('ALIGN', (3, 0), (-1, -1), 'CENTER'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F3F4F6')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey)
+])
+
 class ReportGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
-    
-    def setup_custom_styles(self):
-        """Setup custom paragraph styles."""
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#2563EB')
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            textColor=colors.HexColor('#1F2937')
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='ScoreText',
-            parent=self.styles['Normal'],
-            fontSize=14,
-            spaceAfter=6
-        ))
+        self.styles = STYLES
     
     def create_score_table(self, analysis_data: dict) -> Table:
         """Create a table showing analysis scores."""
@@ -47,16 +74,7 @@ class ReportGenerator:
         ]
         
         table = Table(data, colWidths=[2*inch, 1*inch, 1.5*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3B82F6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(SCORE_TABLE_STYLE)
         
         return table
     
@@ -108,8 +126,12 @@ class ReportGenerator:
         
         return elements
     
-    def generate_report(self, analysis_data: dict, filename: str, job_title: str, output_path: str) -> str:
-        """Generate comprehensive PDF report."""
+    def generate_report(self, analysis_data: dict, filename: str, job_title: str,
+                        output_path: Union[str, BinaryIO], analysis_date: Optional[datetime] = None):
+        """Generate comprehensive PDF report.
+        
+        ``output_path`` may be a file path or a writable binary stream.
+        """
         doc = SimpleDocTemplate(output_path, pagesize=letter)
         elements = []
         
@@ -122,7 +144,7 @@ class ReportGenerator:
         info_text = f"""
         <b>Resume:</b> {filename}<br/>
         <b>Job Title:</b> {job_title}<br/>
-        <b>Analysis Date:</b> {datetime.now().strftime('%B %d, %Y')}<br/>
+        <b>Analysis Date:</b> {(analysis_date or datetime.now()).strftime('%B %d, %Y')}<br/>
         """
         elements.append(Paragraph(info_text, self.styles['Normal']))
         elements.append(Spacer(1, 20))
@@ -150,4 +172,46 @@ class ReportGenerator:
         
         # Build PDF
         doc.build(elements)
-        return output_path
\ No newline at end of file
+        return output_path
+    
+    def generate_summary(self, rows: list, title: str, output_path: Union[str, BinaryIO]):
+        """Generate a cover page listing many analyses, best score first.
+        
+        ``rows`` holds (analysis_id, filename, job_title, overall_score, created_at) tuples.
+        """
+        doc = SimpleDocTemplate(output_path, pagesize=letter)
+        elements = [Paragraph(title, self.styles['CustomTitle']),
+                    Paragraph(f"<b>Analyses:</b> {len(rows)}", self.styles['Normal']),
+                    Spacer(1, 20)]
+        
+        data = [['#', 'Resume', 'Job Title', 'Score', 'Rating', 'Date']]
+        for analysis_id, filename, job_title, overall_score, created_at in sorted(
+                rows, key=lambda row: row[3], reverse=True):
+            data.append([
+                str(analysis_id),
+                Paragraph(escape(filename), self.styles['Normal']),
+                Paragraph(escape(job_title), self.styles['Normal']),
+                f"{overall_score}%",
+                self.get_rating(overall_score),
+                created_at.strftime('%Y-%m-%d') if created_at else ''
+            ])
+        
+        table = Table(data, colWidths=[0.5*inch, 2.2*inch, 1.8*inch, 0.7*inch, 0.9*inch, 0.9*inch],
+                      repeatRows=1)
+        table.setStyle(SUMMARY_TABLE_STYLE)
+        elements.append(table)
+        
+        doc.build(elements)
+        return output_path
+    
+    def render_analysis(self, analysis) -> bytes:
+        """Render the report for a stored ResumeAnalysis into memory."""
+        buffer = BytesIO()
+        self.generate_report(
+            analysis.to_results(),
+            analysis.filename,
+            analysis.job_title,
+            buffer,
+            analysis.created_at
+        )
+        return buffer.getvalue()
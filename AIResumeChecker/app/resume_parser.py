@@ -1,35 +1,75 @@
-import PyPDF2
-import docx
+import io
 import re
-from typing import Optional, Tuple
+from itertools import islice
+from typing import BinaryIO, Iterable, Optional, Tuple, Union
+from config import Config
+
+# A path on disk, the raw file bytes, or a readable binary stream
+# (e.g. the upload's request stream)
+ResumeSource = Union[str, bytes, BinaryIO]
 
 class ResumeParser:
     @staticmethod
-    def extract_text_from_pdf(file_path: str) -> Optional[str]:
-        """Extract text from PDF file."""
-        try:
-            with open(file_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-        except Exception as e:
-            print(f"Error extracting PDF text: {e}")
-            return None
+    def _as_stream(source: ResumeSource):
+        """Wrap raw bytes in a stream; paths and file-like objects pass through."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(source)
+        return source
     
     @staticmethod
-    def extract_text_from_docx(file_path: str) -> Optional[str]:
-        """Extract text from DOCX file."""
+    def _join_limited(parts: Iterable[str], max_chars: Optional[int]) -> Tuple[str, bool]:
+        """Join text parts with newlines, stopping at max_chars; also report whether text was cut."""
+        pieces = []
+        size = 0
+        for part in parts:
+            part = part or ''
+            if pieces:
+                size += 1  # the newline before this part
+            if max_chars and size + len(part) > max_chars:
+                remaining = max(max_chars - size, 0)
+                if remaining:
+                    pieces.append(part[:remaining])
+                return "\n".join(pieces), True
+            pieces.append(part)
+            size += len(part)
+        return "\n".join(pieces), False
+    
+    @classmethod
+    def _extract(cls, file_type: str, source: ResumeSource) -> Tuple[Optional[str], dict]:
+        """Text of a PDF or DOCX within PARSER_MAX_PAGES / PARSER_MAX_CHARS, and what was cut.
+        
+        Pages and paragraphs are read one at a time and reading stops at the
+        limits, so an oversized upload costs no more than the limits allow.
+        """
+        details = {}
         try:
-            doc = docx.Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            if file_type == 'pdf':
+                import PyPDF2
+                
+                reader = PyPDF2.PdfReader(cls._as_stream(source))
+                max_pages = Config.PARSER_MAX_PAGES or None
+                details['pages'] = len(reader.pages)
+                details['truncated_pages'] = max_pages is not None and details['pages'] > max_pages
+                parts = (page.extract_text() for page in islice(reader.pages, max_pages))
+            else:
+                import docx
+                
+                parts = (paragraph.text for paragraph in docx.Document(cls._as_stream(source)).paragraphs)
+            text, details['truncated_chars'] = cls._join_limited(parts, Config.PARSER_MAX_CHARS)
+            return text.strip(), details
         except Exception as e:
-            print(f"Error extracting DOCX text: {e}")
-            return None
+            print(f"Error extracting {file_type.upper()} text: {e}")
+            return None, details
+    
+    @classmethod
+    def extract_text_from_pdf(cls, source: ResumeSource) -> Optional[str]:
+        """Extract text from PDF file."""
+        return cls._extract('pdf', source)[0]
+    
+    @classmethod
+    def extract_text_from_docx(cls, source: ResumeSource) -> Optional[str]:
+        """Extract text from DOCX file."""
+        return cls._extract('docx', source)[0]
     
     @staticmethod
     def extract_contact_info(text: str) -> dict:
@@ -54,14 +94,18 @@ class ResumeParser:
         return contact_info
     
     @classmethod
-    def parse_resume(cls, file_path: str, filename: str) -> Tuple[Optional[str], dict]:
-        """Parse resume file and extract text and metadata."""
+    def parse_resume(cls, source: ResumeSource, filename: str) -> Tuple[Optional[str], dict]:
+        """Parse resume file and extract text and metadata.
+        
+        ``source`` may be a path, the file's bytes or a binary stream, so
+        uploads can be parsed without being written to disk first.
+        """
         file_extension = filename.lower().split('.')[-1]
         
         if file_extension == 'pdf':
-            text = cls.extract_text_from_pdf(file_path)
+            text, details = cls._extract('pdf', source)
         elif file_extension in ['docx', 'doc']:
-            text = cls.extract_text_from_docx(file_path)
+            text, details = cls._extract('docx', source)
         else:
             return None, {'error': 'Unsupported file format'}
         
@@ -73,7 +117,11 @@ class ResumeParser:
         metadata = {
             'contact_info': contact_info,
             'file_type': file_extension,
-            'text_length': len(text)
+            'text_length': len(text),
+            # True when PARSER_MAX_PAGES or PARSER_MAX_CHARS cut the text short
+            'truncated': bool(details.get('truncated_pages') or details.get('truncated_chars'))
         }
+        if 'pages' in details:
+            metadata['pages'] = details['pages']
         
         return text, metadata
\ No newline at end of file
@@ -1,12 +1,26 @@
-from flask import Blueprint, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import (Blueprint, render_template, request, jsonify, send_file, flash, redirect, url_for,
+                   current_app, Response, stream_with_context)
 from werkzeug.utils import secure_filename
+import io
 import os
+import json
+import time
+import zipfile
 from datetime import datetime
-from app import db
-from app.models import ResumeAnalysis
+from app import db, analyzer_pool, metrics
+from app.models import ResumeAnalysis, AnalysisJob
+from app.jobs import enqueue_job, QueueFullError
+from app.bulk_ingest import ingest_zip
+from app.dedup import dedup_stats
+from app.near_dup import find_near_duplicates, find_reusable, minhash
 from app.resume_parser import ResumeParser
-from app.nlp_analyzer import NLPAnalyzer
-from app.report_generator import ReportGenerator
+from app.report_cache import get_report_pdf, report_cache
+from app.data_export import parse_columns, stream_analyses
+from app.report_export import EXPORT_FORMATS, export_query, stream_merged_pdf, stream_zip
+from app.search_index import get_candidate_index
+from app.history import HistoryPage, SORTS
+from app.analytics import skill_gaps, score_distribution, summary_refreshed_at
+from app.taxonomy import taxonomy_status
 
 bp = Blueprint('main', __name__)
 
@@ -45,53 +59,74 @@ def analyze_resume():
             flash('Invalid file format. Please upload PDF or DOCX files only.', 'error')
             return redirect(url_for('main.index'))
         
-        # Save uploaded file
         filename = secure_filename(file.filename)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{timestamp}_{filename}"
-        file_path = os.path.join('uploads', filename)
-        file.save(file_path)
         
-        # Parse resume
-        resume_text, metadata = ResumeParser.parse_resume(file_path, filename)
+        # Parse resume straight from the upload stream
+        with metrics.stage('extract_text'):
+            file.stream.seek(0, os.SEEK_END)
+            metrics.observe_document('upload', size_bytes=file.stream.tell())
+            file.stream.seek(0)
+            resume_text, metadata = ResumeParser.parse_resume(file.stream, filename)
         
         if not resume_text:
             flash(f"Error processing file: {metadata.get('error', 'Unknown error')}", 'error')
-            os.remove(file_path)  # Clean up
             return redirect(url_for('main.index'))
+        if metadata.get('truncated'):
+            flash('Only the first part of this resume was analyzed (page or character limit reached).', 'success')
+        
+        # Reuse the stored result when this exact pair was analyzed before
+        force_refresh = request.form.get('force_refresh') == '1'
+        if not force_refresh:
+            with metrics.stage('dedup_lookup'):
+                existing = ResumeAnalysis.find_duplicate(resume_text, job_description, job_title)
+                near = existing is None
+                if near:
+                    existing = find_reusable(resume_text, job_description, job_title)
+            if existing is not None:
+                dedup_stats.record_hit(near=near)
+                if near:
+                    flash(f'A near-identical resume ({existing.filename}) was already analyzed for this job; '
+                          'showing the stored result.', 'success')
+                else:
+                    flash('This resume was already analyzed for this job; showing the stored result.', 'success')
+                with metrics.stage('render'):
+                    return render_template('results.html',
+                                         analysis=existing,
+                                         analysis_data=existing.to_results())
         
         # Analyze with NLP
-        analyzer = NLPAnalyzer()
-        analysis_results = analyzer.analyze_resume_job_fit(resume_text, job_description)
+        metrics.observe_document('resume', chars=len(resume_text))
+        metrics.observe_document('job_description', chars=len(job_description))
+        with metrics.stage('analyze'):
+            started = time.perf_counter()
+            analyzer = analyzer_pool.get()
+            analysis_results = analyzer.analyze_resume_job_fit(
+                resume_text, job_description, timings=metrics.request_timings('analyze.')
+            )
+            dedup_stats.record_miss(time.perf_counter() - started, forced=force_refresh)
         
         # Save to database
-        analysis = ResumeAnalysis(
-            filename=filename,
-            job_title=job_title,
-            job_description=job_description,
-            resume_text=resume_text,
-            overall_score=analysis_results['overall_score'],
-            technical_skills_score=analysis_results['technical_score'],
-            soft_skills_score=analysis_results['soft_skills_score'],
-            keyword_match_score=analysis_results['keyword_match_score']
-        )
-        
-        analysis.set_matched_skills(analysis_results['matched_skills'])
-        analysis.set_missing_skills(analysis_results['missing_skills'])
-        analysis.set_recommendations(analysis_results['recommendations'])
-        analysis.set_extracted_entities(analysis_results['resume_entities'])
-        
-        db.session.add(analysis)
-        db.session.commit()
+        with metrics.stage('db_commit'):
+            analysis = ResumeAnalysis.from_results(
+                filename, job_title, job_description, resume_text, analysis_results
+            )
+            
+            db.session.add(analysis)
+            db.session.commit()
         
-        # Clean up uploaded file
-        os.remove(file_path)
+        if analysis.near_duplicate_of is not None:
+            flash(f'This resume is {analysis.near_duplicate_score:.0%} similar to analysis '
+                  f'#{analysis.near_duplicate_of_id} ({analysis.near_duplicate_of.filename}).', 'success')
         
-        return render_template('results.html', 
-                             analysis=analysis, 
-                             analysis_data=analysis_results)
+        with metrics.stage('render'):
+            return render_template('results.html', 
+                                 analysis=analysis, 
+                                 analysis_data=analysis_results)
     
     except Exception as e:
+        metrics.record_error(e)
         flash(f'An error occurred during analysis: {str(e)}', 'error')
         return redirect(url_for('main.index'))
 
@@ -99,42 +134,50 @@ def analyze_resume():
 def download_report(analysis_id):
     """Generate and download PDF report."""
     try:
-        analysis = ResumeAnalysis.query.get_or_404(analysis_id)
-        
-        # Prepare analysis data
-        analysis_data = {
-            'overall_score': analysis.overall_score,
-            'technical_score': analysis.technical_skills_score,
-            'soft_skills_score': analysis.soft_skills_score,
-            'keyword_match_score': analysis.keyword_match_score,
-            'matched_skills': analysis.get_matched_skills(),
-            'missing_skills': analysis.get_missing_skills(),
-            'recommendations': analysis.get_recommendations()
-        }
+        with metrics.stage('load'):
+            analysis = ResumeAnalysis.query.get_or_404(analysis_id)
         
-        # Generate PDF
-        report_generator = ReportGenerator()
+        # Rendered once per analysis version, then served from memory
+        with metrics.stage('render_pdf'):
+            pdf = get_report_pdf(analysis)
+        metrics.observe_document('report', size_bytes=len(pdf))
         report_filename = f"resume_analysis_report_{analysis_id}.pdf"
-        report_path = os.path.join('uploads', report_filename)
         
-        report_generator.generate_report(
-            analysis_data,
-            analysis.filename,
-            analysis.job_title,
-            report_path
+        return send_file(
+            io.BytesIO(pdf),
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=report_filename,
+            etag=analysis.content_version(),
+            conditional=True,
+            max_age=0
         )
-        
-        return send_file(report_path, as_attachment=True, download_name=report_filename)
     
     except Exception as e:
+        metrics.record_error(e)
         flash(f'Error generating report: {str(e)}', 'error')
         return redirect(url_for('main.index'))
 
 @bp.route('/history')
 def analysis_history():
-    """View analysis history."""
-    analyses = ResumeAnalysis.query.order_by(ResumeAnalysis.created_at.desc()).limit(20).all()
-    return render_template('history.html', analyses=analyses)
+    """View analysis history, filtered and paginated by keyset cursor."""
+    per_page = min(max(request.args.get('per_page', current_app.config['HISTORY_PAGE_SIZE'], type=int), 1),
+                   current_app.config['HISTORY_MAX_PAGE_SIZE'])
+    filters = {
+        'sort': request.args.get('sort', 'newest'),
+        'job_title': request.args.get('job_title', '').strip() or None,
+        'min_score': request.args.get('min_score', type=float),
+        'max_score': request.args.get('max_score', type=float),
+        'per_page': per_page
+    }
+    try:
+        page = HistoryPage(after=request.args.get('after'), before=request.args.get('before'), **filters)
+    except ValueError as e:
+        # Stale or tampered cursor, or unknown sort: start over from the first page
+        flash(f'Invalid history page: {e}', 'error')
+        filters['sort'] = filters['sort'] if filters['sort'] in SORTS else 'newest'
+        page = HistoryPage(**filters)
+    return render_template('history.html', analyses=page.items, page=page, sorts=SORTS)
 
 @bp.route('/api/analyze', methods=['POST'])
 def api_analyze():
@@ -147,10 +190,496 @@ def api_analyze():
         if not resume_text or not job_description:
             return jsonify({'error': 'Resume text and job description are required'}), 400
         
-        analyzer = NLPAnalyzer()
-        results = analyzer.analyze_resume_job_fit(resume_text, job_description)
+        metrics.observe_document('resume', chars=len(resume_text))
+        metrics.observe_document('job_description', chars=len(job_description))
+        with metrics.stage('analyze'):
+            analyzer = analyzer_pool.get()
+            results = analyzer.analyze_resume_job_fit(
+                resume_text, job_description, timings=metrics.request_timings('analyze.')
+            )
+        
+        with metrics.stage('serialize'):
+            return jsonify(results)
+    
+    except Exception as e:
+        metrics.record_error(e)
+        return jsonify({'error': str(e)}), 500
+
+def _ids_and_texts(items, text_key):
+    """Split request items (plain strings or {"id": ..., "text": ...}) into ids and texts."""
+    ids = []
+    texts = []
+    for i, item in enumerate(items):
+        if isinstance(item, dict):
+            ids.append(item.get('id', i))
+            texts.append(item.get('text') or item.get(text_key) or '')
+        else:
+            ids.append(i)
+            texts.append(item or '')
+    return ids, texts
+
+@bp.route('/api/analyze/batch', methods=['POST'])
+def api_analyze_batch():
+    """Score many resumes against one job description, best match first.
+    
+    Body: {"job_description": str, "resumes": [str | {"id": ..., "text": str}],
+    "batch_size": int, "n_process": int, "stream": bool}. With ``stream`` the
+    response is NDJSON: a job line, one line per resume as it completes, then
+    the final ranking.
+    """
+    try:
+        data = request.get_json() or {}
+        job_description = data.get('job_description', '')
+        resumes = data.get('resumes') or []
+        
+        if not job_description or not resumes:
+            return jsonify({'error': 'Job description and at least one resume are required'}), 400
+        
+        max_resumes = current_app.config['BATCH_MAX_RESUMES']
+        if len(resumes) > max_resumes:
+            return jsonify({'error': f'At most {max_resumes} resumes per batch'}), 413
+        
+        ids, texts = _ids_and_texts(resumes, 'resume_text')
+        if not all(texts):
+            return jsonify({'error': 'Every resume needs non-empty text'}), 400
+        
+        batch_size = max(int(data.get('batch_size', current_app.config['NLP_BATCH_SIZE'])), 1)
+        n_process = int(data.get('n_process', current_app.config['NLP_N_PROCESS']))
+        n_process = min(max(n_process, 1), current_app.config['NLP_MAX_PROCESSES'])
+        stream = bool(data.get('stream')) or request.args.get('stream') == '1'
+        
+        analyzer = analyzer_pool.get()
+        job = analyzer.prepare_job(job_description)
+        job_summary = {
+            'skills': analyzer.extract_skills(job),
+            'entities': analyzer.extract_entities(job),
+            'keywords': analyzer.extract_keywords(job)
+        }
+        
+        def ranking_of(scored):
+            ranked = sorted(scored, key=lambda item: item[1], reverse=True)
+            return [{'rank': rank, 'index': index, 'id': ids[index], 'overall_score': score}
+                    for rank, (index, score) in enumerate(ranked, 1)]
+        
+        if stream:
+            def generate():
+                yield json.dumps({'type': 'job', 'count': len(texts), **job_summary}) + '\n'
+                scored = []
+                try:
+                    for index, result in analyzer.iter_batch_results(
+                            texts, job, batch_size, n_process, chunk_size=batch_size):
+                        scored.append((index, result['overall_score']))
+                        yield json.dumps({'type': 'result', 'index': index, 'id': ids[index], **result}) + '\n'
+                except Exception as e:
+                    yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+                    return
+                yield json.dumps({'type': 'ranking', 'ranking': ranking_of(scored)}) + '\n'
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        results = analyzer.analyze_batch(texts, job, batch_size, n_process)
+        return jsonify({
+            'job': job_summary,
+            'count': len(results),
+            'results': [
+                {'rank': rank, 'index': index, 'id': ids[index], **result}
+                for rank, (index, result) in enumerate(results, 1)
+            ]
+        })
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/analyze/grid', methods=['POST'])
+def api_analyze_grid():
+    """Score every resume against every job description at once.
+    
+    Body: {"resumes": [str | {"id": ..., "text": str}], "job_descriptions":
+    [str | {"id": ..., "text": str}], "top_k": int}. Returns the rounded
+    score matrices (one row per resume, one column per job) and, per job,
+    the ``top_k`` best resumes with their matched and missing skills.
+    """
+    try:
+        data = request.get_json() or {}
+        resumes = data.get('resumes') or []
+        jobs = data.get('job_descriptions') or []
+        
+        if not resumes or not jobs:
+            return jsonify({'error': 'At least one resume and one job description are required'}), 400
+        
+        max_resumes = current_app.config['BATCH_MAX_RESUMES']
+        max_jobs = current_app.config['GRID_MAX_JOBS']
+        if len(resumes) > max_resumes or len(jobs) > max_jobs:
+            return jsonify({'error': f'At most {max_resumes} resumes and {max_jobs} job descriptions per grid'}), 413
+        
+        resume_ids, resume_texts = _ids_and_texts(resumes, 'resume_text')
+        job_ids, job_texts = _ids_and_texts(jobs, 'job_description')
+        if not all(resume_texts) or not all(job_texts):
+            return jsonify({'error': 'Every resume and job description needs non-empty text'}), 400
+        top_k = min(max(int(data.get('top_k', 10)), 0), len(resume_texts))
+        
+        with metrics.stage('analyze'):
+            analyzer = analyzer_pool.get()
+            grid = analyzer.score_grid(resume_texts, job_texts, current_app.config['NLP_BATCH_SIZE'])
+        
+        with metrics.stage('serialize'):
+            rankings = []
+            for column, job_id in enumerate(job_ids):
+                rankings.append({
+                    'index': column,
+                    'id': job_id,
+                    'top': [{'rank': rank, 'index': row, 'id': resume_ids[row], **grid.pair(row, column)}
+                            for rank, row in enumerate(grid.top(column, top_k), 1)]
+                })
+            return jsonify({
+                'resumes': resume_ids,
+                'jobs': job_ids,
+                'scores': grid.rounded(),
+                'rankings': rankings
+            })
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        metrics.record_error(e)
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/search/candidates', methods=['POST'])
+def api_search_candidates():
+    """Rank stored resumes against a new job description.
+    
+    Body: {"job_description": str, "k": int}. Uses the in-memory inverted
+    index, built during warmup and caught up with new analyses per search.
+    """
+    try:
+        data = request.get_json() or {}
+        job_description = data.get('job_description', '')
+        if not job_description:
+            return jsonify({'error': 'Job description is required'}), 400
+        k = min(max(int(data.get('k', 10)), 1), current_app.config['SEARCH_MAX_K'])
+        
+        analyzer = analyzer_pool.get()
+        job = analyzer.prepare_job(job_description)
+        job_skills = analyzer.extract_skills(job)
+        index = get_candidate_index()
+        hits = index.search(analyzer.term_vector(job), job_skills['technical'] + job_skills['soft'], k)
+        
+        analyses = {
+            analysis.id: analysis
+            for analysis in ResumeAnalysis.query.filter(ResumeAnalysis.id.in_([doc_id for _, doc_id in hits]))
+        }
+        candidates = []
+        for score, doc_id in hits:
+            analysis = analyses.get(doc_id)
+            if analysis is None:
+                continue
+            candidates.append({
+                'analysis_id': analysis.id,
+                'filename': analysis.filename,
+                'job_title': analysis.job_title,
+                'search_score': score,
+                'overall_score': analysis.overall_score,
+                'created_at': analysis.created_at.isoformat() if analysis.created_at else None
+            })
+        
+        return jsonify({'indexed': len(index), 'candidates': candidates})
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/analyses/<int:analysis_id>/similar')
+def api_similar_analyses(analysis_id):
+    """Stored analyses whose resume is a near-duplicate of this one's.
+    
+    Query parameters: threshold (estimated Jaccard, default NEAR_DUP_THRESHOLD)
+    and limit.
+    """
+    analysis = ResumeAnalysis.query.get_or_404(analysis_id)
+    try:
+        threshold = request.args.get('threshold', type=float)
+        limit = min(max(request.args.get('limit', 10, type=int), 1), current_app.config['SEARCH_MAX_K'])
+        
+        signature = analysis.resume_minhash or minhash(analysis.resume_text)
+        matches = find_near_duplicates(signature, threshold, limit, exclude_id=analysis.id)
+        similar = {
+            row.id: row
+            for row in ResumeAnalysis.query.filter(ResumeAnalysis.id.in_([match_id for _, match_id in matches]))
+        }
+        return jsonify({
+            'analysis_id': analysis.id,
+            'near_duplicate_of': analysis.near_duplicate_of_id,
+            'similar': [{
+                'analysis_id': match_id,
+                'similarity': round(score, 4),
+                'filename': similar[match_id].filename,
+                'job_title': similar[match_id].job_title,
+                'overall_score': similar[match_id].overall_score,
+                'created_at': similar[match_id].created_at.isoformat() if similar[match_id].created_at else None
+            } for score, match_id in matches if match_id in similar]
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/cache/stats')
+def cache_stats():
+    """Hit/miss counters for the in-process caches, for sizing them.
+    
+    jd_cache is omitted until the analyzer has been loaded; reading the
+    counters never loads it.
+    """
+    stats = {
+        'dedup': dedup_stats.stats(),
+        'reports': report_cache.stats()
+    }
+    analyzer = analyzer_pool.loaded
+    if analyzer is not None:
+        stats['jd_cache'] = analyzer.jd_cache.stats()
+    return jsonify(stats)
+
+@bp.route('/jobs', methods=['POST'])
+def create_job():
+    """Queue an analysis and return its job id immediately.
+    
+    Accepts the same multipart form as /analyze, or JSON with resume_text,
+    job_title and job_description. Poll /jobs/<id> for the result.
+    """
+    try:
+        if request.is_json:
+            data = request.get_json() or {}
+            resume_text = (data.get('resume_text') or '').strip()
+            job_title = (data.get('job_title') or '').strip()
+            job_description = (data.get('job_description') or '').strip()
+            filename = data.get('filename') or 'resume.txt'
+            force_refresh = bool(data.get('force_refresh'))
+            file_data = None
+            if not resume_text:
+                return jsonify({'error': 'Resume text is required'}), 400
+        else:
+            file = request.files.get('resume')
+            job_title = request.form.get('job_title', '').strip()
+            job_description = request.form.get('job_description', '').strip()
+            if file is None or file.filename == '':
+                return jsonify({'error': 'No resume file uploaded'}), 400
+            if not allowed_file(file.filename):
+                return jsonify({'error': 'Invalid file format. Please upload PDF or DOCX files only.'}), 400
+            filename = secure_filename(file.filename)
+            force_refresh = request.form.get('force_refresh') == '1'
+            file_data = file.read()
+            resume_text = None
+        
+        if not job_title or not job_description:
+            return jsonify({'error': 'Job title and description are required'}), 400
+        
+        job = enqueue_job(current_app.config, filename, job_title, job_description,
+                          file_data=file_data, resume_text=resume_text, force_refresh=force_refresh)
+        response = jsonify({
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': url_for('main.job_status', job_id=job.id)
+        })
+        response.headers['Location'] = url_for('main.job_status', job_id=job.id)
+        return response, 202
+    
+    except QueueFullError as e:
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Job status, plus the analysis scores once the job is done."""
+    job = db.session.get(AnalysisJob, job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    payload = job.to_dict()
+    if job.status == AnalysisJob.DONE and job.analysis_id:
+        analysis = db.session.get(ResumeAnalysis, job.analysis_id)
+        if analysis is not None:
+            payload['result'] = analysis.to_results()
+            payload['result']['report_url'] = url_for('main.download_report', analysis_id=analysis.id)
+    return jsonify(payload)
+
+@bp.route('/api/ingest/zip', methods=['POST'])
+def api_ingest_zip():
+    """Analyze every PDF/DOCX in an uploaded ZIP against one job description."""
+    try:
+        archive = request.files.get('archive')
+        job_title = request.form.get('job_title', '').strip()
+        job_description = request.form.get('job_description', '').strip()
+        
+        if archive is None or archive.filename == '':
+            return jsonify({'error': 'No archive uploaded'}), 400
+        if not archive.filename.lower().endswith('.zip'):
+            return jsonify({'error': 'Archive must be a .zip file'}), 400
+        if not job_title or not job_description:
+            return jsonify({'error': 'Job title and description are required'}), 400
         
-        return jsonify(results)
+        report = ingest_zip(archive.stream, job_title, job_description,
+                            current_app.config, analyzer_pool.get())
+        return jsonify(report)
     
+    except zipfile.BadZipFile:
+        return jsonify({'error': 'Archive is not a valid ZIP file'}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/reports/export')
+def export_reports():
+    """Download the reports matching a filter as one ZIP or one merged PDF.
+    
+    Query parameters: job_title, date_from, date_to (ISO dates), min_score
+    and format ('zip' or 'pdf').
+    """
+    try:
+        export_format = request.args.get('format', 'zip')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f'format must be one of {", ".join(EXPORT_FORMATS)}'}), 400
+        min_score = request.args.get('min_score', type=float)
+        query = export_query(request.args.get('job_title', '').strip() or None,
+                             request.args.get('date_from'), request.args.get('date_to'), min_score)
+        
+        total = query.count()
+        if total == 0:
+            return jsonify({'error': 'No analyses match the filter'}), 404
+        limit = current_app.config['EXPORT_MAX_REPORTS']
+        if total > limit:
+            return jsonify({'error': f'{total} analyses match; narrow the filter to at most {limit}'}), 400
+        
+        workers = current_app.config['EXPORT_WORKERS']
+        start_method = current_app.config['EXPORT_START_METHOD']
+        stamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        if export_format == 'pdf':
+            body, mimetype = stream_merged_pdf(query, workers, start_method), 'application/pdf'
+        else:
+            body, mimetype = stream_zip(query, workers, start_method), 'application/zip'
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=resume_reports_{stamp}.{export_format}'}
+        )
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid filter: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/analyses/export')
+def export_analyses():
+    """Stream stored analyses as NDJSON or CSV.
+    
+    Query parameters: format ('ndjson' or 'csv'), columns (comma-separated,
+    see app.data_export.EXPORT_COLUMNS), job_title, date_from, date_to (ISO
+    dates), since_id (only rows with a larger id, for incremental exports)
+    and gzip=1 to compress the stream.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        columns = parse_columns(request.args.get('columns'))
+        compress = request.args.get('gzip') == '1'
+        body = stream_analyses(
+            export_format, columns, compress,
+            batch_size=current_app.config['ANALYSIS_EXPORT_BATCH_SIZE'],
+            job_title=request.args.get('job_title', '').strip() or None,
+            date_from=request.args.get('date_from'),
+            date_to=request.args.get('date_to'),
+            since_id=request.args.get('since_id', type=int)
+        )
+        
+        stamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        filename = f'analyses_{stamp}.{export_format}' + ('.gz' if compress else '')
+        if compress:
+            mimetype = 'application/gzip'
+        else:
+            mimetype = 'application/x-ndjson' if export_format == 'ndjson' else 'text/csv'
+        return Response(stream_with_context(body), mimetype=mimetype,
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _analytics_filters():
+    source = request.args.get('source', 'live')
+    if source not in ('live', 'summary'):
+        raise ValueError("source must be 'live' or 'summary'")
+    return {
+        'job_title': request.args.get('job_title', '').strip() or None,
+        'date_from': request.args.get('date_from'),
+        'date_to': request.args.get('date_to'),
+        'use_summary': source == 'summary'
+    }
+
+@bp.route('/api/analytics/skills')
+def analytics_skills():
+    """Most commonly missing (or matched) skills for a job title and date range.
+    
+    Query parameters: job_title, date_from, date_to, status ('missing' or
+    'matched'), category ('technical' or 'soft'), limit, and source ('live'
+    or 'summary' for the monthly tables built by `flask analytics refresh`).
+    """
+    try:
+        filters = _analytics_filters()
+        status = request.args.get('status', 'missing')
+        if status not in ('missing', 'matched'):
+            return jsonify({'error': "status must be 'missing' or 'matched'"}), 400
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+        result = skill_gaps(matched=status == 'matched', category=request.args.get('category'),
+                            limit=limit, **filters)
+        if filters['use_summary']:
+            refreshed_at = summary_refreshed_at()
+            result['refreshed_at'] = refreshed_at.isoformat() if refreshed_at else None
+        return jsonify(result)
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid filter: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/analytics/scores')
+def analytics_scores():
+    """Overall score distribution for a job title and date range."""
+    try:
+        filters = _analytics_filters()
+        result = score_distribution(**filters)
+        if filters['use_summary']:
+            refreshed_at = summary_refreshed_at()
+            result['refreshed_at'] = refreshed_at.isoformat() if refreshed_at else None
+        return jsonify(result)
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid filter: {e}'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/api/taxonomy')
+def taxonomy():
+    """Current skill taxonomy version, analyses scored with older ones and the last rescore run."""
+    try:
+        return jsonify(taxonomy_status())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape endpoint for this process."""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@bp.route('/health/live')
+def health_live():
+    """Liveness probe: the process is up and serving."""
+    return jsonify({'status': 'ok'})
+
+@bp.route('/health/ready')
+def health_ready():
+    """Readiness probe: only report ready once the NLP model is warm."""
+    status = analyzer_pool.status()
+    return jsonify(status), (200 if status['ready'] else 503)
@@ -0,0 +1,21 @@
+"""Database schema upgrades through the Alembic migrations in migrations/."""
+from sqlalchemy import inspect
+
+from app import db
+
+
+def upgrade_database():
+    """Bring the database to the latest migration (`flask db upgrade`).
+
+    A database created with db.create_all() has no alembic_version table.
+    If it already holds every table of the current models it is stamped as
+    up to date; otherwise it predates migrations and is upgraded from the
+    baseline revision, which leaves its resume_analysis table in place.
+    """
+    from flask_migrate import stamp, upgrade
+
+    tables = set(inspect(db.engine).get_table_names())
+    if 'alembic_version' not in tables and tables >= set(db.metadata.tables):
+        stamp()
+    else:
+        upgrade()
@@ -0,0 +1,165 @@
+import heapq
+import math
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+
+
+class CandidateIndex:
+    """In-memory inverted index over stored resumes for JD -> candidate search.
+
+    Each resume contributes term postings (term -> {analysis_id: tf}) and
+    skill postings (skill -> {analysis_id: 1}). Queries are scored with BM25
+    over terms plus a bonus for each JD skill the resume has. Scoring is
+    term-at-a-time with MaxScore pruning: features are visited from the
+    highest score upper bound down, and once the remaining bounds cannot lift
+    an unseen resume past the current k-th best, only resumes already in the
+    running are updated. The final top-k comes from a bounded heap.
+
+    Documents are added in id order and ``last_id`` records the newest, so
+    the index catches up with rows written by any process by reading only
+    the ids above it (see get_candidate_index).
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, skill_weight: float = 5.0):
+        self.k1 = k1
+        self.b = b
+        self.skill_weight = skill_weight
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.max_tf: Dict[str, int] = {}
+        self.skill_postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self.last_id = 0
+        self.built = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: int, term_vector: dict, skills: Iterable[str]):
+        with self._lock:
+            if doc_id in self.doc_lengths:
+                return
+            for term, tf in term_vector.items():
+                self.postings.setdefault(term, {})[doc_id] = tf
+                if tf > self.max_tf.get(term, 0):
+                    self.max_tf[term] = tf
+            for skill in skills:
+                self.skill_postings.setdefault(skill, {})[doc_id] = 1
+            length = sum(term_vector.values())
+            self.doc_lengths[doc_id] = length
+            self.total_length += length
+            self.last_id = max(self.last_id, doc_id)
+
+    def build(self, documents: Iterable[Tuple[int, dict, Iterable[str]]]):
+        for doc_id, term_vector, skills in documents:
+            self.add(doc_id, term_vector, skills)
+        self.built = True
+
+    def _idf(self, df: int) -> float:
+        n = len(self.doc_lengths)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _features(self, term_vector: dict, skills: List[str]) -> list:
+        """Query features as (upper_bound, scorer, postings) tuples."""
+        avgdl = self.total_length / max(len(self.doc_lengths), 1)
+        k1, b = self.k1, self.b
+        doc_lengths = self.doc_lengths
+        features = []
+
+        for term in term_vector:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf(len(postings))
+            max_tf = self.max_tf[term]
+            # BM25 grows with tf and shrinks with length, so the bound uses the
+            # largest tf and a zero-length document
+            upper = idf * max_tf * (k1 + 1) / (max_tf + k1 * (1 - b))
+
+            def score(doc_id, tf, idf=idf):
+                norm = k1 * (1 - b + b * doc_lengths[doc_id] / avgdl)
+                return idf * tf * (k1 + 1) / (tf + norm)
+
+            features.append((upper, score, postings))
+
+        if skills:
+            bonus = self.skill_weight / len(skills)
+            for skill in skills:
+                postings = self.skill_postings.get(skill)
+                if postings:
+                    features.append((bonus, lambda doc_id, _, bonus=bonus: bonus, postings))
+
+        features.sort(key=lambda feature: feature[0], reverse=True)
+        return features
+
+    def search(self, term_vector: dict, skills: List[str], k: int = 10) -> List[Tuple[float, int]]:
+        """Return up to k (score, analysis_id) pairs, best first."""
+        features = self._features(term_vector, skills)
+        if not features or k <= 0:
+            return []
+
+        remaining = [0.0] * (len(features) + 1)
+        for i in range(len(features) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + features[i][0]
+
+        scores: Dict[int, float] = {}
+        threshold = 0.0
+        for i, (_, score, postings) in enumerate(features):
+            if len(scores) >= k and remaining[i] <= threshold:
+                # No unseen resume can reach the top k any more: only finish
+                # scoring the ones still in the running
+                for doc_id in list(scores):
+                    if scores[doc_id] + remaining[i] < threshold:
+                        del scores[doc_id]
+                        continue
+                    tf = postings.get(doc_id)
+                    if tf:
+                        scores[doc_id] += score(doc_id, tf)
+            else:
+                for doc_id, tf in postings.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score(doc_id, tf)
+
+            if len(scores) >= k:
+                threshold = heapq.nlargest(k, scores.values())[-1]
+
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(round(value, 4), doc_id) for doc_id, value in top]
+
+
+candidate_index = CandidateIndex()
+_build_lock = threading.Lock()
+
+
+def analysis_document(analysis_id: int, resume_text: str) -> Tuple[int, dict, List[str]]:
+    """Turn a stored resume into an (id, term vector, skills) index document."""
+    from app import analyzer_pool
+    from app.nlp_analyzer import text_term_vector
+
+    skills = analyzer_pool.get().extract_skills(resume_text)
+    return analysis_id, text_term_vector(resume_text), skills['technical'] + skills['soft']
+
+
+def stored_documents(after_id: int = 0, batch_size: int = 1000):
+    from app import db
+    from app.models import ResumeAnalysis
+
+    rows = (db.session.query(ResumeAnalysis.id, ResumeAnalysis.resume_text)
+            .filter(ResumeAnalysis.id > after_id)
+            .order_by(ResumeAnalysis.id)
+            .yield_per(batch_size))
+    for analysis_id, resume_text in rows:
+        yield analysis_document(analysis_id, resume_text)
+
+
+def get_candidate_index() -> CandidateIndex:
+    """Return the process-wide index, caught up with the ResumeAnalysis table.
+
+    The first call indexes every stored resume (the analyzer warmup does it
+    before the worker reports ready); later calls only index the rows added
+    since, by this or any other process.
+    """
+    with _build_lock:
+        candidate_index.build(stored_documents(candidate_index.last_id))
+    return candidate_index
@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from app.nlp_analyzer import SIMILARITY_WEIGHT, SOFT_SKILLS_WEIGHT, TECHNICAL_WEIGHT
+
+SCORE_CATEGORIES = ('technical', 'soft')
+
+
+class SkillIndex:
+    """Fixed bit positions for every skill in the taxonomy, per category.
+
+    A document's skills become one packed bit row per category (one bit per
+    skill, eight skills per byte), so a pool of thousands of resumes is a
+    small uint8 matrix that can be cached or shipped between processes.
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]]):
+        self.skills = {category: list(dict.fromkeys(skills)) for category, skills in taxonomy.items()}
+        self.positions = {category: {skill: position for position, skill in enumerate(skills)}
+                          for category, skills in self.skills.items()}
+
+    def width(self, category: str) -> int:
+        return len(self.skills[category])
+
+    def pack(self, documents: Sequence[dict], category: str) -> np.ndarray:
+        """(len(documents), ceil(width / 8)) uint8 bitsets of each document's skills."""
+        positions = self.positions[category]
+        bits = np.zeros((len(documents), self.width(category)), dtype=np.uint8)
+        for row, skills in enumerate(documents):
+            for skill in skills.get(category) or []:
+                position = positions.get(skill)
+                if position is None:
+                    raise ValueError(f"Skill '{skill}' is not in the {category} taxonomy")
+                bits[row, position] = 1
+        return np.packbits(bits, axis=1)
+
+    def unpack(self, packed: np.ndarray, category: str) -> np.ndarray:
+        """0/1 float32 matrix ready for matrix products."""
+        return np.unpackbits(packed, axis=1, count=self.width(category)).astype(np.float32)
+
+    def names(self, bits: np.ndarray, category: str) -> List[str]:
+        """Skills set in one unpacked row."""
+        return [self.skills[category][position] for position in np.flatnonzero(bits)]
+
+
+class ScoreGrid:
+    """Scores of M resumes against N jobs, as (M, N) float64 arrays.
+
+    Each array holds exactly what ``NLPAnalyzer.score_fit`` computes for the
+    pair before rounding: matched skill counts come from one matrix product
+    per category, and the divisions and weighted sum run in the same order.
+    """
+
+    def __init__(self, index: SkillIndex, resumes: Dict[str, np.ndarray], jobs: Dict[str, np.ndarray],
+                 similarity: np.ndarray):
+        self.index = index
+        self.resumes = resumes
+        self.jobs = jobs
+        self.scores = {}
+        for category in SCORE_CATEGORIES:
+            resume_bits = index.unpack(resumes[category], category)
+            job_bits = index.unpack(jobs[category], category)
+            # Counts are small integers, exact in float32
+            matched = (resume_bits @ job_bits.T).astype(np.float64)
+            required = np.maximum(job_bits.sum(axis=1, dtype=np.float64), 1)
+            self.scores[category] = matched / required * 100
+        self.similarity = np.asarray(similarity, dtype=np.float64)
+        self.overall = (self.scores['technical'] * TECHNICAL_WEIGHT
+                        + self.scores['soft'] * SOFT_SKILLS_WEIGHT
+                        + self.similarity * SIMILARITY_WEIGHT)
+
+    @property
+    def shape(self) -> tuple:
+        return self.overall.shape
+
+    def top(self, job: int, k: int) -> List[int]:
+        """Indices of the k best resumes for one job, best first (ties keep resume order)."""
+        column = self.overall[:, job]
+        return [int(row) for row in np.argsort(-column, kind='stable')[:k]]
+
+    def pair(self, resume: int, job: int) -> dict:
+        """Scores and matched/missing skills of one cell, shaped like ``score_fit`` results."""
+        matched = {}
+        missing = {}
+        for category in SCORE_CATEGORIES:
+            resume_bits = self.index.unpack(self.resumes[category][resume:resume + 1], category)[0]
+            job_bits = self.index.unpack(self.jobs[category][job:job + 1], category)[0]
+            matched[category] = self.index.names(resume_bits * job_bits, category)
+            missing[category] = self.index.names(job_bits * (1 - resume_bits), category)
+        return {
+            'overall_score': round(float(self.overall[resume, job]), 1),
+            'technical_score': round(float(self.scores['technical'][resume, job]), 1),
+            'soft_skills_score': round(float(self.scores['soft'][resume, job]), 1),
+            'keyword_match_score': round(float(self.similarity[resume, job]), 1),
+            'matched_skills': matched,
+            'missing_skills': missing
+        }
+
+    def rounded(self) -> Dict[str, list]:
+        """Every score matrix as nested lists, rounded like ``score_fit`` rounds."""
+        matrices = {
+            'overall_score': self.overall,
+            'technical_score': self.scores['technical'],
+            'soft_skills_score': self.scores['soft'],
+            'keyword_match_score': self.similarity
+        }
+        # Python's round rather than np.round, which can differ on the last digit
+        return {name: [[round(value, 1) for value in row] for row in matrix.tolist()]
+                for name, matrix in matrices.items()}
+
+
+def score_grid(index: SkillIndex, resume_skills: Sequence[dict], job_skills: Sequence[dict],
+               similarity: np.ndarray) -> ScoreGrid:
+    """Score every resume against every job; ``similarity`` is (M, N) on the 0-100 scale."""
+    similarity = np.asarray(similarity, dtype=np.float64)
+    if similarity.shape != (len(resume_skills), len(job_skills)):
+        raise ValueError(f"Similarity must be {len(resume_skills)}x{len(job_skills)}, "
+                         f"got {'x'.join(map(str, similarity.shape))}")
+    resumes = {category: index.pack(resume_skills, category) for category in SCORE_CATEGORIES}
+    jobs = {category: index.pack(job_skills, category) for category in SCORE_CATEGORIES}
+    return ScoreGrid(index, resumes, jobs, similarity)
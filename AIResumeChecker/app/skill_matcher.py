@@ -0,0 +1,111 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_skill_text(text: str) -> str:
+    """Lowercase and collapse whitespace so patterns and text line up."""
+    return _WHITESPACE_RE.sub(' ', text.strip()).lower()
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over a skill taxonomy.
+
+    The automaton is compiled once from every skill name and alias, then a
+    single left-to-right pass over the text reports each occurrence. Matches
+    must sit on word boundaries, so "go" is not found inside "good" and "ai"
+    is not found inside "maintain".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]],
+                 aliases: Optional[Dict[str, Iterable[str]]] = None):
+        # Node arrays: goto transitions, failure links and the outputs
+        # (pattern length, category, canonical skill) ending at each node.
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[list] = [[]]
+        self.categories = list(taxonomy)
+        # Canonical skills per category, in taxonomy order without repeats
+        self.skills: Dict[str, List[str]] = {category: [] for category in self.categories}
+        self.pattern_count = 0
+
+        aliases = {normalize_skill_text(k): v for k, v in (aliases or {}).items()}
+        seen = set()
+        for category, skills in taxonomy.items():
+            for skill in skills:
+                canonical = normalize_skill_text(skill)
+                if (category, canonical) not in seen:
+                    seen.add((category, canonical))
+                    self.skills[category].append(canonical)
+                for pattern in self._variants(canonical, aliases.get(canonical, ())):
+                    self._add(pattern, category, canonical)
+        self._build_failure_links()
+
+    @staticmethod
+    def _variants(canonical: str, aliases: Iterable[str]) -> Set[str]:
+        variants = {canonical}
+        variants.update(normalize_skill_text(alias) for alias in aliases)
+        # Multi-word skills are often written run together ("powerbi")
+        variants.update(v.replace(' ', '') for v in list(variants) if ' ' in v)
+        return {v for v in variants if v}
+
+    def _add(self, pattern: str, category: str, canonical: str):
+        node = 0
+        for char in pattern:
+            nxt = self._goto[node].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        output = (len(pattern), category, canonical)
+        if output not in self._out[node]:
+            self._out[node].append(output)
+            self.pattern_count += 1
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        """Return the canonical skills found in text, grouped by category."""
+        text = normalize_skill_text(text)
+        found = {category: set() for category in self.categories}
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(text)
+        node = 0
+
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not out[node]:
+                continue
+            # Word boundary after the match
+            if end + 1 < length and _is_word_char(text[end + 1]) and _is_word_char(char):
+                continue
+            for pattern_len, category, canonical in out[node]:
+                start = end - pattern_len + 1
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                found[category].add(canonical)
+
+        return found
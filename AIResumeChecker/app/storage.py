@@ -0,0 +1,138 @@
+"""Compression of stored text, and a storage report.
+
+The job_description table and the binary columns are created by the
+Alembic migrations (`flask db upgrade`), which leave existing values as
+plain UTF-8. `flask storage migrate` then rewrites them compressed, one
+batch of rows at a time. Every batch commits on its own and compressed
+values are skipped, so an interrupted run can simply be started again.
+"""
+import os
+from typing import Dict, Optional
+
+from sqlalchemy import LargeBinary, MetaData, Table, bindparam, func, select
+
+from app import db
+from app.compression import compress_text, decompress_text
+
+COMPRESSED_COLUMNS = {
+    'resume_analysis': ('resume_text', 'matched_skills', 'missing_skills', 'recommendations',
+                        'extracted_entities'),
+    'job_description': ('text',),
+}
+
+
+def _table(name: str) -> Table:
+    """A table as it exists in the database, without the model's column types."""
+    return Table(name, MetaData(), autoload_with=db.engine)
+
+
+def _is_compressed(value) -> bool:
+    return isinstance(value, (bytes, memoryview)) and bytes(value[:1]) == b'\x00'
+
+
+def _stored_text(value) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    return decompress_text(value)
+
+
+def _stored_size(value) -> int:
+    if value is None:
+        return 0
+    return len(value.encode('utf-8')) if isinstance(value, str) else len(value)
+
+
+def _compress_table(table: Table, names, batch_size: int, stats: Dict[str, int]):
+    targets = {name: bindparam(name, type_=LargeBinary) for name in names}
+    update = table.update().where(table.c.id == bindparam('row_id')).values(**targets)
+    last_id = 0
+    while True:
+        rows = db.session.execute(select(table.c.id, *[table.c[name] for name in names])
+                                  .where(table.c.id > last_id)
+                                  .order_by(table.c.id).limit(batch_size)).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            values = row._mapping
+            params = {'row_id': row.id}
+            changed = False
+            for name in names:
+                value = values[name]
+                stored = None if value is None or isinstance(value, str) else bytes(value)
+                params[name] = stored
+                if value is None or _is_compressed(value):
+                    continue
+                # Plain text (SQLite) or plain UTF-8 bytes
+                packed = compress_text(_stored_text(value))
+                if packed != stored:
+                    params[name] = packed
+                    stats['compressed_values'] += _is_compressed(packed)
+                    changed = True
+            if changed:
+                updates.append(params)
+
+        if updates:
+            db.session.execute(update, updates)
+        db.session.commit()
+        stats['rows'] += len(rows)
+
+
+def migrate_storage(batch_size: int = 500) -> Dict[str, int]:
+    """Compress text and JSON values still stored as plain text."""
+    stats = {'rows': 0, 'compressed_values': 0}
+    for name, columns in COMPRESSED_COLUMNS.items():
+        _compress_table(_table(name), columns, batch_size, stats)
+    return stats
+
+
+def storage_report(batch_size: int = 1000) -> dict:
+    """Logical (uncompressed, one JD copy per analysis) vs stored bytes per column.
+
+    Reads every row once with a streaming query, so memory stays flat.
+    """
+    table = _table('resume_analysis')
+    names = COMPRESSED_COLUMNS['resume_analysis']
+    columns = {name: {'logical_bytes': 0, 'stored_bytes': 0} for name in names}
+    analyses = 0
+    result = db.session.execute(select(*[table.c[name] for name in names])
+                                .execution_options(yield_per=batch_size))
+    for row in result:
+        analyses += 1
+        for name, value in zip(names, row):
+            columns[name]['stored_bytes'] += _stored_size(value)
+            text_value = _stored_text(value)
+            columns[name]['logical_bytes'] += len(text_value.encode('utf-8')) if text_value else 0
+
+    shared = {'logical_bytes': 0, 'stored_bytes': 0}
+    job_descriptions = 0
+    references = dict(db.session.execute(
+        select(table.c.job_description_id, func.count())
+        .where(table.c.job_description_id.is_not(None))
+        .group_by(table.c.job_description_id)).all())
+    jobs = _table('job_description')
+    for job_id, value in db.session.execute(select(jobs.c.id, jobs.c.text)
+                                            .execution_options(yield_per=batch_size)):
+        job_descriptions += 1
+        shared['stored_bytes'] += _stored_size(value)
+        # Without the shared table every referencing analysis held a copy
+        shared['logical_bytes'] += len(_stored_text(value).encode('utf-8')) * references.get(job_id, 0)
+    columns['job_descriptions (shared)'] = shared
+
+    logical = sum(column['logical_bytes'] for column in columns.values())
+    stored = sum(column['stored_bytes'] for column in columns.values())
+    report = {
+        'analyses': analyses,
+        'job_descriptions': job_descriptions,
+        'columns': columns,
+        'logical_bytes': logical,
+        'stored_bytes': stored,
+        'saved_bytes': logical - stored,
+        'ratio': round(stored / logical, 4) if logical else None
+    }
+    path = db.engine.url.database
+    if db.engine.dialect.name == 'sqlite' and path and os.path.exists(path):
+        report['database_file_bytes'] = os.path.getsize(path)
+    return report
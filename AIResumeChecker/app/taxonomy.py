@@ -0,0 +1,275 @@
+"""Versioned skill taxonomy and re-scoring of the analyses a change affects.
+
+Every analysis records the TaxonomyVersion (a snapshot of
+Config.TECHNICAL_SKILLS, SOFT_SKILLS and SKILL_ALIASES) it was scored with.
+After the taxonomy is edited, `flask taxonomy rescore` brings stored scores
+up to date without re-running the NLP pipeline:
+
+- the skills that differ between a row's version and the current one
+  (added, removed, moved between categories or with different aliases) are
+  compiled into a small SkillMatcher;
+- a row can only score differently if one of those skills occurs in its
+  resume or job description, so only such rows are rescored, with
+  NLPAnalyzer.score_fit and the stored keyword_match_score as similarity;
+- every other row just has its version updated.
+
+Batches are checked in a process pool and committed together with the
+RescoreRun checkpoint, so an interrupted run resumes where it stopped.
+"""
+import math
+import multiprocessing
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import JobDescription, RescoreRun, ResumeAnalysis, TaxonomyVersion
+from app.skill_matcher import SkillMatcher, normalize_skill_text
+from config import Config
+
+# snapshot hash -> TaxonomyVersion.id for versions known to be committed
+_version_ids: Dict[str, int] = {}
+
+
+def taxonomy_snapshot() -> dict:
+    """The configured taxonomy in a canonical, order-independent form."""
+    return {
+        'skills': {
+            'technical': sorted({normalize_skill_text(skill) for skill in Config.TECHNICAL_SKILLS}),
+            'soft': sorted({normalize_skill_text(skill) for skill in Config.SOFT_SKILLS})
+        },
+        'aliases': {normalize_skill_text(skill): sorted({normalize_skill_text(alias) for alias in aliases})
+                    for skill, aliases in Config.SKILL_ALIASES.items()}
+    }
+
+
+def current_version(session=None) -> TaxonomyVersion:
+    """The stored version of the configured taxonomy, inserted if new (not committed)."""
+    session = session or db.session
+    snapshot = taxonomy_snapshot()
+    key = TaxonomyVersion.snapshot_hash(snapshot)
+    if key in _version_ids:
+        version = session.get(TaxonomyVersion, _version_ids[key])
+        if version is not None:
+            return version
+    version = TaxonomyVersion.get_or_create(snapshot)
+    session.info['taxonomy_version'] = (key, version.id)
+    return version
+
+
+@event.listens_for(Session, 'before_flush')
+def _stamp_new_analyses(session, flush_context, instances):
+    """Record the current taxonomy version on new analyses."""
+    new = [obj for obj in session.new
+           if isinstance(obj, ResumeAnalysis) and obj.taxonomy_version_id is None]
+    if not new:
+        return
+    with session.no_autoflush:
+        version_id = current_version(session).id
+    for obj in new:
+        obj.taxonomy_version_id = version_id
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_version(session):
+    key, version_id = session.info.pop('taxonomy_version', (None, None))
+    if key is not None:
+        _version_ids[key] = version_id
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_version(session):
+    session.info.pop('taxonomy_version', None)
+
+
+def changed_skills(old: dict, new: dict) -> Dict[str, List[str]]:
+    """Skills whose matching differs between two snapshots, with every alias either knows."""
+    def entries(snapshot):
+        aliases = snapshot['aliases']
+        return {(category, skill): aliases.get(skill, [])
+                for category, skills in snapshot['skills'].items() for skill in skills}
+
+    old_entries, new_entries = entries(old), entries(new)
+    changed = {}
+    for key in old_entries.keys() | new_entries.keys():
+        if old_entries.get(key) != new_entries.get(key):
+            skill = key[1]
+            changed.setdefault(skill, set()).update(old['aliases'].get(skill, []),
+                                                    new['aliases'].get(skill, []))
+    return {skill: sorted(aliases) for skill, aliases in sorted(changed.items())}
+
+
+# --- Worker process side -------------------------------------------------
+
+_worker_state = None
+
+
+def _init_worker(target: dict, changes: Dict[int, Dict[str, List[str]]]):
+    """Pool initializer: compile the current taxonomy and one change detector per old version."""
+    global _worker_state
+    matcher = SkillMatcher(target['skills'], aliases=target['aliases'])
+    detectors = {version_id: SkillMatcher({'changed': list(changed)}, aliases=changed) if changed else None
+                 for version_id, changed in changes.items()}
+    _worker_state = (matcher, detectors, {})
+
+
+def _rescore_chunk(rows: List[tuple]) -> List[Tuple[int, Optional[dict]]]:
+    """(analysis id, score_fit results or None when the row is unaffected) for each row."""
+    from app.nlp_analyzer import NLPAnalyzer
+
+    matcher, detectors, jobs = _worker_state
+    results = []
+    for analysis_id, version_id, job_id, resume_text, job_text, similarity in rows:
+        # Versions missing from the table are unknown, so their rows are always rescored
+        detector = detectors.get(version_id, matcher)
+        if detector is None:
+            results.append((analysis_id, None))
+            continue
+
+        job_key = (version_id, job_id)
+        if job_key not in jobs:
+            jobs[job_key] = (detector is matcher or any(detector.find(job_text).values()),
+                             {category: list(skills) for category, skills in matcher.find(job_text).items()})
+        job_affected, job_skills = jobs[job_key]
+        if not job_affected and not any(detector.find(resume_text).values()):
+            results.append((analysis_id, None))
+            continue
+
+        resume_skills = {category: list(skills) for category, skills in matcher.find(resume_text).items()}
+        results.append((analysis_id, NLPAnalyzer.score_fit(resume_skills, job_skills, similarity)))
+    return results
+
+
+# --- Dispatcher side -----------------------------------------------------
+
+def stale_filter(version_id: int):
+    return or_(ResumeAnalysis.taxonomy_version_id.is_(None), ResumeAnalysis.taxonomy_version_id != version_id)
+
+
+def _apply(analysis: ResumeAnalysis, results: dict, version_id: int):
+    analysis.overall_score = results['overall_score']
+    analysis.technical_skills_score = results['technical_score']
+    analysis.soft_skills_score = results['soft_skills_score']
+    analysis.set_matched_skills(results['matched_skills'])
+    analysis.set_missing_skills(results['missing_skills'])
+    analysis.set_recommendations(results['recommendations'])
+    analysis.taxonomy_version_id = version_id
+
+
+def rescore_analyses(workers: int = 1, batch_size: int = 500, start_method: str = 'spawn',
+                     baseline_version_id: Optional[int] = None,
+                     progress: Optional[Callable[[RescoreRun], None]] = None) -> RescoreRun:
+    """Bring every analysis up to the current taxonomy version.
+
+    Analyses stored before versioning existed are assumed to have been
+    scored with ``baseline_version_id``, by default the oldest recorded
+    version. An unfinished run for the current version is resumed from its
+    checkpoint. ``progress`` is called with the run after every batch.
+    """
+    target = current_version()
+    db.session.commit()
+
+    run = (RescoreRun.query.filter_by(taxonomy_version_id=target.id, status=RescoreRun.RUNNING)
+           .order_by(RescoreRun.id.desc()).first())
+    if run is None:
+        run = RescoreRun(taxonomy_version_id=target.id,
+                         max_id=db.session.query(func.max(ResumeAnalysis.id)).scalar() or 0)
+        db.session.add(run)
+        db.session.commit()
+
+    snapshots = {version.id: version.get_skills() for version in TaxonomyVersion.query}
+    baseline = baseline_version_id or min(snapshots)
+    changes = {version_id: changed_skills(snapshot, snapshots[target.id])
+               for version_id, snapshot in snapshots.items() if version_id != target.id}
+    initargs = (snapshots[target.id], changes)
+
+    pool = None
+    if workers > 1:
+        pool = multiprocessing.get_context(start_method).Pool(workers, initializer=_init_worker,
+                                                              initargs=initargs)
+    else:
+        _init_worker(*initargs)
+    try:
+        while True:
+            batch = (db.session.query(ResumeAnalysis.id, ResumeAnalysis.taxonomy_version_id,
+                                      ResumeAnalysis.job_description_id, ResumeAnalysis.resume_text,
+                                      ResumeAnalysis.keyword_match_score)
+                     .filter(ResumeAnalysis.id > run.last_id, ResumeAnalysis.id <= run.max_id,
+                             stale_filter(target.id))
+                     .order_by(ResumeAnalysis.id)
+                     .limit(batch_size)
+                     .all())
+            if not batch:
+                break
+
+            job_ids = {row.job_description_id for row in batch}
+            job_texts = dict(db.session.query(JobDescription.id, JobDescription.text)
+                             .filter(JobDescription.id.in_(job_ids)))
+            rows = [(row.id, row.taxonomy_version_id or baseline, row.job_description_id,
+                     row.resume_text or '', job_texts.get(row.job_description_id) or '',
+                     row.keyword_match_score)
+                    for row in batch]
+            if pool is None:
+                chunks = [_rescore_chunk(rows)]
+            else:
+                size = math.ceil(len(rows) / (workers * 2))
+                chunks = pool.map(_rescore_chunk, [rows[i:i + size] for i in range(0, len(rows), size)])
+            results = {analysis_id: result for chunk in chunks for analysis_id, result in chunk}
+
+            rescored = {analysis_id: result for analysis_id, result in results.items() if result is not None}
+            unchanged = [analysis_id for analysis_id, result in results.items() if result is None]
+            if unchanged:
+                db.session.query(ResumeAnalysis).filter(ResumeAnalysis.id.in_(unchanged)).update(
+                    {ResumeAnalysis.taxonomy_version_id: target.id}, synchronize_session=False)
+            # Through the ORM so app.analytics resyncs the skill links
+            for analysis in ResumeAnalysis.query.filter(ResumeAnalysis.id.in_(rescored)):
+                _apply(analysis, rescored[analysis.id], target.id)
+
+            run.last_id = batch[-1].id
+            run.checked += len(batch)
+            run.rescored += len(rescored)
+            run.updated_at = datetime.utcnow()
+            db.session.commit()
+            if progress is not None:
+                progress(run)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    run.status = RescoreRun.DONE
+    run.finished_at = datetime.utcnow()
+    db.session.commit()
+    return run
+
+
+def taxonomy_status() -> dict:
+    """The current version, stale analyses per older version and the latest rescore run."""
+    target = current_version()
+    db.session.commit()
+    snapshot = target.get_skills()
+    counts = (db.session.query(ResumeAnalysis.taxonomy_version_id, func.count(ResumeAnalysis.id))
+              .filter(stale_filter(target.id))
+              .group_by(ResumeAnalysis.taxonomy_version_id)
+              .all())
+    snapshots = {version.id: version.get_skills() for version in TaxonomyVersion.query}
+    stale = []
+    for version_id, count in counts:
+        # Unversioned analyses are compared against the oldest version, as rescore_analyses does
+        source = snapshots.get(version_id or min(snapshots))
+        stale.append({
+            'taxonomy_version_id': version_id,
+            'analyses': count,
+            'changed_skills': sorted(changed_skills(source, snapshot)) if source is not None else None
+        })
+    run = RescoreRun.query.order_by(RescoreRun.id.desc()).first()
+    return {
+        'taxonomy_version_id': target.id,
+        'content_hash': target.content_hash,
+        'skills': {category: len(skills) for category, skills in snapshot['skills'].items()},
+        'stale_analyses': sum(entry['analyses'] for entry in stale),
+        'stale_by_version': stale,
+        'last_run': run.to_dict() if run is not None else None
+    }
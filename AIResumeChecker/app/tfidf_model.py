@@ -0,0 +1,176 @@
+import json
+import os
+import shutil
+import time
+from typing import Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+
+class CorpusTfidfModel:
+    """Vocabulary and IDF weights fitted on the stored analysis corpus.
+
+    Fitting happens offline (see ``flask tfidf fit``); requests only call
+    ``transform``. Document frequencies are kept alongside the IDF so the
+    model can be updated incrementally as new analyses are stored. Arrays are
+    saved as .npy files and memory-mapped on load, so loading is cheap and
+    forked workers share the pages.
+
+    Every save writes a new generation directory and then atomically
+    replaces the CURRENT_FILE pointer naming it, so a concurrent load sees
+    either the old model or the new one, never a mix of their files.
+    """
+
+    VOCABULARY_FILE = 'vocabulary.json'
+    DF_FILE = 'document_frequency.npy'
+    IDF_FILE = 'idf.npy'
+    META_FILE = 'meta.json'
+    CURRENT_FILE = 'CURRENT'
+    KEEP_GENERATIONS = 2  # the previous one stays for readers that already resolved it
+
+    def __init__(self, terms: Optional[List[str]] = None, document_frequency=None,
+                 n_documents: int = 0, last_row_id: int = 0, job_hashes: Iterable[str] = (),
+                 idf=None):
+        self.terms = list(terms or [])
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.document_frequency = (np.asarray(document_frequency, dtype=np.int64)
+                                   if document_frequency is not None
+                                   else np.zeros(len(self.terms), dtype=np.int64))
+        self.n_documents = n_documents
+        self.last_row_id = last_row_id
+        self.job_hashes = set(job_hashes)
+        self.idf = idf if idf is not None else self._compute_idf()
+
+    def _compute_idf(self) -> np.ndarray:
+        # Smoothed IDF, matching TfidfVectorizer(smooth_idf=True)
+        df = self.document_frequency.astype(np.float64)
+        return np.log((1.0 + self.n_documents) / (1.0 + df)) + 1.0
+
+    def partial_fit(self, term_vectors: Iterable[dict]) -> int:
+        """Add documents (term -> count mappings) to the frequency counts."""
+        added_df = {}
+        added = 0
+        for term_vector in term_vectors:
+            added += 1
+            for term in term_vector:
+                added_df[term] = added_df.get(term, 0) + 1
+
+        new_terms = [term for term in added_df if term not in self.vocabulary]
+        for term in new_terms:
+            self.vocabulary[term] = len(self.terms)
+            self.terms.append(term)
+
+        df = np.zeros(len(self.terms), dtype=np.int64)
+        df[:len(self.document_frequency)] = self.document_frequency
+        for term, count in added_df.items():
+            df[self.vocabulary[term]] += count
+
+        self.document_frequency = df
+        self.n_documents += added
+        self.idf = self._compute_idf()
+        return added
+
+    @classmethod
+    def fit(cls, term_vectors: Iterable[dict]) -> 'CorpusTfidfModel':
+        model = cls()
+        model.partial_fit(term_vectors)
+        return model
+
+    def transform(self, term_vectors: List[dict]) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF rows; terms outside the vocabulary are ignored."""
+        indptr = [0]
+        indices = []
+        counts = []
+        vocabulary = self.vocabulary
+        for term_vector in term_vectors:
+            for term, count in term_vector.items():
+                index = vocabulary.get(term)
+                if index is not None:
+                    indices.append(index)
+                    counts.append(count)
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.int64)
+        data = np.asarray(counts, dtype=np.float64) * self.idf[indices]
+        matrix = sparse.csr_matrix((data, indices, indptr),
+                                   shape=(len(term_vectors), len(self.terms)))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ matrix)
+
+    def similarity(self, first: dict, second: dict) -> float:
+        rows = self.transform([first, second])
+        return float(rows[0].multiply(rows[1]).sum())
+
+    def save(self, directory: str):
+        """Write the model as a new generation and point CURRENT_FILE at it."""
+        os.makedirs(directory, exist_ok=True)
+        generation = f"gen-{time.time_ns()}-{os.getpid()}"
+        path = os.path.join(directory, generation)
+        os.makedirs(path)
+
+        def write(name, writer):
+            with open(os.path.join(path, name), 'wb') as f:
+                writer(f)
+
+        write(self.VOCABULARY_FILE, lambda f: f.write(json.dumps(self.terms).encode('utf-8')))
+        write(self.DF_FILE, lambda f: np.save(f, np.asarray(self.document_frequency)))
+        write(self.IDF_FILE, lambda f: np.save(f, np.asarray(self.idf)))
+        write(self.META_FILE, lambda f: f.write(json.dumps({
+            'n_documents': self.n_documents,
+            'n_terms': len(self.terms),
+            'last_row_id': self.last_row_id,
+            'job_hashes': sorted(self.job_hashes)
+        }).encode('utf-8')))
+
+        current = os.path.join(directory, self.CURRENT_FILE)
+        tmp_path = f"{current}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(generation)
+        os.replace(tmp_path, current)
+        self._prune(directory)
+
+    @classmethod
+    def _prune(cls, directory: str):
+        generations = sorted(name for name in os.listdir(directory) if name.startswith('gen-'))
+        for name in generations[:-cls.KEEP_GENERATIONS]:
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+    @classmethod
+    def _current_path(cls, directory: str) -> Optional[str]:
+        """Directory holding the current generation's files, if any."""
+        try:
+            with open(os.path.join(directory, cls.CURRENT_FILE), 'r', encoding='utf-8') as f:
+                return os.path.join(directory, f.read().strip())
+        except FileNotFoundError:
+            # Models saved before generations existed keep their files at the top
+            return directory if os.path.exists(os.path.join(directory, cls.META_FILE)) else None
+
+    @classmethod
+    def exists(cls, directory: Optional[str]) -> bool:
+        return bool(directory) and cls._current_path(directory) is not None
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'CorpusTfidfModel':
+        mmap_mode = 'r' if mmap else None
+        path = cls._current_path(directory)
+        if path is None:
+            raise FileNotFoundError(f'No TF-IDF model in {directory}')
+        with open(os.path.join(path, cls.META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with open(os.path.join(path, cls.VOCABULARY_FILE), 'r', encoding='utf-8') as f:
+            terms = json.load(f)
+        document_frequency = np.load(os.path.join(path, cls.DF_FILE), mmap_mode=mmap_mode)
+        idf = np.load(os.path.join(path, cls.IDF_FILE), mmap_mode=mmap_mode)
+        if not len(terms) == len(document_frequency) == len(idf) == meta['n_terms']:
+            raise ValueError(f'Inconsistent TF-IDF model in {path}: {len(terms)} terms, '
+                             f'{len(idf)} IDF weights, {meta["n_terms"]} expected')
+        return cls(
+            terms=terms,
+            document_frequency=document_frequency,
+            n_documents=meta['n_documents'],
+            last_row_id=meta.get('last_row_id', 0),
+            job_hashes=meta.get('job_hashes', []),
+            idf=idf
+        )
@@ -0,0 +1,26 @@
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+class StageTimer:
+    """Accumulate wall-clock milliseconds per named stage into a dict.
+
+    ``observer`` is called with (stage, milliseconds) as each stage ends.
+    """
+
+    def __init__(self, timings: Optional[dict] = None,
+                 observer: Optional[Callable[[str, float], None]] = None):
+        self.timings = timings if timings is not None else {}
+        self.observer = observer
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.timings[name] = round(self.timings.get(name, 0.0) + elapsed, 3)
+            if self.observer is not None:
+                self.observer(name, elapsed)
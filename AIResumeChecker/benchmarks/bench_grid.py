@@ -0,0 +1,84 @@
+"""Compare per-pair score_fit calls with the vectorized resume x job grid.
+
+Usage: python benchmarks/bench_grid.py [--resumes 500] [--jobs 20] [--model en_core_web_sm]
+
+Skills are extracted once up front and the same similarity matrix feeds
+both paths, so only scoring is timed. Every cell of the grid is checked
+against score_fit; the script exits with status 1 on any mismatch.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+SCORES = ('overall_score', 'technical_score', 'soft_skills_score', 'keyword_match_score')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resumes', type=int, default=500)
+    parser.add_argument('--jobs', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--model', default=Config.SPACY_MODEL)
+    args = parser.parse_args()
+
+    Config.SPACY_MODEL = args.model
+    Config.TFIDF_MODEL_DIR = os.path.join(tempfile.mkdtemp(prefix='resume-bench-'), 'tfidf')
+    Config.JD_CACHE_DIR = None
+
+    from app.nlp_analyzer import NLPAnalyzer
+    from app.skill_grid import score_grid
+    from corpus import generate_corpus
+
+    analyzer = NLPAnalyzer()
+    samples = generate_corpus(max(args.resumes, args.jobs), seed=args.seed)
+    resume_skills = [analyzer.extract_skills(sample.resume_text) for sample in samples[:args.resumes]]
+    job_skills = [analyzer.extract_skills(sample.job_description) for sample in samples[:args.jobs]]
+    rng = random.Random(args.seed)
+    similarity = np.array([[rng.uniform(0, 100) for _ in job_skills] for _ in resume_skills])
+    cells = len(resume_skills) * len(job_skills)
+
+    started = time.perf_counter()
+    pairs = [[analyzer.score_fit(resume, job, similarity[row, column])
+              for column, job in enumerate(job_skills)]
+             for row, resume in enumerate(resume_skills)]
+    pair_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    grid = score_grid(analyzer.skill_index, resume_skills, job_skills, similarity)
+    grid_ms = (time.perf_counter() - started) * 1000
+    rounded = grid.rounded()
+    rounded_ms = (time.perf_counter() - started) * 1000
+
+    mismatches = 0
+    for row, results in enumerate(pairs):
+        for column, result in enumerate(results):
+            cell = grid.pair(row, column)
+            same = all(rounded[name][row][column] == result[name] == cell[name] for name in SCORES)
+            same = same and all(
+                set(cell[key][category]) == set(result[key][category])
+                for key in ('matched_skills', 'missing_skills') for category in ('technical', 'soft'))
+            mismatches += not same
+
+    print(f"{len(resume_skills)} resumes x {len(job_skills)} jobs = {cells} cells")
+    print(f"{'per-pair score_fit':<24}{pair_ms:>10.1f} ms{cells / pair_ms * 1000:>14.0f} cells/s")
+    print(f"{'grid':<24}{grid_ms:>10.1f} ms{cells / grid_ms * 1000:>14.0f} cells/s"
+          f"{pair_ms / grid_ms:>8.1f}x")
+    print(f"{'grid + rounded lists':<24}{rounded_ms:>10.1f} ms{cells / rounded_ms * 1000:>14.0f} cells/s"
+          f"{pair_ms / rounded_ms:>8.1f}x")
+    if mismatches:
+        print(f"FAIL {mismatches} cells differ from score_fit")
+        sys.exit(1)
+    print("All cells match score_fit")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Per-stage timing of analyze_resume_job_fit against the old call pattern.
+
+Usage: python benchmarks/bench_pipeline.py [--model en_core_web_sm] [--repeat 20]
+
+The "separate calls" column runs every extractor on raw strings, so each one
+re-normalizes and re-parses its input as the analyzer used to. The pipeline
+column is analyze_resume_job_fit, which prepares each text once. The JD
+artifact cache is emptied before every pipeline run, so the comparison does
+not credit it with cache hits.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+RESUME = """
+Jane Doe - Senior Software Engineer, Berlin
+Experience: Acme Corp (2018-2024). Built Python and Django services on AWS,
+introduced Docker and Kubernetes deployments, mentored four engineers and
+led the migration from MySQL to PostgreSQL. Strong communication, teamwork
+and problem solving. Earlier: Globex GmbH, data science with pandas, numpy
+and scikit-learn; dashboards in Tableau. Education: TU Munich, MSc Informatics.
+""" * 6
+
+JOB = """
+We are hiring a Backend Engineer in London to design Python microservices
+with Flask, PostgreSQL and Redis on AWS. Experience with Docker, Kubernetes,
+CI/CD and Git is required. You will collaborate with product teams, show
+leadership and communication, and bring critical thinking to system design.
+""" * 3
+
+
+def separate_calls(analyzer):
+    analyzer.extract_skills(RESUME)
+    analyzer.extract_skills(JOB)
+    analyzer.calculate_similarity(RESUME, JOB)
+    analyzer.extract_entities(RESUME)
+    analyzer.extract_entities(JOB)
+    analyzer.extract_keywords(RESUME)
+    analyzer.extract_keywords(JOB)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=Config.SPACY_MODEL)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    Config.SPACY_MODEL = args.model
+    Config.JD_CACHE_DIR = None  # clearing must not touch a shared on-disk cache
+    from app.nlp_analyzer import NLPAnalyzer
+    analyzer = NLPAnalyzer()
+
+    separate = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        separate_calls(analyzer)
+        separate.append((time.perf_counter() - started) * 1000)
+
+    pipeline = []
+    stages = {}
+    for _ in range(args.repeat):
+        analyzer.jd_cache.clear()
+        timings = {}
+        started = time.perf_counter()
+        analyzer.analyze_resume_job_fit(RESUME, JOB, timings=timings)
+        pipeline.append((time.perf_counter() - started) * 1000)
+        for name, value in timings.items():
+            stages.setdefault(name, []).append(value)
+
+    print(f"separate calls: median {statistics.median(separate):8.2f} ms")
+    print(f"pipeline:       median {statistics.median(pipeline):8.2f} ms")
+    print("pipeline stages (median ms):")
+    for name, values in stages.items():
+        print(f"  {name:<12} {statistics.median(values):8.2f}")
+
+
+if __name__ == '__main__':
+    main()
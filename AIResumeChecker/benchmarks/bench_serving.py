@@ -0,0 +1,231 @@
+"""Throughput and memory of serve.py workers against the dev server.
+
+Usage: python benchmarks/bench_serving.py [--workers 4] [--concurrency 8] [--duration 15] [--model en_core_web_sm]
+
+Each setup is started in its own process group and loaded with
+--concurrency client threads POSTing corpus resumes to /api/analyze for
+--duration seconds (a new connection per request). Memory is read from
+/proc/<pid>/smaps_rollup after the load, so pages workers unshared while
+serving are counted: RSS counts shared pages once per process, PSS splits
+them between the processes sharing them, USS is what a process holds alone.
+
+Setups:
+  dev server      run.py's single process (without the debug reloader)
+  serve.py        one master and --workers forked workers
+  N x dev server  --workers independent dev servers, memory only; what N
+                  processes cost without copy-on-write sharing
+Linux only.
+"""
+import argparse
+import http.client
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config
+
+# argv: model, mode ('dev' or 'serve'), port, workers
+LAUNCHER = f"""
+import sys
+sys.path.insert(0, {ROOT!r})
+model, mode, port, workers = sys.argv[1:5]
+from config import Config
+Config.SPACY_MODEL = model
+if mode == 'dev':
+    from app import create_app
+    create_app().run(host='127.0.0.1', port=int(port), debug=False, use_reloader=False)
+else:
+    import serve
+    sys.argv = ['serve.py', '--host', '127.0.0.1', '--port', port, '--workers', workers, '--max-requests', '0']
+    serve.main()
+"""
+
+
+def start_server(mode: str, port: int, workers: int, model: str, workdir: str) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+               NLP_PRELOAD='sync', JOB_RUNNER_AUTOSTART='')
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    return subprocess.Popen([sys.executable, '-c', LAUNCHER, model, mode, str(port), str(workers)],
+                            cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            start_new_session=True)
+
+
+def stop_server(process: subprocess.Popen):
+    os.killpg(process.pid, signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def wait_ready(port: int, process: subprocess.Popen, timeout: float = 300):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'server on port {port} exited with status {process.returncode}')
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/health/ready')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f'server on port {port} not ready after {timeout:.0f}s')
+
+
+def process_tree(pid: int) -> list:
+    """pid and all its descendants, from the ppid field of /proc/*/stat."""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    fields = f.read().rsplit(')', 1)[1].split()
+                parents.setdefault(int(fields[1]), []).append(int(entry))
+            except OSError:
+                continue
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(parents.get(current, []))
+    return tree
+
+
+def memory_kb(pid: int) -> dict:
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {'rss': values['Rss'], 'pss': values['Pss'],
+            'uss': values['Private_Clean'] + values['Private_Dirty']}
+
+
+def load(port: int, bodies: list, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(offset):
+        i = offset
+        while time.monotonic() < deadline:
+            body = bodies[i % len(bodies)]
+            i += concurrency
+            started = time.perf_counter()
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                connection.request('POST', '/api/analyze', body, {'Content-Type': 'application/json'})
+                response = connection.getresponse()
+                response.read()
+                connection.close()
+                ok = response.status == 200
+            except OSError:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': len(latencies) / wall,
+        'p50_ms': statistics.median(latencies) if latencies else None,
+        'p95_ms': latencies[int(len(latencies) * 0.95)] if latencies else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--port', type=int, default=18500)
+    parser.add_argument('--samples', type=int, default=50)
+    parser.add_argument('--model', default=Config.SPACY_MODEL)
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON.')
+    args = parser.parse_args()
+
+    from corpus import generate_corpus
+
+    bodies = [json.dumps({'resume_text': sample.resume_text, 'job_description': sample.job_description})
+              for sample in generate_corpus(args.samples)]
+    workdir = tempfile.mkdtemp(prefix='resume-bench-')
+    results = []
+
+    for name, mode, workers in (('dev server', 'dev', 1), (f'serve.py x{args.workers}', 'serve', args.workers)):
+        process = start_server(mode, args.port, workers, args.model, workdir)
+        try:
+            wait_ready(args.port, process)
+            # A short warm-up so every worker has served requests before measuring
+            load(args.port, bodies, args.concurrency, 1)
+            result = load(args.port, bodies, args.concurrency, args.duration)
+            pids = process_tree(process.pid)
+            # The launcher is the serve.py master; worker memory excludes it
+            memory = [memory_kb(pid) for pid in pids]
+            serving = memory[1:] if mode == 'serve' else memory
+            result.update(name=name, processes=len(pids),
+                          rss_per_worker_mb=statistics.mean(m['rss'] for m in serving) / 1024,
+                          uss_per_worker_mb=statistics.mean(m['uss'] for m in serving) / 1024,
+                          pss_total_mb=sum(m['pss'] for m in memory) / 1024)
+            results.append(result)
+        finally:
+            stop_server(process)
+
+    # Memory of N unshared copies: N dev servers, no load
+    processes = [start_server('dev', args.port + 1 + i, 1, args.model, workdir) for i in range(args.workers)]
+    try:
+        for i, process in enumerate(processes):
+            wait_ready(args.port + 1 + i, process)
+        memory = [memory_kb(process.pid) for process in processes]
+        results.append({'name': f'{args.workers} x dev server', 'processes': len(processes),
+                        'rss_per_worker_mb': statistics.mean(m['rss'] for m in memory) / 1024,
+                        'uss_per_worker_mb': statistics.mean(m['uss'] for m in memory) / 1024,
+                        'pss_total_mb': sum(m['pss'] for m in memory) / 1024})
+    finally:
+        for process in processes:
+            stop_server(process)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.concurrency} clients x {args.duration:.0f}s, POST /api/analyze, model {args.model}")
+    print(f"{'setup':<18}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}{'procs':>7}"
+          f"{'RSS/worker':>12}{'USS/worker':>12}{'PSS total':>11}")
+    for result in results:
+        if 'rps' in result:
+            load_columns = (f"{result['rps']:>8.1f}{result['p50_ms'] or 0:>9.1f}{result['p95_ms'] or 0:>9.1f}"
+                            f"{result['errors']:>8}")
+        else:
+            load_columns = f"{'-':>8}{'-':>9}{'-':>9}{'-':>8}"
+        print(f"{result['name']:<18}{load_columns}{result['processes']:>7}"
+              f"{result['rss_per_worker_mb']:>9.0f} MB{result['uss_per_worker_mb']:>9.0f} MB"
+              f"{result['pss_total_mb']:>8.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Compare the compiled skill matcher against the old linear scan.
+
+Usage: python benchmarks/bench_skill_matcher.py [--sizes 100 1000 10000 50000]
+
+The linear scan cost grows with the taxonomy size, while the matcher cost
+should stay roughly flat because it makes one pass over the text.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app.skill_matcher import SkillMatcher
+
+
+def synthetic_taxonomy(size: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    skills = [skill.lower() for skill in Config.TECHNICAL_SKILLS]
+    while len(skills) < size:
+        words = rng.randint(1, 3)
+        skills.append(' '.join(
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+            for _ in range(words)
+        ))
+    return skills[:size]
+
+
+def synthetic_resume(words: int = 1500, seed: int = 11) -> str:
+    rng = random.Random(seed)
+    vocab = [skill.lower() for skill in Config.TECHNICAL_SKILLS + Config.SOFT_SKILLS]
+    vocab += ['developed', 'managed', 'team', 'systems', 'production', 'delivered',
+              'improved', 'services', 'platform', 'customers', 'good', 'maintain']
+    return ' '.join(rng.choice(vocab) for _ in range(words))
+
+
+def linear_scan(skills: list, text: str) -> set:
+    """The previous extract_skills implementation, kept for comparison."""
+    processed_text = text.lower()
+    found = set()
+    for skill in skills:
+        if skill in processed_text or skill.replace(' ', '') in processed_text.replace(' ', ''):
+            found.add(skill)
+    return found
+
+
+def time_call(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 50000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = synthetic_resume()
+    print(f"{'skills':>8} {'compile ms':>11} {'linear ms':>10} {'matcher ms':>11}")
+    for size in args.sizes:
+        skills = synthetic_taxonomy(size)
+        started = time.perf_counter()
+        matcher = SkillMatcher({'technical': skills})
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        linear_ms = time_call(lambda: linear_scan(skills, text), args.repeat)
+        matcher_ms = time_call(lambda: matcher.find(text), args.repeat)
+        print(f"{size:>8} {compile_ms:>11.1f} {linear_ms:>10.2f} {matcher_ms:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
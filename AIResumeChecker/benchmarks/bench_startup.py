@@ -0,0 +1,94 @@
+"""Startup budget: time `create_app()` in fresh interpreters.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1500]
+
+Each run is a new process that imports the app and calls create_app() in
+the default configuration (NLP_PRELOAD unset: the analyzer warms up in a
+background thread while create_app returns). One more run with
+NLP_PRELOAD=lazy, the way CLI commands start, checks that none of the
+heavy libraries (spaCy, scikit-learn, reportlab, PyPDF2, python-docx,
+numpy, scipy) is imported on the startup path itself. The script exits
+with status 1 when the median exceeds the budget or a heavy library was
+imported. On failure the slowest imports from `python -X importtime` are
+listed.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('spacy', 'sklearn', 'reportlab', 'PyPDF2', 'docx', 'numpy', 'scipy')
+
+PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - started
+print(json.dumps({{'ms': elapsed * 1000,
+                  'heavy': [name for name in {HEAVY_MODULES!r} if name in sys.modules]}}))
+"""
+
+
+def probe_env(preload: str = None) -> dict:
+    env = dict(os.environ, JOB_RUNNER_AUTOSTART='')
+    env.pop('FLASK_RUN_FROM_CLI', None)
+    env.pop('NLP_PRELOAD', None)
+    if preload:
+        env['NLP_PRELOAD'] = preload
+    return env
+
+
+def run_probe(preload: str = None) -> dict:
+    result = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT, env=probe_env(preload),
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 15) -> list:
+    """(cumulative microseconds, module) of the slowest imports during startup."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'from app import create_app; create_app()'],
+                            cwd=ROOT, env=probe_env('lazy'), capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line.split('|')
+        rows.append((int(cumulative), module.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=1500.0)
+    args = parser.parse_args()
+
+    timings = [run_probe()['ms'] for _ in range(args.runs)]
+    # The default configuration loads spaCy in its warmup thread, so imports are checked lazily
+    heavy = set(run_probe('lazy')['heavy'])
+
+    median = statistics.median(timings)
+    print(f"create_app() startup over {args.runs} runs: median {median:.0f} ms, "
+          f"min {min(timings):.0f} ms, max {max(timings):.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL heavy modules imported at startup: {', '.join(sorted(heavy))}")
+        failed = True
+    if median > args.budget_ms:
+        print("FAIL startup over budget")
+        failed = True
+    if failed:
+        print("Slowest imports (cumulative ms):")
+        for microseconds, module in slowest_imports():
+            print(f"  {microseconds / 1000:8.1f}  {module}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == '__main__':
+    main()
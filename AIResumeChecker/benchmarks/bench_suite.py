@@ -0,0 +1,234 @@
+"""End-to-end benchmark suite over a deterministic synthetic corpus.
+
+Usage:
+    python benchmarks/bench_suite.py [--samples 30] [--seed 1234] [--model en_core_web_sm]
+                                     [--output results.json]
+                                     [--baseline benchmarks/baseline.json] [--threshold 0.25]
+                                     [--save-baseline]
+
+Each stage (parsing, the analyzer extractors, similarity, the DB insert,
+report rendering and the /analyze and /api/analyze requests through the
+Flask test client) is timed once per corpus sample after a short warmup.
+Results hold p50/p90/p95/p99, mean and throughput per stage. With
+--baseline, the p50 and p95 of every stage are compared to the stored run
+and the script exits with status 1 when any grows by more than --threshold
+(a fraction: 0.25 means 25% slower). Baselines are machine-specific; record
+one with --save-baseline on the machine that runs the comparison.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+COMPARED = ('p50_ms', 'p95_ms')
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarize(latencies_ms: list) -> dict:
+    values = sorted(latencies_ms)
+    total_seconds = sum(values) / 1000
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 3) if values else 0.0,
+        'p50_ms': round(percentile(values, 0.50), 3),
+        'p90_ms': round(percentile(values, 0.90), 3),
+        'p95_ms': round(percentile(values, 0.95), 3),
+        'p99_ms': round(percentile(values, 0.99), 3),
+        'max_ms': round(values[-1], 3) if values else 0.0,
+        'throughput_per_s': round(len(values) / total_seconds, 2) if total_seconds else 0.0
+    }
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+
+    def time(self, stage: str, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.latencies.setdefault(stage, []).append((time.perf_counter() - started) * 1000)
+        return result
+
+    def summary(self) -> dict:
+        return {stage: summarize(values) for stage, values in self.latencies.items()}
+
+
+def run_stages(app, samples, files, recorder, warmup: int):
+    from app import analyzer_pool, db
+    from app.models import ResumeAnalysis
+    from app.report_generator import ReportGenerator
+    from app.resume_parser import ResumeParser
+
+    analyzer = analyzer_pool.get()
+    generator = ReportGenerator()
+    client = app.test_client()
+    warm = Recorder()
+
+    for position, (sample, data) in enumerate(zip(samples, files)):
+        # The first few samples run through a throwaway recorder to warm caches
+        rec = warm if position < warmup else recorder
+        resume, job = sample.resume_text, sample.job_description
+
+        text, _ = rec.time(f'parse_{sample.kind}', ResumeParser.parse_resume, data, sample.filename)
+        rec.time('extract_skills', analyzer.extract_skills, text)
+        rec.time('extract_entities', analyzer.extract_entities, text)
+        rec.time('extract_keywords', analyzer.extract_keywords, text)
+        rec.time('calculate_similarity', analyzer.calculate_similarity, text, job)
+        results = rec.time('analyze_resume_job_fit', analyzer.analyze_resume_job_fit, text, job)
+
+        with app.app_context():
+            def insert():
+                analysis = ResumeAnalysis.from_results(sample.filename, sample.job_title, job, resume, results)
+                db.session.add(analysis)
+                db.session.commit()
+                return analysis.id
+            rec.time('db_insert', insert)
+
+        rec.time('generate_report', generator.generate_report, results, sample.filename,
+                 sample.job_title, io.BytesIO())
+
+        response = rec.time('http_analyze', client.post, '/analyze', data={
+            'resume': (io.BytesIO(data), sample.filename),
+            'job_title': sample.job_title,
+            'job_description': job,
+            'force_refresh': '1'
+        }, content_type='multipart/form-data')
+        if response.status_code != 200:
+            raise RuntimeError(f'/analyze returned {response.status_code} for {sample.filename}')
+
+        response = rec.time('http_api_analyze', client.post, '/api/analyze', json={
+            'resume_text': resume,
+            'job_description': job
+        })
+        if response.status_code != 200:
+            raise RuntimeError(f'/api/analyze returned {response.status_code}: {response.get_data(as_text=True)}')
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Regressions as (stage, metric, baseline, current, ratio) tuples."""
+    regressions = []
+    for stage, stats in current['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for metric in COMPARED:
+            before, after = previous[metric], stats[metric]
+            if before > 0 and after > before * (1 + threshold):
+                regressions.append((stage, metric, before, after, after / before))
+    return regressions
+
+
+def print_table(results: dict, baseline: dict = None):
+    print(f"{'stage':<24}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'vs base p50':>13}")
+    for stage, stats in sorted(results['stages'].items()):
+        change = ''
+        previous = (baseline or {}).get('stages', {}).get(stage)
+        if previous and previous['p50_ms'] > 0:
+            change = f"{(stats['p50_ms'] / previous['p50_ms'] - 1) * 100:+.1f}%"
+        print(f"{stage:<24}{stats['count']:>5}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['throughput_per_s']:>10.1f}{change:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3, help='Extra untimed samples run first.')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--model', default=Config.SPACY_MODEL)
+    parser.add_argument('--output', default=None, help='Write results JSON here.')
+    parser.add_argument('--baseline', default=None, help=f'Compare against this file (e.g. {DEFAULT_BASELINE}).')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--save-baseline', action='store_true', help=f'Write results to {DEFAULT_BASELINE}.')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='resume-bench-')
+    Config.SPACY_MODEL = args.model
+    Config.SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    Config.NLP_PRELOAD = 'sync'
+    Config.JOB_RUNNER_AUTOSTART = False
+    # Only the analyzer itself is measured: no corpus model, no disk cache tier
+    Config.TFIDF_MODEL_DIR = os.path.join(workdir, 'tfidf')
+    Config.JD_CACHE_DIR = None
+
+    from app import create_app, db
+    from corpus import generate_corpus, render
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+
+    samples = generate_corpus(args.samples + args.warmup, seed=args.seed)
+    files = [render(sample) for sample in samples]
+
+    recorder = Recorder()
+    started = time.perf_counter()
+    run_stages(app, samples, files, recorder, args.warmup)
+    elapsed = time.perf_counter() - started
+
+    results = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'model': args.model,
+            'samples': args.samples,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'wall_seconds': round(elapsed, 2)
+        },
+        'stages': recorder.summary()
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    for path in filter(None, [args.output, DEFAULT_BASELINE if args.save_baseline else None]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Results written to {path}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for stage, metric, before, after, ratio in regressions:
+            print(f"REGRESSION {stage} {metric}: {before:.2f} -> {after:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Deterministic synthetic resumes and job descriptions for the benchmarks.
+
+Everything is drawn from a seeded random.Random, and skills come from the
+Config skill lists, so the same seed always yields the same corpus (and the
+same skill overlap between resumes and jobs).
+"""
+import io
+import random
+from typing import Iterator, List, NamedTuple
+
+from config import Config
+
+FIRST_NAMES = ['Ava', 'Liam', 'Maya', 'Noah', 'Zara', 'Omar', 'Lena', 'Ravi', 'Sofia', 'Kenji']
+LAST_NAMES = ['Patel', 'Schmidt', 'Okafor', 'Garcia', 'Kim', 'Novak', 'Silva', 'Haddad', 'Larsen', 'Chen']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Stark Industries', 'Wayne Analytics',
+             'Hooli', 'Vandelay Imports', 'Soylent Systems', 'Tyrell Data']
+CITIES = ['London', 'Berlin', 'New York', 'Toronto', 'Bangalore', 'Sydney', 'Paris', 'Austin']
+ROLES = ['Software Engineer', 'Data Engineer', 'Backend Developer', 'Data Scientist',
+         'DevOps Engineer', 'Full Stack Developer', 'Machine Learning Engineer', 'QA Engineer']
+VERBS = ['Built', 'Designed', 'Led', 'Migrated', 'Optimized', 'Automated', 'Maintained', 'Launched']
+OBJECTS = ['a billing platform', 'internal dashboards', 'the data warehouse', 'a recommendation service',
+           'customer-facing APIs', 'the deployment pipeline', 'a search backend', 'reporting tools']
+FILLER = ('Worked closely with stakeholders to gather requirements, wrote design documents, '
+          'reviewed code and improved test coverage across the team. ')
+
+# Resume length classes: (experience entries, bullet points per entry)
+LENGTHS = {'short': (2, 2), 'medium': (4, 4), 'long': (8, 6)}
+
+
+class Sample(NamedTuple):
+    index: int
+    kind: str  # 'pdf' or 'docx'
+    length: str
+    filename: str
+    resume_text: str
+    job_title: str
+    job_description: str
+
+
+def generate_job(rng: random.Random) -> tuple:
+    """Return (job_title, job_description)."""
+    title = rng.choice(ROLES)
+    technical = rng.sample(Config.TECHNICAL_SKILLS, 8)
+    soft = rng.sample(Config.SOFT_SKILLS, 3)
+    description = (
+        f"{rng.choice(COMPANIES)} is hiring a {title} in {rng.choice(CITIES)}. "
+        f"You will work with {', '.join(technical[:5])} and help us adopt {', '.join(technical[5:])}. "
+        f"Requirements: {rng.randint(2, 8)}+ years of experience, a degree in computer science or "
+        f"equivalent, and strong {', '.join(soft)} skills. "
+        + FILLER * rng.randint(1, 3)
+    )
+    return title, description
+
+
+def generate_resume(rng: random.Random, length: str, job_description: str) -> str:
+    entries, bullets = LENGTHS[length]
+    # Reuse about half of the job's skills so scores spread out
+    job_words = set(job_description.lower().replace(',', ' ').split())
+    overlap = [skill for skill in Config.TECHNICAL_SKILLS if skill in job_words]
+    skills = rng.sample(overlap, len(overlap) // 2) + rng.sample(Config.TECHNICAL_SKILLS, 6)
+    soft = rng.sample(Config.SOFT_SKILLS, 3)
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{rng.choice(ROLES)} | {rng.choice(CITIES)} | {name.split()[0].lower()}@example.com",
+        '',
+        'SUMMARY',
+        f"Engineer with {rng.randint(2, 15)} years of experience and strong {', '.join(soft)}.",
+        '',
+        'EXPERIENCE',
+    ]
+    for entry in range(entries):
+        start = 2024 - (entry + 1) * 2
+        lines.append(f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({start}-{start + 2})")
+        for _ in range(bullets):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                         f"{rng.choice(skills)} and {rng.choice(skills)}. {FILLER}")
+        lines.append('')
+    lines += ['SKILLS', ', '.join(sorted(set(skills))), '',
+              'EDUCATION', f"BSc Computer Science, University of {rng.choice(CITIES)}"]
+    return '\n'.join(lines)
+
+
+def resume_pdf(text: str) -> bytes:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+    buffer = io.BytesIO()
+    styles = getSampleStyleSheet()
+    # invariant=1 pins the creation date and document id, so bytes are reproducible
+    doc = SimpleDocTemplate(buffer, pagesize=letter, invariant=1)
+    doc.build([Paragraph(line or '&nbsp;', styles['Normal']) for line in text.split('\n')])
+    return buffer.getvalue()
+
+
+def resume_docx(text: str) -> bytes:
+    from docx import Document
+
+    buffer = io.BytesIO()
+    document = Document()
+    for line in text.split('\n'):
+        document.add_paragraph(line)
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate_corpus(count: int, seed: int = 1234) -> List[Sample]:
+    """``count`` samples alternating PDF/DOCX and cycling through the length classes."""
+    rng = random.Random(seed)
+    lengths = list(LENGTHS)
+    samples = []
+    for index in range(count):
+        kind = 'pdf' if index % 2 == 0 else 'docx'
+        length = lengths[(index // 2) % len(lengths)]
+        job_title, job_description = generate_job(rng)
+        resume_text = generate_resume(rng, length, job_description)
+        samples.append(Sample(index, kind, length, f"resume_{index:04d}_{length}.{kind}",
+                              resume_text, job_title, job_description))
+    return samples
+
+
+def render(sample: Sample) -> bytes:
+    """The sample's resume as PDF or DOCX bytes."""
+    return resume_pdf(sample.resume_text) if sample.kind == 'pdf' else resume_docx(sample.resume_text)
+
+
+def iter_files(samples: List[Sample]) -> Iterator[tuple]:
+    for sample in samples:
+        yield sample, render(sample)
@@ -12,8 +12,105 @@ class Config:
     
     # NLP Model settings
     SPACY_MODEL = 'en_core_web_sm'
+    # Pipeline components the analyzer never reads (entities and keywords
+    # only need the tagger, lemmatizer and NER)
+    SPACY_DISABLED_PIPES = ['parser']
+    # When to load the shared analyzer: 'background' (warm up in a thread
+    # so create_app returns at once; /health/ready reports progress),
+    # 'sync' (inside create_app) or 'lazy' (on first request)
+    NLP_PRELOAD = os.environ.get('NLP_PRELOAD') or 'background'
+    # The same for `flask <command>` other than `flask run`
+    NLP_PRELOAD_CLI = os.environ.get('NLP_PRELOAD_CLI') or 'lazy'
+    # Texts longer than NLP_CHUNK_CHARS are parsed as section- or
+    # sentence-aligned chunks through nlp.pipe, NLP_CHUNK_BATCH at a time,
+    # with entities and keyword counts merged as they arrive
+    NLP_CHUNK_CHARS = 20000
+    NLP_CHUNK_BATCH = 4
+    # Uploaded files: only the first PARSER_MAX_PAGES PDF pages and
+    # PARSER_MAX_CHARS characters of text are extracted (0: no limit)
+    PARSER_MAX_PAGES = int(os.environ.get('PARSER_MAX_PAGES') or 20)
+    PARSER_MAX_CHARS = int(os.environ.get('PARSER_MAX_CHARS') or 100000)
+    # Pre-forked server (python serve.py): the master loads the analyzer once
+    # and forks SERVE_WORKERS processes that share it copy-on-write
+    SERVE_HOST = os.environ.get('SERVE_HOST') or '0.0.0.0'
+    SERVE_PORT = int(os.environ.get('SERVE_PORT') or 8000)
+    SERVE_WORKERS = int(os.environ.get('SERVE_WORKERS') or os.cpu_count() or 2)
+    SERVE_BACKLOG = 128
+    SERVE_MAX_REQUESTS = 1000  # recycle a worker after this many requests (0: never)
+    SERVE_MAX_REQUESTS_JITTER = 100  # spread recycling so workers do not restart together
+    SERVE_GRACEFUL_TIMEOUT = 30  # seconds a stopping worker gets to finish its request
+    # Batch scoring (/api/analyze/batch)
+    BATCH_MAX_RESUMES = 500
+    NLP_BATCH_SIZE = 32
+    NLP_N_PROCESS = 1
+    NLP_MAX_PROCESSES = 4
+    # Resume x job scoring grids (/api/analyze/grid); resumes are capped by BATCH_MAX_RESUMES
+    GRID_MAX_JOBS = 50
+    # Job-description artifact cache; set JD_CACHE_DIR to add an on-disk tier
+    JD_CACHE_SIZE = 1024
+    JD_CACHE_TTL = 24 * 3600  # seconds
+    JD_CACHE_DIR = os.environ.get('JD_CACHE_DIR') or None
+    # Log a stage breakdown for requests slower than this many ms (unset: off)
+    SLOW_REQUEST_MS = float(os.environ['SLOW_REQUEST_MS']) if os.environ.get('SLOW_REQUEST_MS') else None
+    # Resume text, JSON results and job descriptions are stored compressed:
+    # 'zlib' or 'zstd'. zstd needs the optional zstandard package on every
+    # host that reads the database. Values shorter than
+    # TEXT_COMPRESSION_MIN_BYTES are stored as plain UTF-8.
+    TEXT_COMPRESSION = os.environ.get('TEXT_COMPRESSION') or 'zlib'
+    TEXT_COMPRESSION_LEVEL = 6
+    TEXT_COMPRESSION_MIN_BYTES = 128
+    # /history pagination
+    HISTORY_PAGE_SIZE = 20
+    HISTORY_MAX_PAGE_SIZE = 100
+    # Near-duplicate resumes (MinHash/LSH): flag the closest earlier analysis at
+    # or above NEAR_DUP_THRESHOLD (estimated Jaccard of 5-word shingles). With
+    # NEAR_DUP_REUSE, a near-identical resume for the same job reuses its result.
+    NEAR_DUP_THRESHOLD = 0.8
+    NEAR_DUP_MAX_CANDIDATES = 100
+    NEAR_DUP_REUSE = os.environ.get('NEAR_DUP_REUSE', '').lower() in ('1', 'true', 'yes')
+    NEAR_DUP_REUSE_THRESHOLD = 0.95
+    # Rendered PDF reports kept in memory, bounded by count and total size
+    REPORT_CACHE_SIZE = 256
+    REPORT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    # Corpus-fitted TF-IDF model written by `flask tfidf fit`
+    TFIDF_MODEL_DIR = os.environ.get('TFIDF_MODEL_DIR') or 'models/tfidf'
+    # Candidate search (/api/search/candidates)
+    SEARCH_MAX_K = 100
+    # Asynchronous analysis jobs (/jobs); run workers with `flask jobs worker`
+    # or set JOB_RUNNER_AUTOSTART to dispatch from the web process
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS') or 2)
+    JOB_TIMEOUT = 120  # seconds per attempt
+    JOB_MAX_ATTEMPTS = 3
+    JOB_QUEUE_MAX = 1000
+    JOB_POLL_INTERVAL = 0.5  # seconds
+    JOB_MAX_TASKS_PER_WORKER = 200
+    JOB_START_METHOD = os.environ.get('JOB_START_METHOD') or 'spawn'
+    JOB_RUNNER_AUTOSTART = os.environ.get('JOB_RUNNER_AUTOSTART', '').lower() in ('1', 'true', 'yes')
+    # Bulk ZIP ingestion (/api/ingest/zip, `flask ingest zip`)
+    BULK_WORKERS = int(os.environ.get('BULK_WORKERS') or 4)
+    BULK_FILE_TIMEOUT = 30  # seconds per file
+    BULK_MEMORY_LIMIT_MB = 1024  # address-space cap per extraction process
+    BULK_MAX_FILE_BYTES = 16 * 1024 * 1024
+    BULK_MAX_ENTRIES = 2000
+    BULK_COMMIT_BATCH = 50
+    BULK_START_METHOD = os.environ.get('BULK_START_METHOD') or 'spawn'
+    # Rescoring after taxonomy changes (`flask taxonomy rescore`)
+    RESCORE_WORKERS = int(os.environ.get('RESCORE_WORKERS') or 2)
+    RESCORE_BATCH_SIZE = 500
+    RESCORE_START_METHOD = os.environ.get('RESCORE_START_METHOD') or 'spawn'
+    # Rows fetched per round trip by the NDJSON/CSV export (/api/analyses/export, `flask analyses export`)
+    ANALYSIS_EXPORT_BATCH_SIZE = 1000
+    # Bulk report export (/api/reports/export, `flask reports export`)
+    EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS') or 4)
+    EXPORT_MAX_REPORTS = 1000
+    EXPORT_START_METHOD = os.environ.get('EXPORT_START_METHOD') or 'spawn'
+    NLP_WARMUP_TEXT = (
+        'Senior Python developer with Flask, SQL and AWS experience. '
+        'Strong communication and leadership skills at Acme Corp in London.'
+    )
     
-    # Skills database (can be expanded)
+    # Skills database (can be expanded). Stored analyses record the version
+    # they were scored with; run `flask taxonomy rescore` after editing
     TECHNICAL_SKILLS = [
         'python', 'javascript', 'java', 'c++', 'c#', 'react', 'angular', 'vue',
         'node.js', 'express', 'django', 'flask', 'spring', 'laravel', 'ruby',
@@ -31,4 +128,26 @@ class Config:
         'critical thinking', 'creativity', 'adaptability', 'time management',
         'project management', 'analytical thinking', 'collaboration',
         'presentation', 'negotiation', 'mentoring', 'coaching'
-    ]
\ No newline at end of file
+    ]
+    
+    # Alternative spellings that should count as the canonical skill
+    SKILL_ALIASES = {
+        'javascript': ['js', 'ecmascript'],
+        'typescript': ['ts'],
+        'node.js': ['nodejs'],
+        'postgresql': ['postgres'],
+        'kubernetes': ['k8s'],
+        'machine learning': ['ml'],
+        'ai': ['artificial intelligence'],
+        'gcp': ['google cloud'],
+        'aws': ['amazon web services'],
+        'ci/cd': ['ci cd', 'continuous integration'],
+        'scikit-learn': ['sklearn', 'scikit learn'],
+        'go': ['golang'],
+        'c#': ['csharp'],
+        'c++': ['cpp'],
+        'problem solving': ['problem-solving'],
+        'critical thinking': ['critical-thinking'],
+        'time management': ['time-management'],
+        'teamwork': ['team work', 'team player']
+    }
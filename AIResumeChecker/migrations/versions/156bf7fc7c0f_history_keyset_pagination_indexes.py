@@ -0,0 +1,32 @@
+"""history keyset pagination indexes
+
+Revision ID: 156bf7fc7c0f
+Revises: cc0399a850cc
+Create Date: 2026-10-18 10:42:33.303260
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '156bf7fc7c0f'
+down_revision = 'cc0399a850cc'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.create_index('ix_resume_analysis_created', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_resume_analysis_score', ['overall_score', 'id'], unique=False)
+        batch_op.create_index('ix_resume_analysis_title_created', ['job_title', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_resume_analysis_title_score', ['job_title', 'overall_score', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.drop_index('ix_resume_analysis_title_score')
+        batch_op.drop_index('ix_resume_analysis_title_created')
+        batch_op.drop_index('ix_resume_analysis_score')
+        batch_op.drop_index('ix_resume_analysis_created')
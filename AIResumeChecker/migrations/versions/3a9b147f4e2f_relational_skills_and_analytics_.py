@@ -0,0 +1,69 @@
+"""relational skills and analytics summaries
+
+Links for existing analyses are created afterwards with `flask analytics
+backfill`, and the summaries with `flask analytics refresh`.
+
+Revision ID: 3a9b147f4e2f
+Revises: 156bf7fc7c0f
+Create Date: 2026-10-18 10:43:57.743400
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a9b147f4e2f'
+down_revision = '156bf7fc7c0f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('skill',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category', sa.String(length=16), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name', 'category', name='uq_skill_name_category')
+    )
+    op.create_table('analysis_skill',
+    sa.Column('analysis_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('matched', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['analysis_id'], ['resume_analysis.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('analysis_id', 'skill_id')
+    )
+    with op.batch_alter_table('analysis_skill', schema=None) as batch_op:
+        batch_op.create_index('ix_analysis_skill_gap', ['skill_id', 'matched', 'analysis_id'], unique=False)
+
+    op.create_table('score_summary',
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('job_title', sa.String(length=255), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('analyses', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Float(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('period', 'job_title', 'bucket')
+    )
+    op.create_table('skill_gap_summary',
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('job_title', sa.String(length=255), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('matched', sa.Boolean(), nullable=False),
+    sa.Column('analyses', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['skill_id'], ['skill.id'], ),
+    sa.PrimaryKeyConstraint('period', 'job_title', 'skill_id', 'matched')
+    )
+
+
+def downgrade():
+    op.drop_table('skill_gap_summary')
+    op.drop_table('score_summary')
+    with op.batch_alter_table('analysis_skill', schema=None) as batch_op:
+        batch_op.drop_index('ix_analysis_skill_gap')
+
+    op.drop_table('analysis_skill')
+    op.drop_table('skill')
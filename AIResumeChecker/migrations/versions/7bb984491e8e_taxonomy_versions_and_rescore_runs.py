@@ -0,0 +1,60 @@
+"""taxonomy versions and rescore runs
+
+Existing analyses get no version; `flask taxonomy rescore` treats them as
+scored with the oldest recorded taxonomy and brings them up to date.
+
+Revision ID: 7bb984491e8e
+Revises: 9c1ac76f0447
+Create Date: 2026-10-18 10:48:04.626776
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7bb984491e8e'
+down_revision = '9c1ac76f0447'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('taxonomy_version',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('skills', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash')
+    )
+    op.create_table('rescore_run',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('taxonomy_version_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('max_id', sa.Integer(), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.Column('checked', sa.Integer(), nullable=False),
+    sa.Column('rescored', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['taxonomy_version_id'], ['taxonomy_version.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('taxonomy_version_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resume_analysis_taxonomy_version_id'), ['taxonomy_version_id'],
+                              unique=False)
+        batch_op.create_foreign_key('fk_resume_analysis_taxonomy_version_id', 'taxonomy_version',
+                                    ['taxonomy_version_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_resume_analysis_taxonomy_version_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_resume_analysis_taxonomy_version_id'))
+        batch_op.drop_column('taxonomy_version_id')
+
+    op.drop_table('rescore_run')
+    op.drop_table('taxonomy_version')
@@ -0,0 +1,44 @@
+"""baseline resume_analysis table
+
+Revision ID: 7fbec8b388a4
+Revises: 
+Create Date: 2026-10-18 10:37:00.905864
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7fbec8b388a4'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created with db.create_all() before migrations existed
+    # already have this table and are upgraded from here on
+    if sa.inspect(op.get_bind()).has_table('resume_analysis'):
+        return
+    op.create_table('resume_analysis',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('job_title', sa.String(length=255), nullable=False),
+    sa.Column('job_description', sa.Text(), nullable=False),
+    sa.Column('resume_text', sa.Text(), nullable=False),
+    sa.Column('overall_score', sa.Float(), nullable=False),
+    sa.Column('technical_skills_score', sa.Float(), nullable=False),
+    sa.Column('soft_skills_score', sa.Float(), nullable=False),
+    sa.Column('keyword_match_score', sa.Float(), nullable=False),
+    sa.Column('matched_skills', sa.Text(), nullable=True),
+    sa.Column('missing_skills', sa.Text(), nullable=True),
+    sa.Column('recommendations', sa.Text(), nullable=True),
+    sa.Column('extracted_entities', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('resume_analysis')
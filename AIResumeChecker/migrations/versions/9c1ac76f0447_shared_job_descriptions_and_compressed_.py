@@ -0,0 +1,147 @@
+"""shared job descriptions and compressed text columns
+
+Each analysis' inline job description is moved to a deduplicated
+job_description row, and the text and JSON columns become binary (on
+PostgreSQL, BYTEA holding the existing text as UTF-8). Existing values stay
+uncompressed until `flask storage migrate` rewrites them.
+
+Revision ID: 9c1ac76f0447
+Revises: b15499f4c8c2
+Create Date: 2026-10-18 10:46:35.827735
+
+"""
+from datetime import datetime
+import hashlib
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c1ac76f0447'
+down_revision = 'b15499f4c8c2'
+branch_labels = None
+depends_on = None
+
+COMPRESSED_COLUMNS = ('resume_text', 'matched_skills', 'missing_skills', 'recommendations',
+                      'extracted_entities')
+BATCH_SIZE = 500
+
+analysis_table = sa.table(
+    'resume_analysis',
+    sa.column('id', sa.Integer()),
+    sa.column('job_description', sa.Text()),
+    sa.column('job_description_id', sa.Integer()),
+    sa.column('job_hash', sa.String()),
+    *[sa.column(name, sa.LargeBinary()) for name in COMPRESSED_COLUMNS]
+)
+job_table = sa.Table(
+    'job_description', sa.MetaData(),
+    sa.Column('id', sa.Integer(), primary_key=True),
+    sa.Column('content_hash', sa.String()),
+    sa.Column('text', sa.LargeBinary()),
+    sa.Column('created_at', sa.DateTime())
+)
+
+
+def _content_hash(text):
+    # app.nlp_analyzer.content_hash as of this revision
+    normalized = re.sub(r'\s+', ' ', text.strip())
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def _batches(connection, *columns):
+    last_id = 0
+    while True:
+        rows = connection.execute(sa.select(analysis_table.c.id, *columns)
+                                  .where(analysis_table.c.id > last_id)
+                                  .order_by(analysis_table.c.id).limit(BATCH_SIZE)).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        yield rows
+
+
+def _link_job_descriptions(connection):
+    update = (analysis_table.update().where(analysis_table.c.id == sa.bindparam('row_id'))
+              .values(job_description_id=sa.bindparam('job_id'), job_hash=sa.bindparam('key')))
+    job_ids = {}
+    for rows in _batches(connection, analysis_table.c.job_description):
+        updates = []
+        for row in rows:
+            key = _content_hash(row.job_description)
+            if key not in job_ids:
+                result = connection.execute(job_table.insert().values(
+                    content_hash=key, text=row.job_description.encode('utf-8'), created_at=datetime.utcnow()))
+                job_ids[key] = result.inserted_primary_key[0]
+            updates.append({'row_id': row.id, 'job_id': job_ids[key], 'key': key})
+        connection.execute(update, updates)
+
+
+def _restore_text(connection):
+    from app.compression import decompress_text
+
+    def plain(value):
+        return None if value is None else decompress_text(value).encode('utf-8')
+
+    jobs = dict(connection.execute(sa.select(job_table.c.id, job_table.c.text)).all())
+    update = (analysis_table.update().where(analysis_table.c.id == sa.bindparam('row_id'))
+              .values(job_description=sa.bindparam('job_text'),
+                      **{name: sa.bindparam(f'plain_{name}') for name in COMPRESSED_COLUMNS}))
+    selected = [analysis_table.c.job_description_id] + [analysis_table.c[name] for name in COMPRESSED_COLUMNS]
+    for rows in _batches(connection, *selected):
+        updates = []
+        for row in rows:
+            values = row._mapping
+            params = {f'plain_{name}': plain(values[name]) for name in COMPRESSED_COLUMNS}
+            params['row_id'] = row.id
+            params['job_text'] = decompress_text(jobs[row.job_description_id])
+            updates.append(params)
+        connection.execute(update, updates)
+
+
+def upgrade():
+    op.create_table('job_description',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('text', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash')
+    )
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('job_description_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resume_analysis_job_description_id'), ['job_description_id'],
+                              unique=False)
+        batch_op.create_foreign_key('fk_resume_analysis_job_description_id', 'job_description',
+                                    ['job_description_id'], ['id'])
+        for name in COMPRESSED_COLUMNS:
+            batch_op.alter_column(name, existing_type=sa.Text(), type_=sa.LargeBinary(),
+                                  existing_nullable=name != 'resume_text',
+                                  postgresql_using=f"convert_to({name}, 'UTF8')")
+
+    _link_job_descriptions(op.get_bind())
+
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.drop_column('job_description')
+
+
+def downgrade():
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('job_description', sa.Text(), nullable=True))
+
+    # Decompress everything so the columns can go back to text
+    _restore_text(op.get_bind())
+
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.alter_column('job_description', existing_type=sa.Text(), nullable=False)
+        for name in COMPRESSED_COLUMNS:
+            batch_op.alter_column(name, existing_type=sa.LargeBinary(), type_=sa.Text(),
+                                  existing_nullable=name != 'resume_text',
+                                  postgresql_using=f"convert_from({name}, 'UTF8')")
+        batch_op.drop_constraint('fk_resume_analysis_job_description_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_resume_analysis_job_description_id'))
+        batch_op.drop_column('job_description_id')
+
+    op.drop_table('job_description')
@@ -0,0 +1,46 @@
+"""analysis_job queue table
+
+Revision ID: 9ca18567cff4
+Revises: 7fbec8b388a4
+Create Date: 2026-10-18 10:37:01.936514
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9ca18567cff4'
+down_revision = '7fbec8b388a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('analysis_job',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('job_title', sa.String(length=255), nullable=False),
+    sa.Column('job_description', sa.Text(), nullable=False),
+    sa.Column('file_data', sa.LargeBinary(), nullable=True),
+    sa.Column('resume_text', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('analysis_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['analysis_id'], ['resume_analysis.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('analysis_job', schema=None) as batch_op:
+        batch_op.create_index('ix_analysis_job_status_created', ['status', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('analysis_job', schema=None) as batch_op:
+        batch_op.drop_index('ix_analysis_job_status_created')
+
+    op.drop_table('analysis_job')
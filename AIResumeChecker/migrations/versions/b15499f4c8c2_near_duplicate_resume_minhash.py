@@ -0,0 +1,49 @@
+"""near-duplicate resume minhash
+
+Signatures and LSH buckets for existing analyses are computed afterwards
+with `flask dedup minhash`.
+
+Revision ID: b15499f4c8c2
+Revises: 3a9b147f4e2f
+Create Date: 2026-10-18 10:45:47.374151
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b15499f4c8c2'
+down_revision = '3a9b147f4e2f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_minhash', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('near_duplicate_of_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('near_duplicate_score', sa.Float(), nullable=True))
+        batch_op.create_foreign_key('fk_resume_analysis_near_duplicate_of_id', 'resume_analysis',
+                                    ['near_duplicate_of_id'], ['id'], ondelete='SET NULL')
+
+    op.create_table('resume_band',
+    sa.Column('bucket', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('analysis_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['analysis_id'], ['resume_analysis.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('bucket', 'analysis_id')
+    )
+    with op.batch_alter_table('resume_band', schema=None) as batch_op:
+        batch_op.create_index('ix_resume_band_analysis', ['analysis_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_band', schema=None) as batch_op:
+        batch_op.drop_index('ix_resume_band_analysis')
+
+    op.drop_table('resume_band')
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_resume_analysis_near_duplicate_of_id', type_='foreignkey')
+        batch_op.drop_column('near_duplicate_score')
+        batch_op.drop_column('near_duplicate_of_id')
+        batch_op.drop_column('resume_minhash')
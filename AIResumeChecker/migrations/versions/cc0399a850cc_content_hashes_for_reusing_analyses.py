@@ -0,0 +1,38 @@
+"""content hashes for reusing analyses
+
+Existing analyses are hashed afterwards with `flask dedup backfill`.
+
+Revision ID: cc0399a850cc
+Revises: 9ca18567cff4
+Create Date: 2026-10-18 10:39:56.783449
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cc0399a850cc'
+down_revision = '9ca18567cff4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('analysis_job', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('force_refresh', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('job_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_resume_analysis_content', ['resume_hash', 'job_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_analysis', schema=None) as batch_op:
+        batch_op.drop_index('ix_resume_analysis_content')
+        batch_op.drop_column('job_hash')
+        batch_op.drop_column('resume_hash')
+
+    with op.batch_alter_table('analysis_job', schema=None) as batch_op:
+        batch_op.drop_column('force_refresh')
@@ -1,23 +1,24 @@
-from app import create_app, db
-from flask_migrate import upgrade
+from app import create_app
+from app.schema import upgrade_database
+import importlib.util
 import os
 
 app = create_app()
 
 def deploy():
     """Run deployment tasks."""
-    # Create database tables
+    # Create or upgrade the database tables (migrations/)
     with app.app_context():
-        db.create_all()
+        upgrade_database()
         
-        # Download spaCy model if not present
-        try:
-            import spacy
-            spacy.load('en_core_web_sm')
-        except OSError:
+        # Download spaCy model if not present; spaCy models are installed as
+        # packages, so finding the package is enough and avoids loading it
+        model = app.config['SPACY_MODEL']
+        if not model.startswith('blank:') and importlib.util.find_spec(model) is None:
             print("Downloading spaCy model...")
-            os.system('python -m spacy download en_core_web_sm')
+            os.system(f'python -m spacy download {model}')
 
+# Development server; serve.py is the multi-process production entry point
 if __name__ == '__main__':
     deploy()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,227 @@
+"""Pre-forked production server.
+
+Usage: python serve.py [--host 0.0.0.0] [--port 8000] [--workers N] [--max-requests 1000]
+
+The master process builds the app and loads the analyzer (spaCy pipeline,
+skill matcher, fitted TF-IDF model) once, freezes the GC so those objects
+are never written to by collections, then forks the workers. The workers
+share one listening socket and the model's memory copy-on-write, so each
+additional worker costs its private pages rather than a full model.
+
+Signals to the master:
+  SIGHUP           reload: load a fresh analyzer (e.g. after `flask tfidf
+                   update`), fork a new generation of workers, then stop the
+                   old ones once their current request is done. Code changes
+                   still need a restart.
+  SIGTERM, SIGINT  graceful shutdown.
+
+A worker exits after serving its max-requests budget (plus a random
+jitter) and the master forks a replacement from the warm master image.
+Per-process state such as /metrics counters is per worker.
+"""
+import argparse
+import gc
+import os
+import random
+import signal
+import socket
+import sys
+import time
+
+from werkzeug.serving import BaseWSGIServer
+
+from app import analyzer_pool, create_app, db
+from app.schema import upgrade_database
+from config import Config
+
+
+class ServeConfig(Config):
+    # The model must be loaded before forking, and threads do not survive a fork
+    NLP_PRELOAD = 'sync'
+    JOB_RUNNER_AUTOSTART = False
+
+
+class WorkerServer(BaseWSGIServer):
+    """Single-threaded WSGI server on an inherited socket that counts finished requests."""
+
+    handled = 0
+
+    def finish_request(self, request, client_address):
+        super().finish_request(request, client_address)
+        self.handled += 1
+
+
+def _listen(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    listener = socket.socket(family, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    # Every worker wakes up on a new connection; the losers get EAGAIN instead of blocking
+    listener.setblocking(False)
+    return listener
+
+
+class PreforkServer:
+    def __init__(self, host: str, port: int, workers: int, max_requests: int, max_requests_jitter: int,
+                 graceful_timeout: float, backlog: int):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self.app = None
+        self.listener = None
+        self.generation = 0
+        self.children = {}  # pid -> generation
+        self._stopping = False
+        self._reload = False
+
+    # --- Master ------------------------------------------------------------
+
+    def load(self):
+        """Build the app and warm the analyzer, then freeze everything allocated so far."""
+        gc.unfreeze()
+        analyzer_pool.reset()
+        self.app = None
+        gc.collect()
+
+        started = time.perf_counter()
+        self.app = create_app(ServeConfig)
+        if analyzer_pool.error:
+            raise RuntimeError(f'Analyzer failed to load: {analyzer_pool.error}')
+        with self.app.app_context():
+            upgrade_database()
+            # Connections must not be shared with the workers
+            db.engine.dispose()
+        gc.collect()
+        gc.freeze()
+        self.generation += 1
+        print(f"[serve] master {os.getpid()}: generation {self.generation} loaded in "
+              f"{time.perf_counter() - started:.1f}s")
+
+    def run(self):
+        self.listener = _listen(self.host, self.port, self.backlog)
+        self.load()
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        signal.signal(signal.SIGHUP, self._handle_reload)
+        print(f"[serve] listening on http://{self.host}:{self.port} with {self.workers} workers")
+
+        while not self._stopping:
+            if self._reload:
+                self._reload = False
+                self.reload()
+            self.reap()
+            self.spawn_missing()
+            time.sleep(0.2)
+        self.shutdown()
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame):
+        self._reload = True
+
+    def spawn_missing(self):
+        current = sum(1 for generation in self.children.values() if generation == self.generation)
+        for _ in range(self.workers - current):
+            pid = os.fork()
+            if pid == 0:
+                status = 0
+                try:
+                    self.serve_worker()
+                except BaseException as e:
+                    print(f"[serve] worker {os.getpid()} failed: {e}")
+                    status = 1
+                finally:
+                    os._exit(status)
+            self.children[pid] = self.generation
+
+    def reap(self):
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            generation = self.children.pop(pid, None)
+            if generation == self.generation and not self._stopping and os.WEXITSTATUS(status) != 0:
+                print(f"[serve] worker {pid} exited with status {os.WEXITSTATUS(status)}")
+
+    def reload(self):
+        """New analyzer and workers first, then drain the old generation."""
+        old = [pid for pid, generation in self.children.items() if generation == self.generation]
+        try:
+            self.load()
+        except Exception as e:
+            print(f"[serve] reload failed, keeping the running workers: {e}")
+            return
+        self.spawn_missing()
+        self.signal_workers(old, signal.SIGTERM)
+
+    def signal_workers(self, pids, signum):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def shutdown(self):
+        print("[serve] shutting down")
+        self.signal_workers(list(self.children), signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        self.signal_workers(list(self.children), signal.SIGKILL)
+        while self.children:
+            self.reap()
+            time.sleep(0.05)
+        self.listener.close()
+
+    # --- Worker ------------------------------------------------------------
+
+    def serve_worker(self):
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+        # Ctrl+C reaches the whole process group; the master decides what happens
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        random.seed()
+        with self.app.app_context():
+            db.engine.dispose(close=False)
+
+        budget = 0
+        if self.max_requests:
+            budget = self.max_requests + random.randint(0, self.max_requests_jitter)
+        server = WorkerServer(self.host, self.port, self.app, fd=self.listener.fileno())
+        server.timeout = 1.0  # how often a stop request is noticed while idle
+        while not stopping and not (budget and server.handled >= budget):
+            server.handle_request()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=Config.SERVE_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVE_PORT)
+    parser.add_argument('--workers', type=int, default=Config.SERVE_WORKERS)
+    parser.add_argument('--max-requests', type=int, default=Config.SERVE_MAX_REQUESTS,
+                        help='Recycle a worker after this many requests (0: never).')
+    parser.add_argument('--max-requests-jitter', type=int, default=Config.SERVE_MAX_REQUESTS_JITTER)
+    parser.add_argument('--graceful-timeout', type=float, default=Config.SERVE_GRACEFUL_TIMEOUT)
+    args = parser.parse_args()
+
+    if not hasattr(os, 'fork'):
+        sys.exit('serve.py needs os.fork(); use run.py on this platform')
+    PreforkServer(args.host, args.port, args.workers, args.max_requests, args.max_requests_jitter,
+                  args.graceful_timeout, Config.SERVE_BACKLOG).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+import pytest
+
+from app import create_app, db
+from app.models import ResumeAnalysis
+from config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    NLP_PRELOAD = 'lazy'
+    JOB_RUNNER_AUTOSTART = False
+
+
+@pytest.fixture
+def app(tmp_path):
+    TestConfig.UPLOAD_FOLDER = str(tmp_path / 'uploads')
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def make_analysis(resume_text, job_description='Python developer with Flask and SQL experience.',
+                  filename='resume.pdf', job_title='Developer', **fields):
+    """An unsaved analysis with placeholder scores."""
+    values = dict(filename=filename, job_title=job_title, job_description=job_description,
+                  resume_text=resume_text, overall_score=50.0, technical_skills_score=50.0,
+                  soft_skills_score=50.0, keyword_match_score=50.0)
+    values.update(fields)
+    return ResumeAnalysis(**values)
@@ -0,0 +1,18 @@
+import time
+
+from app import bulk_ingest
+
+
+def _never_ready(*args):
+    time.sleep(3600)
+
+
+def test_file_never_picked_up_times_out(monkeypatch):
+    # Forked workers inherit the patched initializer and never take a file
+    monkeypatch.setattr(bulk_ingest, '_init_extractor', _never_ready)
+    started = time.monotonic()
+    with bulk_ingest.ExtractionPool(1, 0.2, None, 'fork') as pool:
+        results = list(pool.submit('resume.pdf', b'%PDF-1.4')) + list(pool.drain())
+
+    assert results == [('resume.pdf', None, 'Timed out after 0.2s')]
+    assert time.monotonic() - started < 0.2 * bulk_ingest.PICKUP_TIMEOUTS + 5
@@ -0,0 +1,21 @@
+from app import analyzer_pool
+
+
+def test_lazy_worker_is_not_ready_until_the_model_is_loaded(app):
+    analyzer_pool.reset()
+    client = app.test_client()
+
+    response = client.get('/health/ready')
+    assert response.status_code == 503
+    assert response.get_json()['mode'] == 'lazy'
+
+    analyzer_pool.get()
+    assert client.get('/health/ready').status_code == 200
+
+
+def test_cache_stats_do_not_load_the_model(app):
+    analyzer_pool.reset()
+
+    stats = app.test_client().get('/api/cache/stats').get_json()
+    assert 'jd_cache' not in stats and 'reports' in stats
+    assert analyzer_pool.loaded is None
@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta
+
+from app import db
+from app.jobs import JobRunner
+from app.models import AnalysisJob
+
+
+def running_job(job_id, started_seconds_ago):
+    return AnalysisJob(id=job_id, status=AnalysisJob.RUNNING, filename='resume.pdf', job_title='Developer',
+                       job_description='Python developer', attempts=1,
+                       started_at=datetime.utcnow() - timedelta(seconds=started_seconds_ago))
+
+
+def test_requeue_stale_skips_recent_and_inflight_jobs(app):
+    runner = JobRunner(app)
+    timeout = runner.timeout
+    db.session.add_all([running_job('orphan', timeout * 3), running_job('recent', timeout // 2),
+                        running_job('mine', timeout * 3)])
+    db.session.commit()
+    runner._inflight['mine'] = (None, 0)
+
+    runner.requeue_stale()
+
+    statuses = {job.id: job.status for job in AnalysisJob.query}
+    assert statuses == {'orphan': AnalysisJob.QUEUED, 'recent': AnalysisJob.RUNNING,
+                        'mine': AnalysisJob.RUNNING}
@@ -0,0 +1,46 @@
+import random
+
+from app import db
+from app.models import ResumeAnalysis
+
+from conftest import make_analysis
+
+WORDS = ('python flask sql docker kubernetes aws team lead project delivered platform customers '
+         'migration reduced latency built services designed api mentored engineers').split()
+
+
+def resume(seed, words=300):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_near_copies_committed_together_are_flagged(app):
+    original = resume(1)
+    words = original.split()
+    words[150] = 'golang'
+    copy = ' '.join(words)
+    unrelated = resume(2)
+
+    # One flush, as a bulk ingest commits a batch of files
+    first = make_analysis(original, filename='agency-a.pdf')
+    second = make_analysis(copy, filename='agency-b.pdf')
+    other = make_analysis(unrelated, filename='other.pdf')
+    db.session.add_all([first, second, other])
+    db.session.commit()
+
+    flagged = {analysis.filename: analysis for analysis in ResumeAnalysis.query}
+    assert flagged['agency-a.pdf'].near_duplicate_of_id is None
+    assert flagged['agency-b.pdf'].near_duplicate_of_id == first.id
+    assert flagged['agency-b.pdf'].near_duplicate_score >= 0.9
+    assert flagged['other.pdf'].near_duplicate_of_id is None
+
+
+def test_near_copy_of_stored_resume_is_flagged(app):
+    original = make_analysis(resume(3))
+    db.session.add(original)
+    db.session.commit()
+
+    copy = make_analysis(resume(3) + ' golang')
+    db.session.add(copy)
+    db.session.commit()
+    assert copy.near_duplicate_of_id == original.id
@@ -0,0 +1,33 @@
+import io
+from datetime import datetime
+
+from PyPDF2 import PdfReader
+
+from app.report_export import _MergedPdfWriter, _render_report
+
+
+def report(recommendations):
+    results = {'overall_score': 72.5, 'technical_score': 80.0, 'soft_skills_score': 65.0,
+               'keyword_match_score': 70.0,
+               'matched_skills': {'technical': ['python', 'flask'], 'soft': ['communication']},
+               'missing_skills': {'technical': ['docker'], 'soft': []},
+               'recommendations': recommendations}
+    return _render_report(results, 'resume.pdf', 'Developer', datetime(2024, 6, 1))
+
+
+def test_merged_pdf_reads_back_strictly():
+    # The second report runs to several pages, so pages share its fonts and resources
+    reports = [report(['Add a summary.']), report([f'Recommendation {i}.' for i in range(120)])]
+    output = io.BytesIO()
+    merged = _MergedPdfWriter(output)
+    for i, pdf in enumerate(reports):
+        merged.add(pdf, f'Report {i}')
+    merged.close()
+
+    reader = PdfReader(io.BytesIO(output.getvalue()), strict=True)
+    page_counts = [len(PdfReader(io.BytesIO(pdf)).pages) for pdf in reports]
+    assert page_counts[1] > 1
+    assert len(reader.pages) == sum(page_counts)
+    assert [item.title for item in reader.outline] == ['Report 0', 'Report 1']
+    assert [reader.get_destination_page_number(item) for item in reader.outline] == [0, page_counts[0]]
+    assert 'Recommendation 119.' in reader.pages[-1].extract_text()
@@ -0,0 +1,72 @@
+import math
+import random
+
+from app import db, search_index
+from app.search_index import CandidateIndex, get_candidate_index
+
+from conftest import make_analysis
+
+
+def exhaustive_scores(index, term_vector, skills):
+    """BM25 plus skill bonus for every indexed resume, without pruning."""
+    n = len(index.doc_lengths)
+    avgdl = index.total_length / n
+    scores = {}
+    for doc_id, length in index.doc_lengths.items():
+        score = 0.0
+        for term in term_vector:
+            postings = index.postings.get(term, {})
+            tf = postings.get(doc_id)
+            if tf:
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                norm = index.k1 * (1 - index.b + index.b * length / avgdl)
+                score += idf * tf * (index.k1 + 1) / (tf + norm)
+        for skill in skills:
+            if doc_id in index.skill_postings.get(skill, {}):
+                score += index.skill_weight / len(skills)
+        if score > 0:
+            scores[doc_id] = score
+    return scores
+
+
+def test_maxscore_top_k_matches_exhaustive_scan():
+    rng = random.Random(7)
+    vocabulary = [f'term{i}' for i in range(80)]
+    # Zipf-like term frequencies give both very common and rare terms
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    skills = [f'skill{i}' for i in range(12)]
+    index = CandidateIndex()
+    documents = []
+    for doc_id in range(1, 601):
+        terms = rng.choices(vocabulary, weights, k=rng.randint(5, 120))
+        term_vector = {term: terms.count(term) for term in set(terms)}
+        documents.append((doc_id, term_vector, rng.sample(skills, rng.randint(0, 4))))
+    index.build(documents)
+
+    for _ in range(40):
+        query = {term: 1 for term in rng.sample(vocabulary, rng.randint(1, 15))}
+        query_skills = rng.sample(skills, rng.randint(0, 5))
+        expected = exhaustive_scores(index, query, query_skills)
+        for k in (1, 5, 10, 50):
+            hits = index.search(query, query_skills, k)
+            best = sorted(expected.values(), reverse=True)[:k]
+            assert [score for score, _ in hits] == [round(score, 4) for score in best]
+            for score, doc_id in hits:
+                assert score == round(expected[doc_id], 4)
+
+
+def test_search_index_catches_up_with_new_rows(app, monkeypatch):
+    monkeypatch.setattr(search_index, 'candidate_index', CandidateIndex())
+    db.session.add(make_analysis('Senior Python developer, Flask and PostgreSQL.'))
+    db.session.commit()
+    index = get_candidate_index()
+    assert len(index) == 1
+
+    # Written without any hook into this process' index, as by another worker
+    other = make_analysis('Java developer with Spring and Kubernetes.')
+    db.session.add(other)
+    db.session.commit()
+    assert len(index) == 1
+    index = get_candidate_index()
+    assert len(index) == 2 and index.last_id == other.id
+    assert [doc_id for _, doc_id in index.search({'kubernetes': 1}, [], 5)] == [other.id]
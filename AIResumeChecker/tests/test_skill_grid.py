@@ -0,0 +1,28 @@
+import random
+
+from app.nlp_analyzer import NLPAnalyzer
+from app.skill_grid import SkillIndex, score_grid
+
+TAXONOMY = {'technical': [f'tech{i}' for i in range(40)], 'soft': [f'soft{i}' for i in range(12)]}
+
+
+def random_skills(rng, empty=False):
+    return {category: [] if empty else rng.sample(skills, rng.randint(0, len(skills) // 2))
+            for category, skills in TAXONOMY.items()}
+
+
+def test_grid_matches_score_fit_cell_by_cell():
+    rng = random.Random(7)
+    resumes = [random_skills(rng) for _ in range(25)]
+    # Jobs without required skills go through the max(..., 1) branch
+    jobs = [random_skills(rng) for _ in range(8)] + [random_skills(rng, empty=True)]
+    jobs.append({'technical': rng.sample(TAXONOMY['technical'], 5), 'soft': []})
+    similarity = [[rng.uniform(0, 100) for _ in jobs] for _ in resumes]
+
+    grid = score_grid(SkillIndex(TAXONOMY), resumes, jobs, similarity).rounded()
+
+    for i, resume in enumerate(resumes):
+        for j, job in enumerate(jobs):
+            expected = NLPAnalyzer.score_fit(resume, job, similarity[i][j])
+            for name, matrix in grid.items():
+                assert matrix[i][j] == expected[name], (name, i, j)
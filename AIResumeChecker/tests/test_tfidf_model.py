@@ -0,0 +1,51 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from app.tfidf_model import CorpusTfidfModel
+
+DOCUMENTS = [{'python': 2, 'flask': 1}, {'java': 1, 'spring': 3}, {'python': 1, 'sql': 1}]
+
+
+def test_save_switches_generations_as_a_whole(tmp_path):
+    model = CorpusTfidfModel.fit(DOCUMENTS[:2])
+    model.save(str(tmp_path))
+    old = CorpusTfidfModel.load(str(tmp_path))
+
+    model.partial_fit(DOCUMENTS[2:])
+    model.save(str(tmp_path))
+    model.partial_fit([{'rust': 1}])
+    model.save(str(tmp_path))
+
+    loaded = CorpusTfidfModel.load(str(tmp_path))
+    assert loaded.terms == model.terms and loaded.n_documents == 4
+    np.testing.assert_allclose(loaded.idf, model.idf)
+    # The model loaded earlier keeps reading its own, consistent generation
+    assert old.similarity(DOCUMENTS[0], DOCUMENTS[0]) == pytest.approx(1.0)
+    assert len([name for name in os.listdir(tmp_path) if name.startswith('gen-')]) == 2
+
+
+def test_load_rejects_mismatched_files(tmp_path):
+    CorpusTfidfModel.fit(DOCUMENTS).save(str(tmp_path))
+    with open(tmp_path / CorpusTfidfModel.CURRENT_FILE, encoding='utf-8') as f:
+        generation = tmp_path / f.read()
+    with open(generation / CorpusTfidfModel.VOCABULARY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(['python'], f)
+
+    with pytest.raises(ValueError):
+        CorpusTfidfModel.load(str(tmp_path))
+
+
+def test_load_reads_models_saved_without_generations(tmp_path):
+    model = CorpusTfidfModel.fit(DOCUMENTS)
+    model.save(str(tmp_path))
+    with open(tmp_path / CorpusTfidfModel.CURRENT_FILE, encoding='utf-8') as f:
+        generation = tmp_path / f.read()
+    for name in os.listdir(generation):
+        os.replace(generation / name, tmp_path / name)
+    os.remove(tmp_path / CorpusTfidfModel.CURRENT_FILE)
+
+    assert CorpusTfidfModel.exists(str(tmp_path))
+    assert CorpusTfidfModel.load(str(tmp_path)).terms == model.terms